@@ -0,0 +1,49 @@
+"""
+Benchmarks `fklearn.training.transformation.apply_replacements` against the
+element-wise replacement it replaced, reporting rows per second.
+
+Usage: python benchmarks/apply_replacements.py [n_rows]
+"""
+import sys
+from time import time
+
+import numpy as np
+import pandas as pd
+
+from fklearn.training.transformation import _replace_column_elementwise, apply_replacements
+
+
+def make_data(n_rows: int, n_categories: int = 1000, seed: int = 42) -> pd.DataFrame:
+    rng = np.random.RandomState(seed)
+    categories = np.array(["categ_%d" % i for i in range(n_categories)], dtype=object)
+    categ = categories[rng.randint(0, n_categories, n_rows)]
+    categ[rng.rand(n_rows) < 0.05] = np.nan
+    numeric = rng.randint(0, n_categories, n_rows).astype(float)
+    numeric[rng.rand(n_rows) < 0.05] = np.nan
+    return pd.DataFrame({"categ": categ, "numeric": numeric})
+
+
+def rows_per_second(fn, df: pd.DataFrame) -> float:
+    t0 = time()
+    fn(df)
+    return len(df) / (time() - t0)
+
+
+if __name__ == "__main__":
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    df = make_data(n_rows)
+
+    # only the first half of the categories is seen, the rest is replaced as unseen
+    vec = {"categ": {"categ_%d" % i: i for i in range(500)},
+           "numeric": {float(i): i / 10 for i in range(500)}}
+
+    def elementwise(data: pd.DataFrame) -> pd.DataFrame:
+        return data.assign(**{col: _replace_column_elementwise(data[col], vec[col], -1) for col in vec})
+
+    def vectorized(data: pd.DataFrame) -> pd.DataFrame:
+        return apply_replacements(data, list(vec), vec, -1)
+
+    assert elementwise(df).equals(vectorized(df))
+
+    for name, fn in [("element-wise", elementwise), ("vectorized", vectorized)]:
+        print("%-12s %14.0f rows/s" % (name, rows_per_second(fn, df)))
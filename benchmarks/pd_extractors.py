@@ -0,0 +1,88 @@
+"""
+Benchmarks `fklearn.metrics.pd_extractors.extract_tuning` against extracting the same
+tuning log by concatenating one DataFrame per evaluator per fold, reporting the seconds
+each takes.
+
+Usage: python benchmarks/pd_extractors.py [n_iterations]
+"""
+import sys
+from functools import partial
+from time import time
+
+import numpy as np
+import pandas as pd
+
+from fklearn.metrics.pd_extractors import (evaluator_extractor, extract, extract_tuning, repeat_split_log,
+                                           split_evaluator_extractor)
+
+
+def concat_split_evaluator_extractor(result: dict, split_col: str, split_values: list, base_extractor) -> pd.DataFrame:
+    eval_name = "split_evaluator__" + split_col
+    return pd.concat([base_extractor(result.get(eval_name + "_" + str(split_value), {}))
+                      .assign(**{eval_name: split_value})
+                      for split_value in split_values])
+
+
+def concat_extract(validator_results: list, extractor) -> pd.DataFrame:
+    def extract_base_iteration(result: dict) -> pd.DataFrame:
+        extracted_results = pd.concat(list(map(extractor, result["eval_results"])))
+        repeat_fn = repeat_split_log(results_len=len(extracted_results))
+        assignments = {k: repeat_fn(v) for k, v in result["split_log"].items()}
+        return extracted_results.assign(fold_num=result["fold_num"]).assign(**assignments)
+
+    return pd.concat(list(map(extract_base_iteration, validator_results)))
+
+
+def concat_extract_tuning(tuning_log: list, base_extractor, model_learner_name: str) -> pd.DataFrame:
+    # the extraction concatenating one DataFrame per evaluation, as the extractors used to do
+    return pd.concat([base_extractor(iteration["validator_log"])
+                      .assign(**iteration["train_log"][model_learner_name]["parameters"])
+                      for iteration in tuning_log])
+
+
+def make_tuning_log(n_iterations: int, n_folds: int = 5, n_splits: int = 10, seed: int = 42) -> list:
+    rng = np.random.RandomState(seed)
+
+    def eval_result() -> dict:
+        result = {"roc_auc_evaluator__target": rng.rand(), "logloss_evaluator__target": rng.rand()}
+        for split in range(n_splits):
+            result["split_evaluator__segment_%d" % split] = {"roc_auc_evaluator__target": rng.rand()}
+        return result
+
+    return [{"validator_log": [{"fold_num": fold,
+                                "split_log": {"train_size": 1000, "test_size": [500],
+                                              "train_start": pd.Timestamp("2020-01-01")},
+                                "eval_results": [eval_result()]}
+                               for fold in range(n_folds)],
+             "train_log": {"lgbm_classification_learner": {"parameters": {"learning_rate": rng.rand(),
+                                                                          "num_leaves": rng.randint(2, 64)}}}}
+            for _ in range(n_iterations)]
+
+
+def seconds(fn, tuning_log: list) -> float:
+    t0 = time()
+    fn(tuning_log)
+    return time() - t0
+
+
+if __name__ == "__main__":
+    n_iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    tuning_log = make_tuning_log(n_iterations)
+
+    def concatenated(log: list) -> pd.DataFrame:
+        split_extractor = partial(concat_split_evaluator_extractor, split_col="segment",
+                                  split_values=list(range(10)),
+                                  base_extractor=evaluator_extractor(evaluator_name="roc_auc_evaluator__target"))
+        base_extractor = partial(concat_extract, extractor=split_extractor)
+        return concat_extract_tuning(log, base_extractor, "lgbm_classification_learner")
+
+    def records(log: list) -> pd.DataFrame:
+        base_extractor = extract(extractor=split_evaluator_extractor(
+            split_col="segment", split_values=list(range(10)),
+            base_extractor=evaluator_extractor(evaluator_name="roc_auc_evaluator__target")))
+        return extract_tuning(log, base_extractor, "lgbm_classification_learner")
+
+    pd.testing.assert_frame_equal(concatenated(tuning_log), records(tuning_log), check_exact=True)
+
+    for name, fn in [("concatenated", concatenated), ("records", records)]:
+        print("%-12s %10.2f s" % (name, seconds(fn, tuning_log)))
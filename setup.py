@@ -17,13 +17,14 @@ demos_deps = requirements_from_pip("requirements_demos.txt")
 test_deps = requirements_from_pip("requirements_test.txt")
 
 tools_deps = requirements_from_pip("requirements_tools.txt")
+parquet_deps = requirements_from_pip("requirements_parquet.txt")
 
 lgbm_deps = requirements_from_pip("requirements_lgbm.txt")
 xgboost_deps = requirements_from_pip("requirements_xgboost.txt")
 catboost_deps = requirements_from_pip("requirements_catboost.txt")
 
 all_models_deps = lgbm_deps + xgboost_deps + catboost_deps
-all_deps = all_models_deps + tools_deps
+all_deps = all_models_deps + tools_deps + parquet_deps
 devel_deps = test_deps + all_deps
 
 setup(name=MODULE_NAME,
@@ -41,6 +42,7 @@ setup(name=MODULE_NAME,
                       "xgboost": xgboost_deps,
                       "catboost": catboost_deps,
                       "tools": tools_deps,
+                      "parquet": parquet_deps,
                       "devel": devel_deps,
                       "all_models": all_models_deps,
                       "all": all_deps},
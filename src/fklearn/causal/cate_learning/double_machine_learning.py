@@ -1,18 +1,18 @@
-from typing import List, Tuple
+import hashlib
+from typing import Dict, List, Optional, Tuple
 
-import numpy as np
 import pandas as pd
 from sklearn import __version__ as sk_version
 from sklearn.base import RegressorMixin
-from sklearn.model_selection import KFold
 from sklearn.ensemble import GradientBoostingRegressor
 from sklearn.base import clone
-from toolz import curry
+from toolz import curry, unique
 from typing import Union
 
+from fklearn.causal.cross_fitting import cross_fit
 from fklearn.common_docstrings import learner_pred_fn_docstring, learner_return_docstring
 from fklearn.training.utils import log_learner_time, expand_features_encoded
-from fklearn.types import LearnerReturnType
+from fklearn.types import LearnerReturnType, LogType
 
 
 def _cv_estimate(model: RegressorMixin,
@@ -21,16 +21,34 @@ def _cv_estimate(model: RegressorMixin,
                  y: str,
                  n_splits: int) -> Tuple[pd.Series, List[RegressorMixin]]:
 
-    cv = KFold(n_splits=n_splits)
-    models = []
-    cv_pred = pd.Series(np.nan, index=train_data.index)
+    cv_preds, models = cross_fit(train_data, {y: (model, features, y)}, n_splits)
+    return cv_preds[y], models[y]
 
-    for train, test in cv.split(train_data):
-        m = clone(model, safe=False).fit(train_data[features].iloc[train], train_data[y].iloc[train])
-        cv_pred.iloc[test] = m.predict(train_data[features].iloc[test])
-        models += [m]
 
-    return cv_pred, models
+def _nuisance_data_hash(df: pd.DataFrame, nuisances: Dict[str, Tuple[RegressorMixin, List[str], str]]) -> str:
+    # the rows, index included, of the columns the nuisance models are fitted on
+    columns = list(unique([c for _, features, y in nuisances.values() for c in list(features) + [y]]))
+    return hashlib.sha1(pd.util.hash_pandas_object(df[columns]).values.tobytes()).hexdigest()
+
+
+def _check_fitted_nuisance_log(fitted_nuisance_log: LogType, current_log: LogType, cv_splits: int) -> None:
+    fitted_log = fitted_nuisance_log['non_parametric_double_ml_learner']
+
+    def nuisance_features(log: LogType) -> List[List[str]]:
+        return [log['features'] if columns is None else columns
+                for columns in [log['debias_feature_columns'], log['denoise_feature_columns']]]
+
+    checks = [
+        ("samples", fitted_log['training_samples'], current_log['training_samples']),
+        ("folds", fitted_nuisance_log['cv_splits'], cv_splits),
+        ("treatment column", fitted_log['treatment_column'], current_log['treatment_column']),
+        ("outcome column", fitted_log['outcome_column'], current_log['outcome_column']),
+        ("debias and denoise features", nuisance_features(fitted_log), nuisance_features(current_log)),
+        ("data", fitted_log.get('nuisance_data_hash'), current_log['nuisance_data_hash']),
+    ]
+    for name, fitted, current in checks:
+        if fitted != current:
+            raise ValueError("The nuisance models were fitted with %s %s, but they are %s" % (name, fitted, current))
 
 
 @curry
@@ -47,7 +65,10 @@ def non_parametric_double_ml_learner(df: pd.DataFrame,
                                      final_model_feature_columns: List[str] = None,
                                      prediction_column: str = "prediction",
                                      cv_splits: int = 2,
-                                     encode_extra_cols: bool = True) -> LearnerReturnType:
+                                     encode_extra_cols: bool = True,
+                                     n_jobs: int = 1,
+                                     backend: str = "threading",
+                                     fitted_nuisance_log: Optional[LogType] = None) -> LearnerReturnType:
     """
     Fits an Non-Parametric Double/ML Meta Learner for Conditional Average Treatment Effect Estimation. It implements the
     following steps:
@@ -111,6 +132,19 @@ def non_parametric_double_ml_learner(df: pd.DataFrame,
 
     encode_extra_cols : bool (default: True)
         If True, treats all columns in `df` with name pattern fklearn_feat__col==val` as feature columns.
+
+    n_jobs : int (default 1)
+        The number of debias and denoise models fitted in parallel, across all folds.
+
+    backend : str (default "threading")
+        The joblib backend used to fit the debias and denoise models. With process based backends
+        (e.g. "loky") each worker only gets the rows of its fold pickled.
+
+    fitted_nuisance_log : dict (default None)
+        The log of a previous fit on the same `df` and `cv_splits`. Its `debias_models` and `denoise_models`
+        are reused to get the out of fold residuals, so that only the final model is fitted, for instance
+        to try other final models. Raises a ValueError if it was fitted on other rows, folds, treatment or
+        outcome columns, or debias and denoise features.
     """
 
     features = feature_columns if not encode_extra_cols else expand_features_encoded(df, feature_columns)
@@ -119,12 +153,33 @@ def non_parametric_double_ml_learner(df: pd.DataFrame,
     denoise_model = GradientBoostingRegressor() if denoise_model is None else clone(denoise_model, safe=False)
     final_model = GradientBoostingRegressor() if final_model is None else clone(final_model, safe=False)
 
-    t_hat, mts = _cv_estimate(debias_model, df,
-                              features if debias_feature_columns is None else debias_feature_columns,
-                              treatment_column, cv_splits)
-    y_hat, mys = _cv_estimate(denoise_model, df,
-                              features if denoise_feature_columns is None else denoise_feature_columns,
-                              outcome_column, cv_splits)
+    nuisances = {
+        'debias_models': (debias_model, features if debias_feature_columns is None else debias_feature_columns,
+                          treatment_column),
+        'denoise_models': (denoise_model, features if denoise_feature_columns is None else denoise_feature_columns,
+                           outcome_column),
+    }
+    learner_log = {
+        'features': feature_columns,
+        'debias_feature_columns': debias_feature_columns,
+        'denoise_feature_columns': denoise_feature_columns,
+        'final_model_feature_columns': final_model_feature_columns,
+        'outcome_column': outcome_column,
+        'treatment_column': treatment_column,
+        'prediction_column': prediction_column,
+        'package': "sklearn",
+        'package_version': sk_version,
+        'feature_importance': None,
+        'training_samples': len(df),
+        'nuisance_data_hash': _nuisance_data_hash(df, nuisances)}
+
+    fitted_models = None
+    if fitted_nuisance_log is not None:
+        _check_fitted_nuisance_log(fitted_nuisance_log, learner_log, cv_splits)
+        fitted_models = {name: fitted_nuisance_log[name] for name in nuisances}
+    cv_preds, nuisance_models = cross_fit(df, nuisances, cv_splits, n_jobs, backend, fitted_models)
+    t_hat, mts = cv_preds['debias_models'], nuisance_models['debias_models']
+    y_hat, mys = cv_preds['denoise_models'], nuisance_models['denoise_models']
 
     y_res = df[outcome_column] - y_hat
     t_res = df[treatment_column] - t_hat
@@ -142,22 +197,11 @@ def non_parametric_double_ml_learner(df: pd.DataFrame,
 
     p.__doc__ = learner_pred_fn_docstring("non_parametric_double_ml_learner")
 
-    log = {'non_parametric_double_ml_learner': {
-        'features': feature_columns,
-        'debias_feature_columns': debias_feature_columns,
-        'denoise_feature_columns': denoise_feature_columns,
-        'final_model_feature_columns': final_model_feature_columns,
-        'outcome_column': outcome_column,
-        'treatment_column': treatment_column,
-        'prediction_column': prediction_column,
-        'package': "sklearn",
-        'package_version': sk_version,
-        'feature_importance': None,
-        'training_samples': len(df)},
-        'debias_models': mts,
-        'denoise_models': mys,
-        'cv_splits': cv_splits,
-        'object': model_final_fitted}
+    log = {'non_parametric_double_ml_learner': learner_log,
+           'debias_models': mts,
+           'denoise_models': mys,
+           'cv_splits': cv_splits,
+           'object': model_final_fitted}
 
     return p, p(df), log
 
@@ -1,9 +1,10 @@
 import copy
 import inspect
-from typing import Callable, Dict, List, Tuple
+from typing import Any, Callable, Dict, Iterator, List, Tuple
 
 import numpy as np
 import pandas as pd
+from joblib import Parallel, delayed
 from toolz import curry
 
 from fklearn.common_docstrings import (learner_pred_fn_docstring,
@@ -11,7 +12,8 @@ from fklearn.common_docstrings import (learner_pred_fn_docstring,
 from fklearn.exceptions.exceptions import (MissingControlError,
                                            MissingTreatmentError,
                                            MultipleTreatmentsError)
-from fklearn.training.pipeline import build_pipeline
+from fklearn.training.pipeline import build_pipeline, required_columns
+from fklearn.training.utils import declared_columns
 from fklearn.types import LearnerFnType, LearnerReturnType, PredictFnType
 
 TREATMENT_FEATURE = "is_treatment"
@@ -73,48 +75,110 @@ def _create_treatment_flag(
     return df
 
 
+def _fit_without_predictions(fit_fn: Callable, *args: Any) -> Tuple[Callable, dict]:
+    """
+    Calls a learner, or a function returning what a learner does, keeping only its predict function
+    and log, so that parallel workers don't send the scored training data back.
+    """
+    learner_fcn, _, learner_log = fit_fn(*args)
+    return learner_fcn, learner_log
+
+
 def _fit_by_treatment(
     df: pd.DataFrame,
     learner: LearnerFnType,
     treatment_col: str,
     control_name: str,
     treatments: list,
+    n_jobs: int = 1,
+    backend: str = "threading",
 ) -> Tuple[dict, dict]:
+    def treatment_control_dfs() -> Iterator[pd.DataFrame]:
+        # lazily, so each worker only gets the rows of its treatment and the control
+        for treatment in treatments:
+            treatment_control_df = _filter_by_treatment(
+                df=df,
+                treatment_col=treatment_col,
+                treatment_name=treatment,
+                control_name=control_name,
+            )
+            yield _create_treatment_flag(
+                df=treatment_control_df,
+                treatment_col=treatment_col,
+                treatment_name=treatment,
+                control_name=control_name,
+            )
+
+    results = Parallel(n_jobs=n_jobs, backend=backend)(
+        delayed(_fit_without_predictions)(learner, treatment_control_df)
+        for treatment_control_df in treatment_control_dfs()
+    )
+
     fitted_learners = {}
     learners_logs = {}
-    for treatment in treatments:
-        treatment_control_df = _filter_by_treatment(
-            df=df,
-            treatment_col=treatment_col,
-            treatment_name=treatment,
-            control_name=control_name,
-        )
-        treatment_control_df = _create_treatment_flag(
-            df=treatment_control_df,
-            treatment_col=treatment_col,
-            treatment_name=treatment,
-            control_name=control_name,
-        )
-        learner_fcn, _, learner_log = learner(treatment_control_df)
+    for treatment, (learner_fcn, learner_log) in zip(treatments, results):
         fitted_learners[treatment] = learner_fcn
         learners_logs[treatment] = learner_log
 
     return fitted_learners, learners_logs
 
 
-def _predict_by_treatment_flag(
+def _scored_columns(df: pd.DataFrame, learner_fcn: PredictFnType) -> List[str]:
+    """
+    Returns the columns of `df` that `learner_fcn` reads, when it declares them, like the learners and
+    transformers of a pipeline do, or all the columns of `df` otherwise.
+    """
+    column_lineage = getattr(learner_fcn, "column_lineage", None)
+    if column_lineage is not None:
+        columns = required_columns(column_lineage, list(df.columns))
+    else:
+        learner_columns = declared_columns(learner_fcn)
+        reads = learner_columns["reads"] if learner_columns is not None else None
+        columns = None if reads is None else [col for col in df.columns if col in reads]
+
+    return list(df.columns) if columns is None else columns
+
+
+def _predict_on_treatment_and_control(
     df: pd.DataFrame,
     learner_fcn: PredictFnType,
-    is_treatment: bool,
     prediction_column: str,
-) -> np.ndarray:
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Predicts every row of `df` both as treated and as control in a single call to `learner_fcn`,
+    by scoring the columns of `df` it reads stacked on top of themselves with the treatment flag
+    on and then off.
+    """
+    n_rows = df.shape[0]
+    scored_df = df[_scored_columns(df, learner_fcn)]
+    counterfactual_df = pd.concat([scored_df, scored_df], ignore_index=True)
+    counterfactual_df[TREATMENT_FEATURE] = np.repeat([1.0, 0.0], n_rows)
+    predictions = learner_fcn(counterfactual_df)[prediction_column].values
 
-    treatment_flag = np.ones(df.shape[0]) if is_treatment else np.zeros(df.shape[0])
-    df[TREATMENT_FEATURE] = treatment_flag
-    prediction_df = learner_fcn(df)
-    df.drop(columns=[TREATMENT_FEATURE], inplace=True)
+    return predictions[:n_rows], predictions[n_rows:]
 
-    return prediction_df[prediction_column].values
+
+def _assign_treatment_effects(
+    df: pd.DataFrame,
+    treatments: list,
+    control_name: str,
+    columns: Dict[str, np.ndarray],
+) -> pd.DataFrame:
+    """
+    Adds the prediction and uplift `columns` of the treatments to `df`, along with the best uplift and the
+    treatment suggested for each row: the one with the best uplift, or the control if no uplift is positive.
+    """
+    uplifts = np.column_stack([columns[f"treatment_{treatment}__uplift"] for treatment in treatments])
+    # like DataFrame.max and idxmax, missing uplifts are skipped and ties go to the first treatment
+    best_uplift = np.fmax.reduce(uplifts, axis=1)
+    best_treatment = np.argmax(np.where(np.isnan(uplifts), -np.inf, uplifts), axis=1)
+    treatment_labels = np.array([f"treatment_{treatment}" for treatment in treatments], dtype=object)
+
+    return df.assign(
+        **columns,
+        uplift=best_uplift,
+        suggested_treatment=np.where(best_uplift <= 0, control_name, treatment_labels[best_treatment]),
+    )
 
 
 def _simulate_treatment_effect(
@@ -124,47 +188,18 @@ def _simulate_treatment_effect(
     learners: dict,
     prediction_column: str,
 ) -> pd.DataFrame:
-    uplift_cols = []
-    scored_df = df.copy()
+    columns = {}
     for treatment in treatments:
-        learner_fcn = learners[treatment]
-
-        scored_df[
-            f"treatment_{treatment}__{prediction_column}_on_treatment"
-        ] = _predict_by_treatment_flag(
-            df=scored_df,
-            learner_fcn=learner_fcn,
-            is_treatment=True,
-            prediction_column=prediction_column,
-        )
-        scored_df[
-            f"treatment_{treatment}__{prediction_column}_on_control"
-        ] = _predict_by_treatment_flag(
-            df=scored_df,
-            learner_fcn=learner_fcn,
-            is_treatment=False,
+        on_treatment, on_control = _predict_on_treatment_and_control(
+            df=df,
+            learner_fcn=learners[treatment],
             prediction_column=prediction_column,
         )
+        columns[f"treatment_{treatment}__{prediction_column}_on_treatment"] = on_treatment
+        columns[f"treatment_{treatment}__{prediction_column}_on_control"] = on_control
+        columns[f"treatment_{treatment}__uplift"] = on_treatment - on_control
 
-        uplift_cols.append(f"treatment_{treatment}__uplift")
-        scored_df[uplift_cols[-1]] = (
-            scored_df[f"treatment_{treatment}__{prediction_column}_on_treatment"]
-            - scored_df[f"treatment_{treatment}__{prediction_column}_on_control"]
-        )
-
-    scored_df["uplift"] = scored_df[uplift_cols].max(axis=1).values
-    scored_df["suggested_treatment"] = np.where(
-        scored_df["uplift"].values <= 0,
-        control_name,
-        scored_df[uplift_cols].idxmax(axis=1).values,
-    )
-    scored_df["suggested_treatment"] = (
-        scored_df["suggested_treatment"]
-        .apply(lambda x: x.replace("__uplift", ""))
-        .values
-    )
-
-    return scored_df
+    return _assign_treatment_effects(df, treatments, control_name, columns)
 
 
 @curry
@@ -175,6 +210,8 @@ def causal_s_classification_learner(
     prediction_column: str,
     learner: Callable,
     learner_transformers: List[LearnerFnType] = None,
+    n_jobs: int = 1,
+    backend: str = "threading",
 ) -> LearnerReturnType:
     """
     Fits a Causal S-Learner classifier. The S-learner is a meta-learner which
@@ -210,6 +247,13 @@ def causal_s_classification_learner(
     learner_transformers: list
         A list of fklearn transformer functions to be applied after the learner and before estimating the CATE.
         This parameter may be useful, for example, to estimate the CATE with calibrated classifiers.
+    n_jobs: int
+        The number of treatments fitted in parallel.
+    backend: str
+        The joblib backend used to fit the treatments. With the default "threading" backend the
+        workers share the data, while with process based backends (e.g. "loky") each worker only
+        gets the rows it fits on pickled. Threads are enough for learners that release the GIL,
+        like LightGBM or XGBoost.
     """
 
     learner = copy.deepcopy(learner)
@@ -234,6 +278,8 @@ def causal_s_classification_learner(
         treatment_col=treatment_col,
         control_name=control_name,
         treatments=unique_treatments,
+        n_jobs=n_jobs,
+        backend=backend,
     )
 
     def p(new_df: pd.DataFrame) -> pd.DataFrame:
@@ -272,35 +318,19 @@ def _simulate_t_learner_treatment_effect(
     control_fcn = learners[control_name]
     control_conversion_probability = control_fcn(df)[prediction_column].values
 
-    scored_df = df.copy()
-
-    uplift_cols = []
+    columns = {}
     for treatment_name in treatments:
         treatment_fcn = learners[treatment_name]
         treatment_conversion_probability = treatment_fcn(df)[prediction_column].values
 
-        scored_df[
+        columns[
             f"treatment_{treatment_name}__{prediction_column}_on_treatment"
         ] = treatment_conversion_probability
-
-        uplift_cols.append(f"treatment_{treatment_name}__uplift")
-        scored_df[uplift_cols[-1]] = (
+        columns[f"treatment_{treatment_name}__uplift"] = (
             treatment_conversion_probability - control_conversion_probability
         )
 
-    scored_df["uplift"] = scored_df[uplift_cols].max(axis=1).values
-    scored_df["suggested_treatment"] = np.where(
-        scored_df["uplift"].values <= 0,
-        control_name,
-        scored_df[uplift_cols].idxmax(axis=1).values,
-    )
-    scored_df["suggested_treatment"] = (
-        scored_df["suggested_treatment"]
-        .apply(lambda x: x.replace("__uplift", ""))
-        .values
-    )
-
-    return scored_df
+    return _assign_treatment_effects(df, treatments, control_name, columns)
 
 
 def _get_model_fcn(
@@ -330,20 +360,30 @@ def _get_learners(
     unique_treatments: List[str],
     control_name: str,
     treatment_col: str,
+    n_jobs: int = 1,
+    backend: str = "threading",
 ) -> Tuple[Dict[str, Callable], Dict[str, dict]]:
     learners: Dict[str, Callable] = {}
     logs: Dict[str, dict] = {}
 
-    learner_fcn, _, learner_logs = _get_model_fcn(
-        df, treatment_col, control_name, control_learner
-    )
-    learners[control_name] = learner_fcn
-    logs[control_name] = learner_logs
+    arms = [(control_name, control_learner)] + [
+        (treatment_name, treatment_learner) for treatment_name in unique_treatments
+    ]
+
+    def arm_df(treatment_name: str) -> pd.DataFrame:
+        # threads share `df`, while process based workers only get the rows of their arm pickled
+        if backend in ("threading", "sequential"):
+            return df
+        return df.loc[df[treatment_col] == treatment_name]
 
-    for treatment_name in unique_treatments:
-        learner_fcn, _, learner_logs = _get_model_fcn(
-            df, treatment_col, treatment_name, treatment_learner
+    results = Parallel(n_jobs=n_jobs, backend=backend)(
+        delayed(_fit_without_predictions)(
+            _get_model_fcn, arm_df(treatment_name), treatment_col, treatment_name, learner
         )
+        for treatment_name, learner in arms
+    )
+
+    for (treatment_name, _), (learner_fcn, learner_logs) in zip(arms, results):
         learners[treatment_name] = learner_fcn
         logs[treatment_name] = learner_logs
 
@@ -359,6 +399,8 @@ def causal_t_classification_learner(
     learner: LearnerFnType,
     treatment_learner: LearnerFnType = None,
     learner_transformers: List[LearnerFnType] = None,
+    n_jobs: int = 1,
+    backend: str = "threading",
 ) -> LearnerReturnType:
     """
     Fits a Causal T-Learner classifier. The T-Learner is a meta-learner which learns the
@@ -396,6 +438,13 @@ def causal_t_classification_learner(
     learner_transformers: List[LearnerFnType]
         A list of fklearn transformer functions to be applied after the learner and before estimating the CATE.
         This parameter may be useful, for example, to estimate the CATE with calibrated classifiers.
+    n_jobs: int
+        The number of treatment and control models fitted in parallel.
+    backend: str
+        The joblib backend used to fit the models. With the default "threading" backend the
+        workers share the data, while with process based backends (e.g. "loky") each worker only
+        gets the rows it fits on pickled. Threads are enough for learners that release the GIL,
+        like LightGBM or XGBoost.
     """
 
     control_learner = copy.deepcopy(learner)
@@ -425,6 +474,8 @@ def causal_t_classification_learner(
         unique_treatments=unique_treatments,
         control_name=control_name,
         treatment_col=treatment_col,
+        n_jobs=n_jobs,
+        backend=backend,
     )
 
     def p(new_df: pd.DataFrame) -> pd.DataFrame:
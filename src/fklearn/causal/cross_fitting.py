@@ -0,0 +1,92 @@
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed
+from sklearn.base import RegressorMixin, clone
+from sklearn.model_selection import KFold
+
+
+def _cross_fit_fold(model: RegressorMixin,
+                    fitted_model: Optional[RegressorMixin],
+                    x_train: Optional[pd.DataFrame],
+                    y_train: Optional[pd.Series],
+                    x_test: pd.DataFrame) -> Tuple[RegressorMixin, np.ndarray]:
+    m = clone(model, safe=False).fit(x_train, y_train) if fitted_model is None else fitted_model
+    return m, m.predict(x_test)
+
+
+def cross_fit(train_data: pd.DataFrame,
+              nuisances: Dict[str, Tuple[RegressorMixin, List[str], str]],
+              n_splits: int,
+              n_jobs: int = 1,
+              backend: str = "threading",
+              fitted_models: Optional[Dict[str, List[RegressorMixin]]] = None
+              ) -> Tuple[Dict[str, pd.Series], Dict[str, List[RegressorMixin]]]:
+    """
+    Fits nuisance models on `n_splits` folds of `train_data` and gets their out of fold predictions.
+
+    The folds are computed once and shared by all nuisance models, the feature columns are selected
+    once for each set of features, and the models of all nuisances and folds are fitted in parallel.
+
+    Parameters
+    ----------
+    train_data : pandas.DataFrame
+        A Pandas' DataFrame with the features and targets of the nuisance models.
+
+    nuisances : dict
+        The `(model, features, target)` of each nuisance, by name. The models are cloned before fitting.
+
+    n_splits : int
+        The number of folds, as in sklearn's `KFold`.
+
+    n_jobs : int (default 1)
+        The number of models fitted in parallel, across the folds of all nuisances.
+
+    backend : str (default "threading")
+        The joblib backend used to fit the models. With process based backends (e.g. "loky")
+        each worker only gets the rows of its fold pickled.
+
+    fitted_models : dict, optional
+        The models fitted on each fold by a previous call on the same data and folds, by nuisance
+        name. These nuisances are only predicted, instead of fitted again.
+
+    Returns
+    ----------
+    cv_preds : dict of pandas.Series
+        The out of fold predictions of each nuisance, by name.
+
+    models : dict of list
+        The models fitted on each fold of each nuisance, by name.
+    """
+    fitted_models = {} if fitted_models is None else fitted_models
+    for name, fitted in fitted_models.items():
+        if len(fitted) != n_splits:
+            raise ValueError("%d %s were fitted, but there are %d folds" % (len(fitted), name, n_splits))
+
+    folds = list(KFold(n_splits=n_splits).split(train_data))
+    feature_data = {tuple(features): train_data[features] for _, features, _ in nuisances.values()}
+
+    def fold_tasks() -> Iterator:
+        # lazily, so each worker only gets the rows of its fold
+        for name, (model, features, y) in nuisances.items():
+            x = feature_data[tuple(features)]
+            for fold_num, (train, test) in enumerate(folds):
+                if name in fitted_models:
+                    yield delayed(_cross_fit_fold)(model, fitted_models[name][fold_num], None, None, x.iloc[test])
+                else:
+                    yield delayed(_cross_fit_fold)(model, None, x.iloc[train], train_data[y].iloc[train],
+                                                   x.iloc[test])
+
+    results = iter(Parallel(n_jobs=n_jobs, backend=backend)(fold_tasks()))
+
+    cv_preds = {}  # type: Dict[str, pd.Series]
+    models = {}  # type: Dict[str, List[RegressorMixin]]
+    for name in nuisances:
+        cv_preds[name] = pd.Series(np.nan, index=train_data.index)
+        models[name] = []
+        for (_, test), (m, pred) in zip(folds, results):
+            cv_preds[name].iloc[test] = pred
+            models[name] += [m]
+
+    return cv_preds, models
@@ -5,11 +5,12 @@ import pandas as pd
 from sklearn.base import RegressorMixin
 from sklearn.ensemble import GradientBoostingRegressor
 from sklearn.linear_model import LinearRegression
-from sklearn.model_selection import cross_val_predict
 from statsmodels.formula.api import ols
 from toolz import curry, merge
 from typing import Dict, Any
 
+from fklearn.causal.cross_fitting import cross_fit
+
 
 @curry
 def debias_with_regression_formula(df: pd.DataFrame,
@@ -181,7 +182,9 @@ def debias_with_double_ml(df: pd.DataFrame,
                           cv: int = 5,
                           suffix: str = "_debiased",
                           denoise: bool = True,
-                          seed: int = 123) -> pd.DataFrame:
+                          seed: int = 123,
+                          n_jobs: int = 1,
+                          backend: str = "threading") -> pd.DataFrame:
     """
     Frisch-Waugh-Lovell style debiasing with ML model.
     To debias, we
@@ -226,6 +229,12 @@ def debias_with_double_ml(df: pd.DataFrame,
     seed : int
         A seed for consistency in random computation
 
+    n_jobs : int
+        The number of models fitted in parallel, across the folds of all debiased columns.
+
+    backend : str
+        The joblib backend used to fit the models, like "threading" or "loky".
+
     Returns
     ----------
     debiased_df : Pandas DataFrame
@@ -238,9 +247,8 @@ def debias_with_double_ml(df: pd.DataFrame,
 
     np.random.seed(seed)
 
-    def get_cv_resid(col_to_debias: str) -> np.ndarray:
-        model = ml_regressor(**params)
-        cv_pred = cross_val_predict(estimator=model, X=df[confounder_columns], y=df[col_to_debias], cv=cv)
-        return df[col_to_debias] - cv_pred + df[col_to_debias].mean()
+    # the same folds as cross_val_predict, shared by the treatment and outcome models
+    cv_preds, _ = cross_fit(df, {c: (ml_regressor(**params), confounder_columns, c) for c in cols_to_debias},
+                            cv, n_jobs, backend)
 
-    return df.assign(**{c + suffix: get_cv_resid(c) for c in cols_to_debias})
+    return df.assign(**{c + suffix: df[c] - cv_preds[c] + df[c].mean() for c in cols_to_debias})
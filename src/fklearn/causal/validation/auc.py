@@ -1,8 +1,12 @@
+from typing import Optional
+
+import numpy as np
 import pandas as pd
 from toolz import curry
 
 from fklearn.types import EffectFnType
-from fklearn.causal.validation.curves import cumulative_effect_curve
+from fklearn.causal.validation.curves import (_bootstrap_cumulative_linear_effects, _percentile_bands,
+                                              cumulative_effect_curve)
 from fklearn.causal.effects import linear_effect
 
 
@@ -166,3 +170,98 @@ def area_under_the_relative_cumulative_gain_curve(df: pd.DataFrame,
 
     return abs(sum([(effect - ate) * (rows / size) * (step_size / size)
                     for rows, effect, step_size in zip(n_rows, cum_effect, step_sizes)]))
+
+
+@curry
+def bootstrap_areas_under_the_curves(df: pd.DataFrame,
+                                     treatment: str,
+                                     outcome: str,
+                                     prediction: str,
+                                     min_rows: int = 30,
+                                     steps: int = 100,
+                                     n_bootstraps: int = 200,
+                                     confidence: float = 0.95,
+                                     resampling: str = "poisson",
+                                     random_state: Optional[int] = None,
+                                     max_bytes: int = 2 ** 28,
+                                     n_jobs: int = 1) -> pd.DataFrame:
+    """
+     Computes the areas under the cumulative effect, cumulative gain and relative cumulative gain curves, with
+     percentile bootstrap confidence intervals, using `linear_effect` as the effect.
+
+     The areas of all the resamples of `df` come from the curves computed at once by `bootstrap_effect_curves`,
+     weighting each step by the fraction of the resample in it.
+
+     Parameters
+     ----------
+     df : Pandas' DataFrame
+         A Pandas' DataFrame with target and prediction scores.
+
+     treatment : Strings
+         The name of the treatment column in `df`.
+
+     outcome : Strings
+         The name of the outcome column in `df`.
+
+     prediction : Strings
+         The name of the prediction column in `df`.
+
+     min_rows : Integer
+         Minimum number of observations needed to have a valid result.
+
+     steps : Integer
+         The number of cumulative steps to iterate when accumulating the effect
+
+     n_bootstraps : Integer
+         The number of resamples of `df`.
+
+     confidence : Float
+         The fraction of the resampled areas between the lower and upper bounds.
+
+     resampling : Strings
+         How the rows are resampled, "poisson" or "multinomial". See `bootstrap_effect_curves`.
+
+     random_state : Integer
+         The seed of the resamples.
+
+     max_bytes : Integer
+         Approximate memory budget, in bytes, of the resamples processed at once.
+
+     n_jobs : Integer
+         The number of chunks of resamples processed in parallel threads.
+
+
+     Returns
+     ----------
+     areas: pd.DataFrame
+         The `area`, `lower` and `upper` bounds, indexed by the name of the function computing each area.
+     """
+
+    size = df.shape[0]
+    n_rows = list(range(min_rows, size, size // steps)) + [size]
+
+    effects, fractions = _bootstrap_cumulative_linear_effects(df, treatment, outcome, prediction, n_rows,
+                                                              n_bootstraps, resampling, random_state,
+                                                              max_bytes, n_jobs)
+    step_fractions = np.diff(fractions, axis=1, prepend=0.0)
+    relative_effects = effects - effects[:, -1:]
+
+    areas = {
+        "area_under_the_cumulative_effect_curve": (
+            area_under_the_cumulative_effect_curve,
+            np.abs(np.sum(relative_effects * step_fractions, axis=1))),
+        "area_under_the_cumulative_gain_curve": (
+            area_under_the_cumulative_gain_curve,
+            np.abs(np.sum(effects * fractions * step_fractions, axis=1))),
+        "area_under_the_relative_cumulative_gain_curve": (
+            area_under_the_relative_cumulative_gain_curve,
+            np.abs(np.sum(relative_effects * fractions * step_fractions, axis=1))),
+    }
+
+    return pd.DataFrame([
+        dict(zip(["area", "lower", "upper"],
+                 [area_fn(df, treatment, outcome, prediction, min_rows, steps, linear_effect),
+                  *_percentile_bands(replicate_areas, confidence)]),
+             name=name)
+        for name, (area_fn, replicate_areas) in areas.items()
+    ]).set_index("name")
@@ -1,7 +1,9 @@
-from typing import List
+import warnings
+from typing import List, Optional, Tuple
 
 import numpy as np
 import pandas as pd
+from joblib import Parallel, delayed, effective_n_jobs
 from toolz import curry, partial
 
 from fklearn.types import EffectFnType
@@ -52,6 +54,138 @@ def effect_by_segment(df: pd.DataFrame,
             .apply(effect_fn_partial))
 
 
+def _is_linear_effect(effect_fn: EffectFnType) -> bool:
+    return effect_fn is linear_effect or (getattr(effect_fn, "func", None) is linear_effect.func
+                                          and not effect_fn.args and not effect_fn.keywords)  # type: ignore
+
+
+def _values_by_prediction(df: pd.DataFrame,
+                          treatment: str,
+                          outcome: str,
+                          prediction: str) -> Tuple[np.ndarray, np.ndarray]:
+    # the same ordering as sort_values on the whole frame, including ties
+    order = df[prediction].reset_index(drop=True).sort_values(ascending=False).index.to_numpy()
+    return df[treatment].to_numpy(dtype=float)[order], df[outcome].to_numpy(dtype=float)[order]
+
+
+def _weighted_cumulative_linear_effect(treatment_values: np.ndarray,
+                                       outcome_values: np.ndarray,
+                                       prefix: np.ndarray,
+                                       weights: np.ndarray) -> np.ndarray:
+    """
+    Computes `linear_effect` on the prefixes of the rows ordered by prediction ending at the `prefix`
+    positions, once for each row of `weights`, counting every row as many times as its weight.
+    Returns an array with one row per row of `weights` and one column per prefix.
+    """
+    # like pandas' cov, the variance counts the rows with a treatment and the covariance the rows with both values
+    has_treatment = ~np.isnan(treatment_values)
+    has_both = has_treatment & ~np.isnan(outcome_values)
+    if not has_both.any():
+        return np.full((weights.shape[0], len(prefix)), np.nan)
+
+    # centering keeps the sums of squares from cancelling out on data far from zero
+    t = treatment_values - treatment_values[has_treatment].mean()
+    y = outcome_values - outcome_values[has_both].mean()
+
+    def prefix_sums(values: np.ndarray, mask: np.ndarray) -> np.ndarray:
+        return np.cumsum(weights * np.where(mask, values, 0.0), axis=1)[:, prefix]
+
+    def constant_prefix(mask: np.ndarray) -> np.ndarray:
+        # prefixes with a constant treatment have no variance, rather than a rounding error
+        counted = mask & (weights > 0)
+        running_max = np.maximum.accumulate(np.where(counted, treatment_values, -np.inf), axis=1)[:, prefix]
+        running_min = np.minimum.accumulate(np.where(counted, treatment_values, np.inf), axis=1)[:, prefix]
+        return running_max == running_min
+
+    count_t, count_both = prefix_sums(np.ones_like(t), has_treatment), prefix_sums(np.ones_like(t), has_both)
+    sum_t, sum_tt = prefix_sums(t, has_treatment), prefix_sums(t * t, has_treatment)
+    sum_both_t, sum_both_y = prefix_sums(t, has_both), prefix_sums(y, has_both)
+    sum_ty = prefix_sums(t * y, has_both)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        var = np.where(constant_prefix(has_treatment), 0.0, (sum_tt - sum_t * sum_t / count_t) / (count_t - 1))
+        cov = np.where(constant_prefix(has_both), 0.0,
+                       (sum_ty - sum_both_t * sum_both_y / count_both) / (count_both - 1))
+        effect = cov / var
+
+    return np.where(count_both < 2, np.nan, effect)
+
+
+def _cumulative_linear_effect(df: pd.DataFrame,
+                              treatment: str,
+                              outcome: str,
+                              prediction: str,
+                              n_rows: List[int]) -> np.ndarray:
+    """
+    Computes `linear_effect` on each of the `n_rows` first rows of `df` ordered by prediction,
+    from cumulative sums of the treatment and outcome moments after a single sort, instead of
+    computing the covariance of every prefix from scratch.
+    """
+    treatment_values, outcome_values = _values_by_prediction(df, treatment, outcome, prediction)
+    weights = np.ones((1, len(treatment_values)))
+    return _weighted_cumulative_linear_effect(treatment_values, outcome_values, np.asarray(n_rows) - 1, weights)[0]
+
+
+# the number of arrays as large as the resample weights kept in memory at once by each bootstrap chunk
+_BOOTSTRAP_ARRAYS = 6
+
+
+def _bootstrap_cumulative_linear_effects(df: pd.DataFrame,
+                                         treatment: str,
+                                         outcome: str,
+                                         prediction: str,
+                                         n_rows: List[int],
+                                         n_bootstraps: int,
+                                         resampling: str,
+                                         random_state: Optional[int],
+                                         max_bytes: int,
+                                         n_jobs: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Computes the cumulative `linear_effect` of `n_bootstraps` resamples of `df` at the same prediction
+    cut-offs as `n_rows`, from weighted cumulative sums of all the resamples at once. Returns the effects
+    and the fraction of each resample in each prefix, with one row per resample.
+    """
+    if resampling not in ("poisson", "multinomial"):
+        raise ValueError("resampling must be 'poisson' or 'multinomial', got %s" % resampling)
+
+    treatment_values, outcome_values = _values_by_prediction(df, treatment, outcome, prediction)
+    size = len(treatment_values)
+    prefix = np.asarray(n_rows) - 1
+
+    # one seed per resample, so the results don't depend on the chunks or the number of jobs
+    seeds = np.random.RandomState(random_state).randint(np.iinfo(np.int32).max, size=n_bootstraps)
+
+    def resample_weights(seed: int) -> np.ndarray:
+        rng = np.random.RandomState(seed)
+        if resampling == "poisson":
+            return rng.poisson(1.0, size)
+        return np.bincount(rng.randint(0, size, size), minlength=size)
+
+    def bootstrap_chunk(chunk_seeds: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        weights = np.array([resample_weights(seed) for seed in chunk_seeds], dtype=float)
+        effects = _weighted_cumulative_linear_effect(treatment_values, outcome_values, prefix, weights)
+        counts = np.cumsum(weights, axis=1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return effects, counts[:, prefix] / counts[:, -1:]
+
+    chunk_size = max(1, max_bytes // (_BOOTSTRAP_ARRAYS * 8 * max(size, 1) * effective_n_jobs(n_jobs)))
+    chunks = [seeds[start:start + chunk_size] for start in range(0, n_bootstraps, chunk_size)]
+    results = Parallel(n_jobs=n_jobs, backend="threading")(delayed(bootstrap_chunk)(chunk) for chunk in chunks)
+
+    return np.vstack([effects for effects, _ in results]), np.vstack([fractions for _, fractions in results])
+
+
+def _percentile_bands(replicates: np.ndarray, confidence: float) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    The lower and upper percentiles of `replicates` along its first axis holding `confidence` of them in between,
+    ignoring the resamples where they are undefined.
+    """
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", category=RuntimeWarning)
+        lower, upper = np.nanpercentile(replicates, [50 * (1 - confidence), 50 * (1 + confidence)], axis=0)
+    return lower, upper
+
+
 @curry
 def cumulative_effect_curve(df: pd.DataFrame,
                             treatment: str,
@@ -85,7 +219,8 @@ def cumulative_effect_curve(df: pd.DataFrame,
 
     effect_fn : function (df: pandas.DataFrame, treatment: str, outcome: str) -> int or Array of int
         A function that computes the treatment effect given a dataframe, the name of the treatment column and the name
-        of the outcome column.
+        of the outcome column. With the default `linear_effect`, the effect of all steps is computed at once from
+        cumulative sums, in O(n log n) instead of O(steps * n). Other functions are called on each step.
 
 
     Returns
@@ -95,8 +230,11 @@ def cumulative_effect_curve(df: pd.DataFrame,
     """
 
     size = df.shape[0]
-    ordered_df = df.sort_values(prediction, ascending=False).reset_index(drop=True)
     n_rows = list(range(min_rows, size, size // steps)) + [size]
+    if _is_linear_effect(effect_fn):
+        return _cumulative_linear_effect(df, treatment, outcome, prediction, n_rows)
+
+    ordered_df = df.sort_values(prediction, ascending=False).reset_index(drop=True)
     return np.array([effect_fn(ordered_df.head(rows), treatment, outcome) for rows in n_rows])
 
 
@@ -276,3 +414,89 @@ def effect_curves(
             x["samples_fraction"] * x["cumulative_effect_curve"] - x["random_model_cumulative_gain_curve"]
         ),
     )
+
+
+@curry
+def bootstrap_effect_curves(df: pd.DataFrame,
+                            treatment: str,
+                            outcome: str,
+                            prediction: str,
+                            min_rows: int = 30,
+                            steps: int = 100,
+                            n_bootstraps: int = 200,
+                            confidence: float = 0.95,
+                            resampling: str = "poisson",
+                            random_state: Optional[int] = None,
+                            max_bytes: int = 2 ** 28,
+                            n_jobs: int = 1) -> pd.DataFrame:
+    """
+     Creates the same dataset as `effect_curves`, with percentile bootstrap confidence bands for the cumulative
+     effect, cumulative gain and relative cumulative gain curves, using `linear_effect` as the effect.
+
+     Instead of recomputing the curves on each resample of `df`, the resamples are drawn as weights of the
+     rows and all their curves are computed at once from weighted cumulative sums of the rows ordered by
+     prediction. The resampled curves are evaluated at the same prediction cut-offs as the curves of `df`.
+
+     Parameters
+     ----------
+     df : Pandas' DataFrame
+         A Pandas' DataFrame with target and prediction scores.
+
+     treatment : Strings
+         The name of the treatment column in `df`.
+
+     outcome : Strings
+         The name of the outcome column in `df`.
+
+     prediction : Strings
+         The name of the prediction column in `df`.
+
+     min_rows : Integer
+         Minimum number of observations needed to have a valid result.
+
+     steps : Integer
+         The number of cumulative steps to iterate when accumulating the effect
+
+     n_bootstraps : Integer
+         The number of resamples of `df`.
+
+     confidence : Float
+         The fraction of the resampled curves between the lower and upper bands.
+
+     resampling : Strings
+         How the rows are resampled: "poisson" weights each row by an independent Poisson(1) draw, while
+         "multinomial" draws as many rows as `df` has with replacement, like the classic bootstrap.
+
+     random_state : Integer
+         The seed of the resamples. The results don't depend on `max_bytes` nor `n_jobs`.
+
+     max_bytes : Integer
+         Approximate memory budget, in bytes, of the resamples processed at once. The resamples are
+         processed in chunks small enough to fit it.
+
+     n_jobs : Integer
+         The number of chunks of resamples processed in parallel threads.
+
+
+     Returns
+     ----------
+     summary curves dataset: pd.DataFrame
+         The dataset from `effect_curves`, plus the `_lower` and `_upper` bands of each curve.
+    """
+
+    size: int = df.shape[0]
+    n_rows: List[int] = list(range(min_rows, size, size // steps)) + [size]
+
+    effects, fractions = _bootstrap_cumulative_linear_effects(df, treatment, outcome, prediction, n_rows,
+                                                              n_bootstraps, resampling, random_state,
+                                                              max_bytes, n_jobs)
+    replicates = {
+        "cumulative_effect_curve": effects,
+        "cumulative_gain_curve": effects * fractions,
+        "relative_cumulative_gain_curve": (effects - effects[:, -1:]) * fractions,
+    }
+
+    curves = effect_curves(df, treatment, outcome, prediction, min_rows, steps, linear_effect)
+    for curve, replicate_curves in replicates.items():
+        curves[f"{curve}_lower"], curves[f"{curve}_upper"] = _percentile_bands(replicate_curves, confidence)
+    return curves
@@ -1,44 +1,244 @@
 import collections.abc
 from datetime import datetime
+from functools import wraps
+import inspect
 from itertools import chain, repeat
 
+import numpy as np
 import pandas as pd
 from toolz import curry
 from numpy import nan
 
 
-@curry
-def evaluator_extractor(result, evaluator_name):
+class _UnrepresentableRecords(Exception):
+    """
+    Raised when the records of a log can't reproduce the DataFrame pandas would build from it,
+    so the extractor builds it by concatenating DataFrames instead.
+    """
+
+
+# marks the columns a row doesn't have, which `pd.concat` fills with NaN (or NaT)
+_MISSING = object()
+_ONE_ROW_INDEX = pd.RangeIndex(1)
+_FRAME_DTYPES = (np.dtype("int64"), np.dtype("float64"), np.dtype("bool"), np.dtype("<M8[ns]"), np.dtype("O"))
+
+
+def _record_kind(value):
+    # the values whose column dtype is the same whether the column is built from a list of them
+    # or by concatenating one-row DataFrames
+    if isinstance(value, (bool, np.bool_)):
+        return "bool"
+    if isinstance(value, (int, np.int64)):
+        return "int"
+    if isinstance(value, float):
+        return "float"
+    if isinstance(value, str):
+        return "str"
+    if value is pd.NaT or (isinstance(value, pd.Timestamp) and value.tz is None):
+        return "datetime"
+    return None
+
+
+def _frame_records(df):
+    if not isinstance(df, pd.DataFrame) or len(df) == 0 or df.columns.has_duplicates:
+        raise _UnrepresentableRecords()
+    if not all(isinstance(c, str) for c in df.columns):
+        raise _UnrepresentableRecords()
+    for col, dtype in df.dtypes.items():
+        if dtype not in _FRAME_DTYPES or (dtype == object
+                                          and not all(isinstance(v, str) for v in df[col])):
+            raise _UnrepresentableRecords()
+    return list(df.columns), df.to_dict("records"), [df.index]
+
+
+def _records_frame(records):
+    columns, rows, index = records
+    if not columns:
+        raise _UnrepresentableRecords()
+
+    data = {}
+    for col in columns:
+        values = [row.get(col, _MISSING) for row in rows]
+        kinds = {_record_kind(v) for v in values if v is not _MISSING}
+        # pd.concat casts bools mixed with numbers to numbers and ignores NaN next to datetimes
+        if None in kinds or (kinds & {"bool", "datetime"} and len(kinds) > 1):
+            raise _UnrepresentableRecords()
+        fill = pd.NaT if kinds == {"datetime"} else nan
+        data[col] = [fill if v is _MISSING else v for v in values]
+    return pd.DataFrame(data, index=index[0].append(index[1:]), columns=columns)
+
+
+class _Records:
+    """
+    Builds the pieces of an extraction as (columns, rows, index) records, with the rows as
+    dicts, which are turned into a DataFrame once at the end by `_records_frame`.
+    """
+
+    @staticmethod
+    def row(values):
+        return list(values), [dict(values)], [_ONE_ROW_INDEX]
+
+    @staticmethod
+    def frame(df):
+        return _frame_records(df)
+
+    @staticmethod
+    def concat(pieces):
+        if not pieces:
+            raise _UnrepresentableRecords()
+
+        columns = list(pieces[0][0])
+        seen = set(columns)
+        rows, index = [], []
+        for piece_columns, piece_rows, piece_index in pieces:
+            columns.extend(c for c in piece_columns if c not in seen)
+            seen.update(piece_columns)
+            rows.extend(piece_rows)
+            index.extend(piece_index)
+        return columns, rows, index
+
+    @staticmethod
+    def join(pieces):
+        # only one-row pieces with the default index are joined side by side like `pd.concat(axis=1)` would
+        if not pieces or any(len(rows) != 1 or len(index) != 1 or not isinstance(index[0], pd.RangeIndex)
+                             or not index[0].equals(_ONE_ROW_INDEX) for _, rows, index in pieces):
+            raise _UnrepresentableRecords()
+
+        columns = [c for piece_columns, _, _ in pieces for c in piece_columns]
+        if len(set(columns)) != len(columns):
+            raise _UnrepresentableRecords()
+
+        row = {}
+        for _, rows, _ in pieces:
+            row.update(rows[0])
+        return columns, [row], [_ONE_ROW_INDEX]
+
+    @staticmethod
+    def assign(piece, values):
+        columns, rows, index = piece
+        new_columns = list(columns) + [k for k in values if k not in columns]
+        new_rows = [dict(row) for row in rows]
+        for k, v in values.items():
+            # lists are assigned row by row, as `DataFrame.assign` does
+            if isinstance(v, list):
+                if len(v) != len(rows):
+                    raise _UnrepresentableRecords()
+                for row, value in zip(new_rows, v):
+                    row[k] = value
+            elif not pd.api.types.is_scalar(v):
+                raise _UnrepresentableRecords()
+            else:
+                for row in new_rows:
+                    row[k] = v
+        return new_columns, new_rows, index
+
+    @staticmethod
+    def n_rows(piece):
+        return len(piece[1])
+
+
+class _Frames:
+    """
+    Builds the pieces of an extraction as DataFrames, concatenating them as they are combined.
+    """
+
+    @staticmethod
+    def row(values):
+        return pd.DataFrame({k: [v] for k, v in values.items()})
+
+    @staticmethod
+    def frame(df):
+        return df
+
+    @staticmethod
+    def concat(pieces):
+        return pd.concat(pieces)
+
+    @staticmethod
+    def join(pieces):
+        return pd.concat(pieces, axis=1)
+
+    @staticmethod
+    def assign(piece, values):
+        return piece.assign(**values)
+
+    @staticmethod
+    def n_rows(piece):
+        return len(piece)
+
+
+_RECORDS = _Records()
+_FRAMES = _Frames()
+
+
+def _extract_pieces(pieces, extractor, result):
+    # the built-in extractors build their pieces directly, other extractors return a DataFrame
+    body = getattr(getattr(extractor, "func", None), "body", None)
+    if body is not None:
+        try:
+            bound = body.signature.bind(pieces, *extractor.args, result, **extractor.keywords)
+        except TypeError:
+            pass
+        else:
+            return body(*bound.args, **bound.kwargs)
+    return pieces.frame(extractor(result))
+
+
+def _extractor(body):
+    """
+    Turns `body(pieces, ...)`, which builds an extraction with the `pieces` operations, into a
+    curried extractor without the `pieces` argument.
+
+    The extractor builds the records of the whole log and the DataFrame once at the end. Logs with
+    values whose dtype could differ between the records and the concatenated DataFrames, like None
+    or float32 metrics, raise `_UnrepresentableRecords` and are built by concatenation instead,
+    so the result is always the same as concatenating one DataFrame per evaluation.
+    """
+    @wraps(body)
+    def extractor(*args, **kwargs):
+        try:
+            return _records_frame(body(_RECORDS, *args, **kwargs))
+        except _UnrepresentableRecords:
+            return body(_FRAMES, *args, **kwargs)
+
+    signature = inspect.signature(body)
+    body.signature = signature
+    extractor.body = body
+    extractor.__signature__ = signature.replace(parameters=list(signature.parameters.values())[1:])
+    return curry(extractor)
+
+
+@_extractor
+def evaluator_extractor(pieces, result, evaluator_name):
     metric_value = result[evaluator_name] if result else nan
-    return pd.DataFrame({evaluator_name: [metric_value]})
+    return pieces.row({evaluator_name: metric_value})
 
 
-@curry
-def combined_evaluator_extractor(result, base_extractors):
-    return pd.concat([x(result) for x in base_extractors], axis=1)
+@_extractor
+def combined_evaluator_extractor(pieces, result, base_extractors):
+    return pieces.join([_extract_pieces(pieces, x, result) for x in base_extractors])
 
 
-@curry
-def split_evaluator_extractor_iteration(split_value, result, split_col, base_extractor, eval_name=None):
+@_extractor
+def split_evaluator_extractor_iteration(pieces, split_value, result, split_col, base_extractor, eval_name=None):
     if eval_name is None:
         eval_name = 'split_evaluator__' + split_col
 
     key = eval_name + '_' + str(split_value)
 
-    return (base_extractor(result.get(key, {}))
-            .assign(**{eval_name: split_value}))
+    return pieces.assign(_extract_pieces(pieces, base_extractor, result.get(key, {})), {eval_name: split_value})
 
 
-@curry
-def split_evaluator_extractor(result, split_col, split_values, base_extractor, eval_name=None):
-    return pd.concat(
-        list(map(split_evaluator_extractor_iteration(result=result, split_col=split_col, base_extractor=base_extractor,
-                                                     eval_name=eval_name),
-                 split_values)))
+@_extractor
+def split_evaluator_extractor(pieces, result, split_col, split_values, base_extractor, eval_name=None):
+    iteration = split_evaluator_extractor_iteration(result=result, split_col=split_col,
+                                                    base_extractor=base_extractor, eval_name=eval_name)
+    return pieces.concat([_extract_pieces(pieces, iteration, split_value) for split_value in split_values])
 
 
-@curry
-def temporal_split_evaluator_extractor(result, time_col, base_extractor, time_format="%Y-%m", eval_name=None):
+@_extractor
+def temporal_split_evaluator_extractor(pieces, result, time_col, base_extractor, time_format="%Y-%m",
+                                       eval_name=None):
     if eval_name is None:
         eval_name = 'split_evaluator__' + time_col
 
@@ -54,22 +254,25 @@ def temporal_split_evaluator_extractor(result, time_col, base_extractor, time_fo
             # this might happen if result has temporal splitters using different data formats
             pass
 
-    return split_evaluator_extractor(result, time_col, split_values, base_extractor)
+    split_extractor = split_evaluator_extractor(split_col=time_col, split_values=split_values,
+                                                base_extractor=base_extractor)
+    return _extract_pieces(pieces, split_extractor, result)
 
 
-@curry
-def learning_curve_evaluator_extractor(result, base_extractor):
-    return base_extractor(result).assign(lc_period_end=result['lc_period_end'])
+@_extractor
+def learning_curve_evaluator_extractor(pieces, result, base_extractor):
+    return pieces.assign(_extract_pieces(pieces, base_extractor, result), {'lc_period_end': result['lc_period_end']})
 
 
-@curry
-def reverse_learning_curve_evaluator_extractor(result, base_extractor):
-    return base_extractor(result).assign(reverse_lc_period_start=result['reverse_lc_period_start'])
+@_extractor
+def reverse_learning_curve_evaluator_extractor(pieces, result, base_extractor):
+    return pieces.assign(_extract_pieces(pieces, base_extractor, result),
+                         {'reverse_lc_period_start': result['reverse_lc_period_start']})
 
 
-@curry
-def stability_curve_evaluator_extractor(result, base_extractor):
-    return base_extractor(result).assign(sc_period=result['sc_period'])
+@_extractor
+def stability_curve_evaluator_extractor(pieces, result, base_extractor):
+    return pieces.assign(_extract_pieces(pieces, base_extractor, result), {'sc_period': result['sc_period']})
 
 
 @curry
@@ -82,50 +285,96 @@ def repeat_split_log(split_log, results_len):
         return split_log
 
 
-@curry
-def extract_base_iteration(result, extractor):
-    extracted_results = pd.concat(list(map(extractor, result['eval_results'])))
-    repeat_fn = repeat_split_log(results_len=len(extracted_results))
+@_extractor
+def extract_base_iteration(pieces, result, extractor):
+    extracted_results = pieces.concat([_extract_pieces(pieces, extractor, r) for r in result['eval_results']])
+    repeat_fn = repeat_split_log(results_len=pieces.n_rows(extracted_results))
 
     keys = result['split_log'].keys()
     assignments = {k: repeat_fn(result['split_log'][k]) for k in keys}
 
-    return (extracted_results
-            .assign(fold_num=result['fold_num'])
-            .assign(**assignments))
+    return pieces.assign(pieces.assign(extracted_results, {'fold_num': result['fold_num']}), assignments)
 
 
-@curry
-def extract(validator_results, extractor):
-    return pd.concat(list(map(extract_base_iteration(extractor=extractor), validator_results)))
+@_extractor
+def extract(pieces, validator_results, extractor):
+    """
+    Extracts the evaluation results of each fold of a validator log into a DataFrame
+    with one row per evaluation, along with the fold number and the split log of the fold.
 
+    The rows of all folds are collected as plain records and the DataFrame is built once
+    at the end, which is much faster than concatenating one DataFrame per evaluator
+    per fold on long logs. Logs holding values whose dtype could differ between both ways
+    of building the DataFrame, like None or float32 metrics, are extracted by concatenation,
+    so the result is always the same.
 
-@curry
-def extract_lc(validator_results, extractor):
-    return extract(validator_results, learning_curve_evaluator_extractor(base_extractor=extractor))
+    Parameters
+    ----------
+    validator_results : list of dict
+        The `validator_log` of a validator result.
 
+    extractor : function: dict -> pandas.DataFrame
+        Extracts the results of a single evaluation, like `evaluator_extractor`.
 
-@curry
-def extract_reverse_lc(validator_results, extractor):
-    return extract(validator_results, reverse_learning_curve_evaluator_extractor(base_extractor=extractor))
+    Returns
+    ----------
+    extracted : pandas.DataFrame
+        The extracted results of all the folds.
+    """
+    iteration = extract_base_iteration(extractor=extractor)
+    return pieces.concat([_extract_pieces(pieces, iteration, result) for result in validator_results])
 
 
-@curry
-def extract_sc(validator_results, extractor):
-    return extract(validator_results, stability_curve_evaluator_extractor(base_extractor=extractor))
+@_extractor
+def extract_lc(pieces, validator_results, extractor):
+    return _extract_pieces(pieces, extract(extractor=learning_curve_evaluator_extractor(base_extractor=extractor)),
+                           validator_results)
 
 
-@curry
-def extract_param_tuning_iteration(iteration, tuning_log, base_extractor, model_learner_name):
-    iter_df = base_extractor(tuning_log[iteration]["validator_log"])
-    return iter_df.assign(**tuning_log[iteration]["train_log"][model_learner_name]["parameters"])
+@_extractor
+def extract_reverse_lc(pieces, validator_results, extractor):
+    lc_extractor = reverse_learning_curve_evaluator_extractor(base_extractor=extractor)
+    return _extract_pieces(pieces, extract(extractor=lc_extractor), validator_results)
 
 
-@curry
-def extract_tuning(tuning_log, base_extractor, model_learner_name):
+@_extractor
+def extract_sc(pieces, validator_results, extractor):
+    return _extract_pieces(pieces, extract(extractor=stability_curve_evaluator_extractor(base_extractor=extractor)),
+                           validator_results)
+
+
+@_extractor
+def extract_param_tuning_iteration(pieces, iteration, tuning_log, base_extractor, model_learner_name):
+    iter_pieces = _extract_pieces(pieces, base_extractor, tuning_log[iteration]["validator_log"])
+    return pieces.assign(iter_pieces, tuning_log[iteration]["train_log"][model_learner_name]["parameters"])
+
+
+@_extractor
+def extract_tuning(pieces, tuning_log, base_extractor, model_learner_name):
+    """
+    Extracts the validation results of every iteration of a tuning log into a DataFrame,
+    along with the parameters of the model of each iteration. Like `extract`, the rows of all
+    iterations are collected as records and the DataFrame is built once at the end.
+
+    Parameters
+    ----------
+    tuning_log : list of dict
+        The log of a tuning function, like `random_search_tuner`.
+
+    base_extractor : function: list of dict -> pandas.DataFrame
+        Extracts the results of the validator log of one iteration, like `extract`.
+
+    model_learner_name : str
+        The name of the learner whose parameters are tuned.
+
+    Returns
+    ----------
+    extracted : pandas.DataFrame
+        The extracted results of all the iterations.
+    """
     iter_fn = extract_param_tuning_iteration(tuning_log=tuning_log, base_extractor=base_extractor,
                                              model_learner_name=model_learner_name)
-    return pd.concat(list(map(iter_fn, range(len(tuning_log)))))
+    return pieces.concat([_extract_pieces(pieces, iter_fn, iteration) for iteration in range(len(tuning_log))])
 
 
 @curry
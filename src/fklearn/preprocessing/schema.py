@@ -4,6 +4,7 @@ import pandas as pd
 import toolz
 
 from typing import Any, Callable, Dict, List, Optional, Union
+from fklearn.training.utils import compose_declared_columns, declare_columns
 from fklearn.types import LearnerLogType, LearnerReturnType
 
 
@@ -77,6 +78,8 @@ def feature_duplicator(
         }
     }
 
+    declare_columns(p, reads=columns_final_mapping.keys(),
+                    writes=[dest for src, dest in columns_final_mapping.items() if dest != src])
     return p, p(df.copy()), log
 
 
@@ -137,7 +140,7 @@ def column_duplicatable(columns_to_bind: str) -> Callable:
                     **child_kwargs)
 
                 return (
-                    toolz.compose(child_fn, mixin_fn),
+                    compose_declared_columns(child_fn, mixin_fn),
                     child_df,
                     {**mixin_log, **child_log}
                 )
@@ -0,0 +1,271 @@
+import os
+import pickle
+import threading
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+import joblib
+import pandas as pd
+
+from fklearn.training.utils import train_predictions_skipped
+from fklearn.types import LearnerFnType, LearnerReturnType, LogType
+
+
+class StepCache:
+    """
+    Base class of the caches of fitted pipeline steps used by `build_pipeline`.
+    Subclasses store the fitted steps by implementing `_load`, `_store` and `__len__`,
+    while this class keeps the hit, miss and eviction counts.
+    """
+
+    def __init__(self, max_entries: int, max_bytes: int) -> None:
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1, got {0}".format(max_entries))
+        if max_bytes < 1:
+            raise ValueError("max_bytes must be at least 1, got {0}".format(max_bytes))
+
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[LearnerReturnType]:
+        """
+        Returns the fitted step stored under `key`, or None if it is not cached.
+        """
+        with self._lock:
+            value = self._load(key)
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return value
+
+    def put(self, key: str, value: LearnerReturnType) -> None:
+        """
+        Stores a fitted step under `key`, evicting the least recently used steps beyond `max_entries`
+        or `max_bytes`. A step larger than `max_bytes` on its own is not kept.
+        """
+        with self._lock:
+            self.evictions += self._store(key, value)
+
+    def stats(self) -> LogType:
+        """
+        Returns the number of hits, misses, evictions and entries of the cache since it was created,
+        and the approximate size of the entries in bytes.
+        """
+        return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions, "entries": len(self),
+                "bytes": self.nbytes()}
+
+    def nbytes(self) -> int:
+        """
+        Returns the approximate size of the cached steps in bytes.
+        """
+        raise NotImplementedError
+
+    def _load(self, key: str) -> Optional[LearnerReturnType]:
+        raise NotImplementedError
+
+    def _store(self, key: str, value: LearnerReturnType) -> int:
+        raise NotImplementedError
+
+    def __len__(self) -> int:
+        raise NotImplementedError
+
+
+def _step_bytes(value: LearnerReturnType) -> int:
+    # the transformed DataFrame is what takes most of the memory of a fitted step
+    return int(value[1].memory_usage(deep=True).sum())
+
+
+class InMemoryStepCache(StepCache):
+    """
+    Keeps the fitted pipeline steps in memory, evicting the least recently used ones beyond
+    `max_entries` or `max_bytes`. Each step holds the DataFrame it transformed, whose memory
+    usage is what is counted towards `max_bytes`.
+
+    Parameters
+    ----------
+    max_entries : int
+        The maximum number of fitted steps to keep.
+
+    max_bytes : int
+        The maximum approximate size, in bytes, of the fitted steps to keep.
+    """
+
+    def __init__(self, max_entries: int = 16, max_bytes: int = 2 ** 29) -> None:
+        super().__init__(max_entries, max_bytes)
+        self._entries = OrderedDict()  # type: OrderedDict
+        self._nbytes = 0
+
+    def nbytes(self) -> int:
+        return self._nbytes
+
+    def _load(self, key: str) -> Optional[LearnerReturnType]:
+        if key not in self._entries:
+            return None
+        self._entries.move_to_end(key)
+        return self._entries[key][0]
+
+    def _store(self, key: str, value: LearnerReturnType) -> int:
+        if key in self._entries:
+            self._nbytes -= self._entries.pop(key)[1]
+        nbytes = _step_bytes(value)
+        self._entries[key] = (value, nbytes)
+        self._nbytes += nbytes
+
+        evictions = 0
+        while len(self._entries) > self.max_entries or self._nbytes > self.max_bytes:
+            self._nbytes -= self._entries.popitem(last=False)[1][1]
+            evictions += 1
+        return evictions
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class DiskStepCache(StepCache):
+    """
+    Keeps the fitted pipeline steps as files in a folder, so they can be reused across
+    processes and sessions, evicting the least recently used ones beyond `max_entries`
+    or `max_bytes` of files. Predict functions are closures, so they are serialised with `cloudpickle`.
+    Cached steps are not invalidated when the code of a learner changes, so clear the folder when it does.
+
+    Parameters
+    ----------
+    path : str
+        The folder to keep the fitted steps in. It is created if it does not exist.
+
+    max_entries : int
+        The maximum number of fitted steps to keep.
+
+    max_bytes : int
+        The maximum size, in bytes, of the files of the fitted steps to keep.
+    """
+
+    def __init__(self, path: str, max_entries: int = 256, max_bytes: int = 2 ** 32) -> None:
+        import cloudpickle
+
+        super().__init__(max_entries, max_bytes)
+        self.path = path
+        self._pickler = cloudpickle
+        os.makedirs(path, exist_ok=True)
+
+    def nbytes(self) -> int:
+        return sum(os.path.getsize(entry_path) for entry_path in self._entry_paths())
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.path, key + ".pkl")
+
+    def _entry_paths(self) -> list:
+        return [os.path.join(self.path, name) for name in os.listdir(self.path) if name.endswith(".pkl")]
+
+    def _load(self, key: str) -> Optional[LearnerReturnType]:
+        entry_path = self._entry_path(key)
+        if not os.path.exists(entry_path):
+            return None
+
+        with open(entry_path, "rb") as entry:
+            value = pickle.load(entry)
+        # the modification time orders the entries from least to most recently used
+        os.utime(entry_path)
+        return value
+
+    def _store(self, key: str, value: LearnerReturnType) -> int:
+        entry_path = self._entry_path(key)
+        temp_path = "{0}.{1}.tmp".format(entry_path, threading.get_ident())
+        with open(temp_path, "wb") as entry:
+            self._pickler.dump(value, entry)
+        os.replace(temp_path, entry_path)
+
+        # from the most recently used, the entries are kept while they fit in max_entries and max_bytes
+        entry_paths = sorted(self._entry_paths(), key=os.path.getmtime, reverse=True)
+        kept, nbytes = 0, 0
+        for entry_path in entry_paths:
+            nbytes += os.path.getsize(entry_path)
+            if kept == self.max_entries or nbytes > self.max_bytes:
+                break
+            kept += 1
+
+        stale_paths = entry_paths[kept:]
+        for stale_path in stale_paths:
+            os.remove(stale_path)
+        return len(stale_paths)
+
+    def __len__(self) -> int:
+        return len(self._entry_paths())
+
+
+def step_fingerprint(learner: LearnerFnType, df: pd.DataFrame) -> Optional[str]:
+    """
+    Computes the key a fitted pipeline step is cached under, from the learner name, its
+    curried arguments and the contents of its input DataFrame.
+
+    Parameters
+    ----------
+    learner : partially-applied learner function
+        The learner of the step.
+
+    df : pandas.DataFrame
+        The DataFrame the learner is fitted on.
+
+    Returns
+    ----------
+    key : str or None
+        The hash of the step, or None if the step can't be cached, because the learner is
+        defined inside a function or some of its arguments, like lambdas, can't be pickled.
+    """
+    name = getattr(learner, "__qualname__", getattr(learner, "__name__", None))
+    if name is None or "<locals>" in name or "<lambda>" in name:
+        return None
+
+    step = (getattr(learner, "__module__", None), name,
+            getattr(learner, "args", ()), getattr(learner, "keywords", {}),
+            train_predictions_skipped())
+    try:
+        # hashes the contents of the frame, since its pickled form also depends on its memory layout
+        data = (list(df.columns), [str(dtype) for dtype in df.dtypes], pd.util.hash_pandas_object(df).values)
+        return joblib.hash((step, data))
+    except (pickle.PicklingError, TypeError, AttributeError):
+        return None
+
+
+def fit_step(learner: LearnerFnType, df: pd.DataFrame, cache: StepCache) -> Tuple[LearnerReturnType, str]:
+    """
+    Fits a pipeline step, reusing the fitted step from `cache` when the same learner
+    with the same arguments was already fitted on the same data.
+
+    Parameters
+    ----------
+    learner : partially-applied learner function
+        The learner of the step.
+
+    df : pandas.DataFrame
+        The DataFrame to fit the learner on.
+
+    cache : StepCache
+        The cache of fitted steps.
+
+    Returns
+    ----------
+    result : tuple of (function, pandas.DataFrame, dict)
+        The predict function, transformed DataFrame and log of the learner.
+
+    status : str
+        "hit" if the step was cached, "miss" if it was fitted and cached,
+        or "uncacheable" if it was fitted but can't be cached.
+    """
+    key = step_fingerprint(learner, df)
+    if key is None:
+        return learner(df), "uncacheable"
+
+    cached = cache.get(key)
+    if cached is not None:
+        predict_fn, new_df, log = cached
+        return (predict_fn, new_df.copy(), dict(log)), "hit"
+
+    predict_fn, new_df, log = learner(df)
+    cache.put(key, (predict_fn, new_df.copy(), dict(log)))
+    return (predict_fn, new_df, log), "miss"
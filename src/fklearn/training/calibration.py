@@ -6,7 +6,7 @@ from toolz import curry
 
 from fklearn.common_docstrings import learner_pred_fn_docstring, learner_return_docstring
 from fklearn.types import LearnerReturnType
-from fklearn.training.utils import log_learner_time
+from fklearn.training.utils import log_learner_time, declare_columns
 
 
 @curry
@@ -64,6 +64,7 @@ def isotonic_calibration_learner(df: pd.DataFrame,
         'training_samples': len(df)},
         'object': clf}
 
+    declare_columns(p, reads=[prediction_column], writes=[output_column])
     return p, p(df), log
 
 
@@ -160,6 +161,8 @@ def find_thresholds_with_same_risk(df: pd.DataFrame,
         'sensitive_factor': sensitive_factor,
         'fair_thresholds': fair_thresholds}}
 
+    declare_columns(p, reads=[sensitive_factor, model_prediction_output],
+                    writes=[output_column_name])
     return p, p(df), log
 
 
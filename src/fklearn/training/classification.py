@@ -11,7 +11,7 @@ from sklearn import __version__ as sk_version
 
 from fklearn.types import LearnerReturnType, LogType
 from fklearn.common_docstrings import learner_return_docstring, learner_pred_fn_docstring
-from fklearn.training.utils import log_learner_time, expand_features_encoded
+from fklearn.training.utils import log_learner_time, expand_features_encoded, declare_columns, score_train_set
 
 
 @curry
@@ -91,7 +91,8 @@ def logistic_classification_learner(df: pd.DataFrame,
         'training_samples': len(df)},
         'object': clf}
 
-    return p, p(df), log
+    declare_columns(p, reads=features, writes=[prediction_column])
+    return p, score_train_set(p, df), log
 
 
 logistic_classification_learner.__doc__ += learner_return_docstring("Logistic Regression")
@@ -226,7 +227,8 @@ def xgb_classification_learner(df: pd.DataFrame,
         'training_samples': len(df)},
         'object': bst}
 
-    return p, p(df), log
+    declare_columns(p, reads=features, writes=[prediction_column])
+    return p, score_train_set(p, df), log
 
 
 xgb_classification_learner.__doc__ += learner_return_docstring("XGboost Classifier")
@@ -401,7 +403,8 @@ def catboost_classification_learner(df: pd.DataFrame,
         'training_samples': len(df)},
         'object': cbr}
 
-    return p, p(df), log
+    declare_columns(p, reads=features, writes=[prediction_column])
+    return p, score_train_set(p, df), log
 
 
 catboost_classification_learner.__doc__ += learner_return_docstring("catboost_classification_learner")
@@ -490,7 +493,8 @@ def nlp_logistic_classification_learner(df: pd.DataFrame,
         'training_samples': len(df)},
         'object': clf}
 
-    return p, p(df), log
+    declare_columns(p, reads=text_feature_cols, writes=[prediction_column])
+    return p, score_train_set(p, df), log
 
 
 nlp_logistic_classification_learner.__doc__ += learner_return_docstring("NLP Logistic Regression")
@@ -679,7 +683,8 @@ def lgbm_classification_learner(df: pd.DataFrame,
         'training_samples': len(df)},
         'object': bst}
 
-    return p, p(df), log
+    declare_columns(p, reads=features, writes=[prediction_column])
+    return p, score_train_set(p, df), log
 
 
 lgbm_classification_learner.__doc__ += learner_return_docstring("LGBM Classifier")
@@ -1,12 +1,12 @@
 from typing import Any, Dict, List, TypeVar
 
 import pandas as pd
-from toolz import curry, assoc, compose
+from toolz import curry, assoc, compose, concat
 
 from fklearn.training.classification import xgb_classification_learner
 from fklearn.common_docstrings import learner_pred_fn_docstring, learner_return_docstring
 from fklearn.types import LearnerReturnType
-from fklearn.training.utils import log_learner_time
+from fklearn.training.utils import log_learner_time, declare_columns, score_train_set
 
 T = TypeVar('T')
 
@@ -157,7 +157,10 @@ def xgb_octopus_classification_learner(train_set: pd.DataFrame,
         }
     }
 
-    return p, p(train_set), log
+    declare_columns(p, reads=[train_split_col, *concat(features_by_bin.values())],
+                    writes=[prediction_column])
+
+    return p, score_train_set(p, train_set), log
 
 
 xgb_octopus_classification_learner.__doc__ += learner_return_docstring("Octopus XGB Classifier")
@@ -6,7 +6,7 @@ from toolz import curry, identity
 
 from fklearn.common_docstrings import learner_return_docstring, learner_pred_fn_docstring
 from fklearn.types import LearnerReturnType
-from fklearn.training.utils import log_learner_time
+from fklearn.training.utils import log_learner_time, declare_columns
 
 
 @curry
@@ -77,6 +77,7 @@ def imputer(df: pd.DataFrame,
         }
     }
 
+    declare_columns(p, reads=columns_to_impute, writes=columns_to_impute)
     return p, p(df), log
 
 
@@ -119,6 +120,7 @@ def placeholder_imputer(df: pd.DataFrame,
         }
     }
 
+    declare_columns(p, reads=columns_to_impute, writes=columns_to_impute)
     return p, p(df), log
 
 
@@ -1,14 +1,246 @@
-from collections import defaultdict
+import tracemalloc
+import warnings
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
 from inspect import Parameter, signature
-from typing import Dict
+from time import perf_counter
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 
+import numpy as np
 import pandas as pd
 import toolz as fp
 
-from fklearn.types import LearnerFnType, LearnerReturnType, PredictFnType
+from fklearn.training.cache import StepCache, fit_step
+from fklearn.training.utils import declared_columns, skip_train_predictions, train_predictions_skipped
+from fklearn.types import LearnerFnType, LearnerReturnType, LogType, PredictFnType
 
+# Number of most recent calls kept per step by instrumented predict functions
+LATENCY_WINDOW = 10000
 
-def build_pipeline(*learners: LearnerFnType, has_repeated_learners: bool = False) -> LearnerFnType:
+
+def compile_predict_fn(fns: List[PredictFnType],
+                       step_names: List[str],
+                       instrumented: bool = False,
+                       column_lineage: Optional[List[LogType]] = None) -> PredictFnType:
+    """
+    Chains the predict functions of a fitted pipeline into a single predict function.
+    Which keyword arguments go to each predict function is resolved once, when compiling,
+    from their signatures, so calling the returned function is a direct call chain.
+
+    Parameters
+    ----------
+    fns : list of function pandas.DataFrame, **kwargs -> pandas.DataFrame
+        The predict functions of each step of the pipeline, in order.
+
+    step_names : list of str
+        The name of each step of the pipeline, in order.
+
+    instrumented : bool
+        Whether to record the latency of each step on every call. The latencies
+        of the last `LATENCY_WINDOW` calls are kept in the `latencies` attribute of the
+        returned function, as a list of (step name, deque of seconds) pairs.
+        See `predict_latency_percentiles`.
+
+    column_lineage : list of dict
+        The columns each predict function reads and writes, in order. If given, the predict
+        functions and their lineage are kept in the `steps` and `column_lineage` attributes of
+        the returned function, so it can be resumed from an intermediate step, and its `resumable_on`
+        attribute is `resumable_predict_fn` bound to it, for callers that don't import the pipeline
+        module, like `permutation_evaluator`. See `resumable_predict_fn`.
+
+    Returns
+    ----------
+    predict_fn : function pandas.DataFrame, **kwargs -> pandas.DataFrame
+        A function that applies all predict functions in sequence, with optional kwargs.
+    """
+
+    # Maps each keyword argument to the position of the predict functions that accept it
+    routing = defaultdict(list)  # type: Dict[str, List[int]]
+    for position, fn in enumerate(fns):
+        for parameter in signature(fn).parameters:
+            routing[parameter].append(position)
+
+    def route(kwargs: Dict[str, Any]) -> List[Dict[str, Any]]:
+        fns_args = [{} for _ in fns]  # type: List[Dict[str, Any]]
+        for key, value in kwargs.items():
+            for position in routing.get(key, []):
+                fns_args[position][key] = value
+        return fns_args
+
+    latencies = [(name, deque(maxlen=LATENCY_WINDOW)) for name in step_names]  # type: List[Any]
+
+    def predict_fn(df: pd.DataFrame, **kwargs: Any) -> pd.DataFrame:
+        fns_args = route(kwargs) if kwargs else [{} for _ in fns]
+        for fn, args in zip(fns, fns_args):
+            df = fn(df, **args)
+        return df
+
+    def instrumented_predict_fn(df: pd.DataFrame, **kwargs: Any) -> pd.DataFrame:
+        fns_args = route(kwargs) if kwargs else [{} for _ in fns]
+        for fn, args, (_, step_latencies) in zip(fns, fns_args, latencies):
+            t0 = perf_counter()
+            df = fn(df, **args)
+            step_latencies.append(perf_counter() - t0)
+        return df
+
+    compiled_fn = instrumented_predict_fn if instrumented else predict_fn
+    if instrumented:
+        compiled_fn.latencies = latencies  # type: ignore
+    if column_lineage is not None:
+        compiled_fn.steps = fns  # type: ignore
+        compiled_fn.column_lineage = column_lineage  # type: ignore
+        compiled_fn.resumable_on = lambda data, columns=None: resumable_predict_fn(  # type: ignore
+            compiled_fn, data, columns)
+
+    return compiled_fn
+
+
+def predict_latency_percentiles(predict_fn: PredictFnType,
+                                percentiles: Tuple[float, ...] = (50, 90, 99)) -> pd.DataFrame:
+    """
+    Summarizes the latencies recorded by an instrumented pipeline predict function.
+
+    Parameters
+    ----------
+    predict_fn : function pandas.DataFrame, **kwargs -> pandas.DataFrame
+        A predict function returned by a pipeline built with `instrument_predict=True`.
+
+    percentiles : tuple of float
+        The latency percentiles to compute, between 0 and 100.
+
+    Returns
+    ----------
+    latencies : pandas.DataFrame
+        A DataFrame with one row per pipeline step, in order, with the step name,
+        the number of recorded calls and the requested percentiles in seconds.
+    """
+    if not hasattr(predict_fn, "latencies"):
+        raise ValueError("predict_fn is not instrumented. Build the pipeline with `instrument_predict=True`.")
+
+    def step_summary(step: str, step_latencies: deque) -> LogType:
+        values = np.array(step_latencies, dtype=float)
+        return {"step": step,
+                "calls": len(values),
+                **{"p%g" % q: np.percentile(values, q) if len(values) > 0 else np.nan for q in percentiles}}
+
+    return pd.DataFrame([step_summary(step, step_latencies)
+                         for step, step_latencies in predict_fn.latencies])  # type: ignore
+
+
+def _step_lineage(learner_name: str,
+                  step_columns: Optional[Dict[str, List[str]]],
+                  input_columns: List[str],
+                  output_columns: List[str]) -> LogType:
+    declared_reads = step_columns["reads"] if step_columns else None
+    declared_writes = step_columns["writes"] if step_columns else []
+    new_columns = [col for col in output_columns if col not in input_columns and col not in declared_writes]
+    return {"learner": learner_name, "reads": declared_reads, "writes": declared_writes + new_columns}
+
+
+def required_columns(column_lineage: List[LogType], input_columns: List[str]) -> Optional[List[str]]:
+    """
+    Finds which input columns a fitted pipeline needs at prediction time from its column lineage.
+
+    Parameters
+    ----------
+    column_lineage : list of dict
+        The `column_lineage` entry of the pipeline `__fkml__` log, with the columns
+        each step reads and writes.
+
+    input_columns : list of str
+        The columns of the DataFrame the pipeline was fitted on.
+
+    Returns
+    ----------
+    required_columns : list of str or None
+        The input columns read by some step before any previous step writes them,
+        in the order of `input_columns`. None if some step does not declare the columns it reads.
+    """
+    required = set()  # type: set
+    written = set()  # type: set
+    for step in column_lineage:
+        if step["reads"] is None:
+            return None
+        required.update(col for col in step["reads"] if col not in written)
+        written.update(step["writes"])
+
+    return [col for col in input_columns if col in required]
+
+
+def resumable_predict_fn(predict_fn: PredictFnType,
+                         data: pd.DataFrame,
+                         columns: Optional[List[str]] = None) -> Callable[[Dict[str, Any]], pd.DataFrame]:
+    """
+    Scores `data` with the predict function of a pipeline, keeping the intermediate outputs
+    needed to then score copies of `data` with some columns replaced, like the shuffled features
+    of permutation importance, from the first step that reads or writes the replaced columns
+    instead of from the start of the pipeline. The results are the same as running the whole
+    pipeline, as long as the learners declare the columns they read and write accurately.
+    Steps that do not declare them are taken to read every column.
+
+    Parameters
+    ----------
+    predict_fn : function pandas.DataFrame -> pandas.DataFrame
+        The predict function of a pipeline from `build_pipeline`. Other predict functions
+        are run in full for every copy.
+
+    data : pandas.DataFrame
+        The DataFrame whose copies will be scored.
+
+    columns : list of str
+        The columns that will be replaced, so only the intermediate outputs needed to resume
+        after replacing them are kept. If None, the intermediate outputs of every step are kept.
+
+    Returns
+    ----------
+    predict_with : function dict -> pandas.DataFrame
+        A function that takes a dict from column names to their replacement values, and
+        returns the same as `predict_fn(data.assign(**replaced_columns))`.
+    """
+    steps = getattr(predict_fn, "steps", None)  # type: Optional[List[PredictFnType]]
+    column_lineage = getattr(predict_fn, "column_lineage", None)  # type: Optional[List[LogType]]
+
+    if steps is None or column_lineage is None:
+        return lambda replaced_columns: predict_fn(data.assign(**replaced_columns))
+
+    def first_step(column: str) -> int:
+        return next((position for position, step in enumerate(column_lineage)  # type: ignore
+                     if step["reads"] is None or column in step["reads"] or column in step["writes"]), len(steps))
+
+    resume_steps = set(range(len(steps) + 1)) if columns is None else set(map(first_step, columns)) | {len(steps)}
+
+    # the input of each step a replaced column can be resumed from, and the output of the last one
+    step_inputs = {}  # type: Dict[int, pd.DataFrame]
+    current_data = data
+    for position, fn in enumerate(steps):
+        if position in resume_steps:
+            step_inputs[position] = current_data
+        current_data = fn(current_data)
+    step_inputs[len(steps)] = current_data
+
+    # replacement values are aligned to the rows of data, so steps must keep them
+    rows_kept = all(step_input.index.equals(data.index) for step_input in step_inputs.values())
+
+    def predict_with(replaced_columns: Dict[str, Any]) -> pd.DataFrame:
+        resume_step = min(map(first_step, replaced_columns), default=len(steps))
+        if not rows_kept or resume_step not in step_inputs:
+            return predict_fn(data.assign(**replaced_columns))
+
+        # replaced columns dropped before the resume step don't reach it in a full run either
+        step_input = step_inputs[resume_step]
+        new_data = step_input.assign(**{column: values for column, values in replaced_columns.items()
+                                        if column in step_input.columns})
+        for fn in steps[resume_step:]:
+            new_data = fn(new_data)
+        return new_data
+
+    return predict_with
+
+
+def build_pipeline(*learners: LearnerFnType, has_repeated_learners: bool = False,
+                   instrument_predict: bool = False, prune_columns: bool = False,
+                   keep_columns: Optional[List[str]] = None, fit_only: bool = False,
+                   track_memory: bool = False, cache: Optional[StepCache] = None) -> LearnerFnType:
     """
     Builds a pipeline of different chained learners functions with the possibility of using keyword arguments
     in the predict functions of the pipeline.
@@ -29,6 +261,39 @@ def build_pipeline(*learners: LearnerFnType, has_repeated_learners: bool = False
     has_repeated_learners : bool
         Boolean value indicating wheter the pipeline contains learners with the same name or not.
 
+    instrument_predict : bool
+        Whether the predict function should record the latency of each step.
+        The recorded latencies can be summarized with `predict_latency_percentiles`.
+
+    prune_columns : bool
+        Whether the predict function should select only the input columns the pipeline
+        needs before applying the first learner, so the other columns are not carried
+        through every step. The needed columns are found from the columns each learner declares
+        it reads and writes, recorded in the `column_lineage` and `required_columns` entries of the
+        `__fkml__` log. If some learner does not declare them, a warning is raised and no column is pruned.
+
+    keep_columns : list of str
+        Input columns to keep in the predict function output when pruning columns, like ids or targets.
+
+    fit_only : bool
+        Whether to skip scoring the training set in the last learner, when only the predict function
+        is needed, like when tuning. Only model learners support skipping, and the returned DataFrame is
+        then the training set as the last learner received it, without its predictions. Leave it False
+        if the training predictions will be evaluated.
+
+    track_memory : bool
+        Whether to record in the `peak_memory` entry of the `__fkml__` log the peak memory, in bytes,
+        allocated while fitting the pipeline. It is measured with `tracemalloc`, which slows down the fit.
+        If `tracemalloc` is already tracing, only what is allocated on top of the memory traced before the fit
+        is counted, and on Python 3.9+ the traced peak is reset.
+
+    cache : StepCache
+        A cache of fitted steps, like `InMemoryStepCache` or `DiskStepCache` from `fklearn.training.cache`.
+        Steps whose learner and arguments were already fitted on the same data return the cached
+        predict function, transformed DataFrame and log instead of being refitted, which saves refitting
+        the same preprocessing steps when tuning the last ones. The number of cache hits, misses and
+        uncacheable steps of the fit is recorded in the `cache` entry of the `__fkml__` log.
+
     Returns
     ----------
     p : function pandas.DataFrame, **kwargs -> pandas.DataFrame
@@ -63,7 +328,7 @@ def build_pipeline(*learners: LearnerFnType, has_repeated_learners: bool = False
     for learner in learners:
         _has_one_unfilled_arg(learner)
 
-    def pipeline(data: pd.DataFrame) -> LearnerReturnType:
+    def fit_pipeline(data: pd.DataFrame) -> LearnerReturnType:
         current_data = data.copy()
         features = list(data.columns)
         fns = []
@@ -71,8 +336,20 @@ def build_pipeline(*learners: LearnerFnType, has_repeated_learners: bool = False
         pipeline = []
         serialisation = defaultdict(list)  # type: dict
 
-        for learner in learners:
-            learner_fn, new_data, learner_log = learner(current_data)
+        column_lineage = []
+        cache_statuses = []  # type: List[str]
+
+        for position, learner in enumerate(learners):
+            input_columns = list(current_data.columns)
+
+            # The training output of every learner but the last is the input of the next one
+            is_last = position == len(learners) - 1
+            with skip_train_predictions(is_last and (fit_only or train_predictions_skipped())):
+                if cache is None:
+                    learner_fn, new_data, learner_log = learner(current_data)
+                else:
+                    (learner_fn, new_data, learner_log), cache_status = fit_step(learner, current_data, cache)
+                    cache_statuses.append(cache_status)
             # Check for invalid predict fn arguments
             _no_variable_args(learner, learner_fn)
 
@@ -85,25 +362,205 @@ def build_pipeline(*learners: LearnerFnType, has_repeated_learners: bool = False
             if learner_log.get("obj"):
                 model_objects["obj"] = learner_log.pop("obj")
 
+            column_lineage.append(_step_lineage(learner_name, declared_columns(learner_fn),
+                                                input_columns, list(new_data.columns)))
+
             serialisation[learner_name].append({"fn": learner_fn, "log": learner_log, **model_objects})
             logs.append(learner_log)
 
         merged_logs = fp.merge(logs)
 
-        def predict_fn(df: pd.DataFrame, **kwargs: Dict) -> pd.DataFrame:
-            # Get the proper arguments for each predict function (based on their signature)
-            fns_args = [{k: v for k, v in kwargs.items() if k in signature(f).parameters} for f in fns]
-            # Partially apply the arguments to the predict functions when applicable
-            fns_with_args = [fp.curry(fn)(**args) if len(args) > 0 else fn for fn, args in zip(fns, fns_args)]
-            return fp.pipe(df, *fns_with_args)
+        pipeline_required_columns = required_columns(column_lineage, features)
+
+        predict_fns, predict_steps = fns, pipeline
+        if prune_columns and pipeline_required_columns is not None:
+            selected_columns = pipeline_required_columns + [col for col in keep_columns or []
+                                                            if col not in pipeline_required_columns]
+
+            def column_pruner(new_df: pd.DataFrame) -> pd.DataFrame:
+                return new_df[selected_columns]
+
+            predict_fns, predict_steps = [column_pruner] + fns, ["column_pruner"] + pipeline
+            # the pruner passes the selected columns through unchanged, so resuming can skip it
+            predict_lineage = [{"learner": "column_pruner", "reads": [], "writes": []}] + column_lineage
+        else:
+            predict_lineage = column_lineage
+            if prune_columns:
+                warnings.warn("Some learners in the pipeline do not declare the columns they read, "
+                              "so the predict function will not prune columns.")
+
+        predict_fn = compile_predict_fn(predict_fns, predict_steps, instrument_predict, predict_lineage)
 
         serialisation_logs = {k: v if has_repeated_learners else v[-1] for k, v in serialisation.items()}
 
         merged_logs["__fkml__"] = {"pipeline": pipeline,
                                    "output_columns": list(current_data.columns),
                                    "features": features,
+                                   "column_lineage": column_lineage,
+                                   "required_columns": pipeline_required_columns,
                                    "learners": {**serialisation_logs}}
 
+        if cache is not None:
+            merged_logs["__fkml__"]["cache"] = {"hits": cache_statuses.count("hit"),
+                                                "misses": cache_statuses.count("miss"),
+                                                "uncacheable": cache_statuses.count("uncacheable")}
+
         return predict_fn, current_data, merged_logs
 
+    def pipeline(data: pd.DataFrame) -> LearnerReturnType:
+        if not track_memory:
+            return fit_pipeline(data)
+
+        # when memory is already traced, like in a nested pipeline, the peak is measured from what is
+        # allocated before the fit, and the peak of the outer trace is reset where Python supports it
+        was_tracing = tracemalloc.is_tracing()
+        if was_tracing:
+            allocated_before = tracemalloc.get_traced_memory()[0]
+            if hasattr(tracemalloc, "reset_peak"):
+                tracemalloc.reset_peak()
+        else:
+            allocated_before = 0
+            tracemalloc.start()
+
+        try:
+            predict_fn, current_data, logs = fit_pipeline(data)
+            logs["__fkml__"]["peak_memory"] = max(tracemalloc.get_traced_memory()[1] - allocated_before, 0)
+            return predict_fn, current_data, logs
+        finally:
+            if not was_tracing:
+                tracemalloc.stop()
+
+    # what fingerprints the pipeline, for instance to key validator checkpoints, leaving the cache out
+    pipeline.fingerprint = (learners, has_repeated_learners, instrument_predict, prune_columns,  # type: ignore
+                            keep_columns, fit_only, track_memory)
     return pipeline
+
+
+def read_chunks(paths: Union[str, List[str]], chunksize: int = 100000) -> Iterator[pd.DataFrame]:
+    """
+    Lazily reads Parquet or CSV files in chunks of rows, so only one chunk is in memory at a time.
+    Files ending in `.parquet` or `.pq` are read with pyarrow, installed with `pip install fklearn[parquet]`,
+    all others are read as CSV.
+
+    Parameters
+    ----------
+    paths : str or list of str
+        The paths of the files to read, in order.
+
+    chunksize : int
+        The maximum number of rows in each chunk.
+
+    Returns
+    ----------
+    chunks : iterator of pandas.DataFrame
+        The chunks of all files, in order.
+    """
+    for path in [paths] if isinstance(paths, str) else paths:
+        if path.endswith((".parquet", ".pq")):
+            import pyarrow.parquet as pq
+
+            for batch in pq.ParquetFile(path).iter_batches(batch_size=chunksize):
+                yield batch.to_pandas()
+        else:
+            yield from pd.read_csv(path, chunksize=chunksize)
+
+
+def stream_predict(predict_fn: PredictFnType,
+                   chunks: Union[Iterable[pd.DataFrame], str, List[str]],
+                   chunksize: int = 100000,
+                   n_jobs: int = 1,
+                   **kwargs: Any) -> Iterator[pd.DataFrame]:
+    """
+    Lazily applies a fitted predict function chunk by chunk, for inputs that do not fit in memory.
+    The predict functions of the fitted learners only use the state learned at fit time, like
+    the distribution learned by `ecdfer`, so the chunks are the same as predicting on the whole frame.
+
+    Parameters
+    ----------
+    predict_fn : function pandas.DataFrame, **kwargs -> pandas.DataFrame
+        A predict function, like the one returned by a pipeline built with `build_pipeline`.
+
+    chunks : iterable of pandas.DataFrame, str or list of str
+        The chunks to predict on, or the paths of Parquet or CSV files to read them from with `read_chunks`.
+
+    chunksize : int
+        The maximum number of rows in each chunk when reading files.
+
+    n_jobs : int
+        Number of threads predicting chunks concurrently. At most `2 * n_jobs` chunks
+        are in memory at a time, and the predictions keep the order of the chunks.
+
+    kwargs :
+        Keyword arguments passed to `predict_fn`.
+
+    Returns
+    ----------
+    predictions : iterator of pandas.DataFrame
+        The result of `predict_fn` on each chunk, in order. Use `write_chunks` to write them incrementally.
+    """
+    if isinstance(chunks, str) or (isinstance(chunks, list) and all(isinstance(chunk, str) for chunk in chunks)):
+        chunks = read_chunks(chunks, chunksize)  # type: ignore
+
+    if n_jobs == 1:
+        for chunk in chunks:
+            yield predict_fn(chunk, **kwargs)
+        return
+
+    with ThreadPoolExecutor(max_workers=n_jobs) as executor:
+        pending = deque()  # type: deque
+        for chunk in chunks:
+            pending.append(executor.submit(predict_fn, chunk, **kwargs))
+            if len(pending) >= 2 * n_jobs:
+                yield pending.popleft().result()
+
+        while pending:
+            yield pending.popleft().result()
+
+
+def write_chunks(chunks: Iterable[pd.DataFrame], output_path: str, keep_index: bool = True) -> int:
+    """
+    Writes DataFrame chunks to a single Parquet or CSV file as they are produced, so only one
+    chunk is in memory at a time. Paths ending in `.parquet` or `.pq` are written with pyarrow,
+    installed with `pip install fklearn[parquet]`, all others as CSV.
+
+    Parameters
+    ----------
+    chunks : iterable of pandas.DataFrame
+        The chunks to write, with the same columns. For instance, the result of `stream_predict`.
+
+    output_path : str
+        The path of the file to write. It is overwritten if it exists.
+
+    keep_index : bool
+        Whether to write the index of the chunks, like `DataFrame.to_csv` and `DataFrame.to_parquet` do by
+        default. It is written as the first column of CSV files, so read them back with `index_col=0`.
+        Set it to False when the index carries no information, like the row numbers of `read_chunks`.
+
+    Returns
+    ----------
+    n_rows : int
+        The number of rows written.
+    """
+    n_rows = 0
+
+    if output_path.endswith((".parquet", ".pq")):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        writer = None
+        try:
+            for chunk in chunks:
+                table = pa.Table.from_pandas(chunk, preserve_index=keep_index)
+                if writer is None:
+                    writer = pq.ParquetWriter(output_path, table.schema)
+                writer.write_table(table)
+                n_rows += len(chunk)
+        finally:
+            if writer is not None:
+                writer.close()
+    else:
+        for chunk in chunks:
+            chunk.to_csv(output_path, mode="a" if n_rows else "w", header=not n_rows, index=keep_index)
+            n_rows += len(chunk)
+
+    return n_rows
@@ -9,7 +9,7 @@ from sklearn import __version__ as sk_version
 
 from fklearn.common_docstrings import learner_pred_fn_docstring, learner_return_docstring
 from fklearn.types import LearnerReturnType
-from fklearn.training.utils import log_learner_time, expand_features_encoded
+from fklearn.training.utils import log_learner_time, expand_features_encoded, declare_columns, score_train_set
 
 
 @curry
@@ -81,7 +81,8 @@ def linear_regression_learner(df: pd.DataFrame,
         'training_samples': len(df)},
         'object': regr}
 
-    return p, p(df), log
+    declare_columns(p, reads=features, writes=[prediction_column])
+    return p, score_train_set(p, df), log
 
 
 linear_regression_learner.__doc__ += learner_return_docstring("Linear Regression")
@@ -193,7 +194,8 @@ def xgb_regression_learner(df: pd.DataFrame,
         'training_samples': len(df)},
         'object': bst}
 
-    return p, p(df), log
+    declare_columns(p, reads=features, writes=[prediction_column])
+    return p, score_train_set(p, df), log
 
 
 xgb_regression_learner.__doc__ += learner_return_docstring("XGboost Regressor")
@@ -298,7 +300,8 @@ def catboost_regressor_learner(df: pd.DataFrame,
         'training_samples': len(df)},
         'object': cbr}
 
-    return p, p(df), log
+    declare_columns(p, reads=features, writes=[prediction_column])
+    return p, score_train_set(p, df), log
 
 
 catboost_regressor_learner.__doc__ += learner_return_docstring("CatBoostRegressor")
@@ -398,7 +401,8 @@ def gp_regression_learner(df: pd.DataFrame,
         'training_samples': len(df)},
         'object': gp}
 
-    return p, p(df), log
+    declare_columns(p, reads=features, writes=[prediction_column])
+    return p, score_train_set(p, df), log
 
 
 gp_regression_learner.__doc__ += learner_return_docstring("Gaussian Process Regressor")
@@ -512,7 +516,8 @@ def lgbm_regression_learner(df: pd.DataFrame,
         'training_samples': len(df)},
         'object': bst}
 
-    return p, p(df), log
+    declare_columns(p, reads=features, writes=[prediction_column])
+    return p, score_train_set(p, df), log
 
 
 lgbm_regression_learner.__doc__ += learner_return_docstring("LGBM Regressor")
@@ -594,7 +599,16 @@ def custom_supervised_model_learner(df: pd.DataFrame,
 
     log["object"] = model
 
-    return p, p(df), log
+    if supervised_type == 'classification':
+        # one probability column per class, in the order of predict_proba
+        n_classes = len(getattr(model, "classes_", np.unique(df[target].values)))
+        prediction_columns = [prediction_column + "_" + str(key) for key in range(n_classes)]
+    else:
+        prediction_columns = [prediction_column]
+
+    declare_columns(p, reads=features, writes=prediction_columns)
+
+    return p, score_train_set(p, df), log
 
 
 custom_supervised_model_learner.__doc__ += learner_return_docstring("Custom Supervised Model Learner")
@@ -669,7 +683,8 @@ def elasticnet_regression_learner(df: pd.DataFrame,
         'training_samples': len(df)},
         'object': regr}
 
-    return p, p(df), log
+    declare_columns(p, reads=features, writes=[prediction_column])
+    return p, score_train_set(p, df), log
 
 
 elasticnet_regression_learner.__doc__ += learner_return_docstring("ElasticNet Regression")
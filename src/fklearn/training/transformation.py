@@ -1,4 +1,4 @@
-from typing import Any, Callable, Dict, List, Union, Optional
+from typing import Any, Callable, Dict, List, Optional, Union
 
 import numpy as np
 import pandas as pd
@@ -7,7 +7,7 @@ from sklearn.preprocessing import StandardScaler
 from statsmodels.distributions import empirical_distribution as ed
 from toolz import curry, merge, compose, mapcat
 from fklearn.common_docstrings import learner_return_docstring, learner_pred_fn_docstring
-from fklearn.training.utils import log_learner_time
+from fklearn.training.utils import log_learner_time, declare_columns
 from fklearn.types import LearnerReturnType, LearnerLogType
 from fklearn.preprocessing.schema import column_duplicatable
 
@@ -46,6 +46,7 @@ def selector(df: pd.DataFrame,
         'predict_columns': predict_columns,
         'transformed_column': list(set(training_columns).union(predict_columns))}}
 
+    declare_columns(p, reads=predict_columns, writes=[])
     return p, df[training_columns], log
 
 
@@ -93,6 +94,7 @@ def capper(df: pd.DataFrame,
         'transformed_column': columns_to_cap,
         'precomputed_caps': precomputed_caps}}
 
+    declare_columns(p, reads=columns_to_cap, writes=columns_to_cap)
     return p, p(df), log
 
 
@@ -141,6 +143,7 @@ def floorer(df: pd.DataFrame,
         'transformed_column': columns_to_floor,
         'precomputed_floors': precomputed_floors}}
 
+    declare_columns(p, reads=columns_to_floor, writes=columns_to_floor)
     return p, p(df), log
 
 
@@ -200,6 +203,7 @@ def ecdfer(df: pd.DataFrame,
         'ascending': ascending,
         'transformed_column': [ecdf_column]}}
 
+    declare_columns(p, reads=[prediction_column], writes=[ecdf_column])
     return p, p(df), log
 
 
@@ -282,6 +286,7 @@ def discrete_ecdfer(df: pd.DataFrame,
 
         return new_df.assign(**{ecdf_column: y[tind].values})
 
+    declare_columns(p, reads=[prediction_column], writes=[ecdf_column])
     return p, p(df), log
 
 
@@ -323,12 +328,102 @@ def prediction_ranger(df: pd.DataFrame,
         'prediction_max': prediction_max,
         'transformed_column': [prediction_column]}}
 
+    declare_columns(p, reads=[prediction_column], writes=[prediction_column])
     return p, p(df), log
 
 
 prediction_ranger.__doc__ += learner_return_docstring("Prediction Ranger")
 
 
+def _is_float_nan(value: Any) -> bool:
+    return isinstance(value, float) and np.isnan(value)
+
+
+def _replace_column_elementwise(series: pd.Series, mapping: Dict, replace_unseen: Any) -> pd.Series:
+    return series.apply(lambda x: nan if _is_float_nan(x) else mapping.get(x, replace_unseen))
+
+
+def _object_array(values: List[Any]) -> np.ndarray:
+    # keeps sequences, like tuples or lists, as single values
+    array = np.empty(len(values), dtype=object)
+    for position, value in enumerate(values):
+        array[position] = value
+    return array
+
+
+def _column_replacer(mapping: Dict, replace_unseen: Any) -> Callable[[pd.Series], pd.Series]:
+    """
+    Builds, once, the index of the keys of `mapping` and the array of their replacements, and returns
+    a function that replaces the values of a column with them, like `_replace_column_elementwise`.
+    """
+    keys = [key for key in mapping if not (pd.api.types.is_scalar(key) and pd.isnull(key))]
+    # pandas doesn't match booleans with numbers like dicts do, so they are looked up as integers
+    key_index = pd.Index([int(key) if isinstance(key, (bool, np.bool_)) else key for key in keys],
+                         dtype=object, tupleize_cols=False)
+    # numeric keys are looked up in a numeric index, which is faster on numeric columns
+    if pd.api.types.infer_dtype(key_index) in ("integer", "floating", "mixed-integer-float"):
+        key_index = pd.Index(pd.to_numeric(key_index))
+    if not key_index.is_unique:
+        return lambda series: _replace_column_elementwise(series, mapping, replace_unseen)
+
+    # the replacements by key position, followed by the ones of unseen values and of float NaNs
+    candidates = _object_array([mapping[key] for key in keys] + [replace_unseen, nan])
+    unseen_code, nan_code = len(keys), len(keys) + 1
+
+    def replace(series: pd.Series) -> pd.Series:
+        if len(series) == 0 or not isinstance(series.dtype, np.dtype):
+            return _replace_column_elementwise(series, mapping, replace_unseen)
+
+        values = series.to_numpy() if series.dtype.kind in "biufO" else series.astype(object).to_numpy()
+        if values.dtype.kind == "O" and pd.api.types.infer_dtype(values, skipna=True) == "boolean":
+            return _replace_column_elementwise(series, mapping, replace_unseen)
+
+        codes = key_index.get_indexer(values.astype(np.int64) if values.dtype.kind == "b" else values)
+        unseen_positions = np.flatnonzero(codes == -1)
+        codes[unseen_positions] = unseen_code
+
+        # nulls are never in the index, so they are only looked for among the unseen values
+        column_candidates = candidates  # type: np.ndarray
+        null_positions = unseen_positions[pd.isnull(values[unseen_positions])]
+        if values.dtype.kind == "f":
+            codes[null_positions] = nan_code
+        elif len(null_positions) > 0:
+            # nulls other than float NaNs (e.g. None) are looked up like any other value
+            null_replacements = []  # type: List[Any]
+            for position, value in zip(null_positions, values[null_positions]):
+                if _is_float_nan(value):
+                    codes[position] = nan_code
+                else:
+                    codes[position] = len(candidates) + len(null_replacements)
+                    null_replacements.append(mapping.get(value, replace_unseen))
+            column_candidates = np.concatenate([candidates, _object_array(null_replacements)])
+
+        # infers the output dtype from the replacements used, the same way the element-wise path does
+        used = np.flatnonzero(np.bincount(codes, minlength=len(column_candidates)))
+        used_codes = np.zeros(len(column_candidates), dtype=np.intp)
+        used_codes[used] = np.arange(len(used))
+        typed_candidates = pd.Series(column_candidates[used], dtype=object).apply(lambda x: x).to_numpy()
+
+        return pd.Series(typed_candidates[used_codes[codes]], index=series.index, name=series.name)
+
+    return replace
+
+
+def _replacements_fn(columns: List[str],
+                     vec: Dict[str, Dict],
+                     replace_unseen: Any) -> Callable[[pd.DataFrame], pd.DataFrame]:
+    """
+    Builds, once, the replacers of the `columns` from the "vec" vectors, and returns a function
+    that applies them to a DataFrame, like `apply_replacements`.
+    """
+    replacers = {col: _column_replacer(vec[col], replace_unseen) for col in columns}
+
+    def replace(df: pd.DataFrame) -> pd.DataFrame:
+        return df.assign(**{col: replacer(df[col]) for col, replacer in replacers.items()})
+
+    return replace
+
+
 def apply_replacements(df: pd.DataFrame,
                        columns: List[str],
                        vec: Dict[str, Dict],
@@ -354,11 +449,7 @@ def apply_replacements(df: pd.DataFrame,
         Default value to replace when original value is not present in the `vec` dict for the feature
 
     """
-    column_categorizer = lambda col: df[col].apply(lambda x: (np.nan
-                                                              if isinstance(x, float) and np.isnan(x)
-                                                              else vec[col].get(x, replace_unseen)))
-    categ_columns = {col: column_categorizer(col) for col in columns}
-    return df.assign(**categ_columns)
+    return _replacements_fn(columns, vec, replace_unseen)(df)
 
 
 @column_duplicatable('value_maps')
@@ -399,9 +490,12 @@ def value_mapper(df: pd.DataFrame,
     if ignore_unseen:
         value_maps = {col: new_col_value_map(value_maps[col], list(df[col].unique())) for col in columns}
 
+    replace = _replacements_fn(columns, value_maps, replace_unseen=replace_unseen_to)
+
     def p(df: pd.DataFrame) -> pd.DataFrame:
-        return apply_replacements(df, columns, value_maps, replace_unseen=replace_unseen_to)
+        return replace(df)
 
+    declare_columns(p, reads=columns, writes=columns)
     return p, p(df), {"value_maps": value_maps}
 
 
@@ -451,8 +545,10 @@ def truncate_categorical(df: pd.DataFrame,
 
     vec = {column: compose(categs_to_dict, update, get_categs)(column) for column in columns_to_truncate}
 
+    replace = _replacements_fn(columns_to_truncate, vec, replace_unseen)
+
     def p(new_df: pd.DataFrame) -> pd.DataFrame:
-        return apply_replacements(new_df, columns_to_truncate, vec, replace_unseen)
+        return replace(new_df)
 
     p.__doc__ = learner_pred_fn_docstring("truncate_categorical")
 
@@ -464,6 +560,7 @@ def truncate_categorical(df: pd.DataFrame,
     if store_mapping:
         log["truncate_categorical"]["mapping"] = vec
 
+    declare_columns(p, reads=columns_to_truncate, writes=columns_to_truncate)
     return p, p(df), log
 
 
@@ -509,8 +606,10 @@ def rank_categorical(df: pd.DataFrame,
 
     vec = {column: col_categ_getter(column) for column in columns_to_rank}
 
+    replace = _replacements_fn(columns_to_rank, vec, replace_unseen)
+
     def p(new_df: pd.DataFrame) -> pd.DataFrame:
-        return apply_replacements(new_df, columns_to_rank, vec, replace_unseen)
+        return replace(new_df)
 
     p.__doc__ = learner_pred_fn_docstring("rank_categorical")
 
@@ -522,6 +621,7 @@ def rank_categorical(df: pd.DataFrame,
     if store_mapping:
         log['rank_categorical']['mapping'] = vec
 
+    declare_columns(p, reads=columns_to_rank, writes=columns_to_rank)
     return p, p(df), log
 
 
@@ -562,8 +662,10 @@ def count_categorizer(df: pd.DataFrame,
     categ_getter = lambda col: df[col].value_counts().to_dict()
     vec = {column: categ_getter(column) for column in columns_to_categorize}
 
+    replace = _replacements_fn(columns_to_categorize, vec, replace_unseen)
+
     def p(new_df: pd.DataFrame) -> pd.DataFrame:
-        return apply_replacements(new_df, columns_to_categorize, vec, replace_unseen)
+        return replace(new_df)
 
     p.__doc__ = learner_pred_fn_docstring("count_categorizer")
 
@@ -575,6 +677,7 @@ def count_categorizer(df: pd.DataFrame,
     if store_mapping:
         log['count_categorizer']['mapping'] = vec
 
+    declare_columns(p, reads=columns_to_categorize, writes=columns_to_categorize)
     return p, p(df), log
 
 
@@ -618,8 +721,10 @@ def label_categorizer(df: pd.DataFrame,
 
     vec = {column: categ_dict(df[column]) for column in columns_to_categorize}
 
+    replace = _replacements_fn(columns_to_categorize, vec, replace_unseen)
+
     def p(new_df: pd.DataFrame) -> pd.DataFrame:
-        return apply_replacements(new_df, columns_to_categorize, vec, replace_unseen)
+        return replace(new_df)
 
     p.__doc__ = learner_pred_fn_docstring("label_categorizer")
 
@@ -631,6 +736,7 @@ def label_categorizer(df: pd.DataFrame,
     if store_mapping:
         log['label_categorizer']['mapping'] = vec
 
+    declare_columns(p, reads=columns_to_categorize, writes=columns_to_categorize)
     return p, p(df), log
 
 
@@ -688,6 +794,7 @@ def quantile_biner(df: pd.DataFrame,
         'transformed_column': columns_to_bin,
         'q': q}}
 
+    declare_columns(p, reads=columns_to_bin, writes=columns_to_bin)
     return p, p(df), log
 
 
@@ -758,6 +865,7 @@ def onehot_categorizer(df: pd.DataFrame,
     if store_mapping:
         log['onehot_categorizer']['mapping'] = vec
 
+    declare_columns(p, reads=columns_to_categorize, writes=[])
     return p, p(df), log
 
 
@@ -820,8 +928,10 @@ def target_categorizer(df: pd.DataFrame,
 
     vec = {column: categ_target_dict(column) for column in columns_to_categorize}
 
+    replace = _replacements_fn(columns_to_categorize, vec, replace_unseen)
+
     def p(new_df: pd.DataFrame) -> pd.DataFrame:
-        return apply_replacements(new_df, columns_to_categorize, vec, replace_unseen)
+        return replace(new_df)
 
     p.__doc__ = learner_pred_fn_docstring("target_categorizer")
 
@@ -835,6 +945,7 @@ def target_categorizer(df: pd.DataFrame,
     if store_mapping:
         log['target_categorizer']['mapping'] = vec
 
+    declare_columns(p, reads=columns_to_categorize, writes=columns_to_categorize)
     return p, p(df), log
 
 
@@ -880,6 +991,7 @@ def standard_scaler(df: pd.DataFrame,
         'standard_scaler': scaler.get_params(),
         'transformed_column': columns_to_scale}}
 
+    declare_columns(p, reads=columns_to_scale, writes=columns_to_scale)
     return p, p(df), log
 
 
@@ -929,6 +1041,7 @@ def custom_transformer(df: pd.DataFrame,
         'transformation_function': transformation_function.__name__}
     }
 
+    declare_columns(p, reads=columns_to_transform, writes=columns_to_transform)
     return p, p(df), log
 
 
@@ -990,6 +1103,7 @@ def null_injector(df: pd.DataFrame,
         "groups": groups
     }}
 
+    declare_columns(p, reads=[], writes=[])
     return p, null_data, log
 
 
@@ -1049,6 +1163,9 @@ def missing_warner(df: pd.DataFrame, cols_list: List[str],
         "cols_without_missing": cols_without_missing}
     }
 
+    warning_columns = [new_column_name] + ([detailed_column_name] if detailed_column_name else [])
+
+    declare_columns(p, reads=cols_without_missing, writes=warning_columns)
     return p, df, log
 
 
@@ -7,7 +7,7 @@ from toolz import curry, merge
 
 from fklearn.common_docstrings import learner_pred_fn_docstring, learner_return_docstring
 from fklearn.types import LearnerReturnType
-from fklearn.training.utils import log_learner_time, expand_features_encoded
+from fklearn.training.utils import log_learner_time, expand_features_encoded, declare_columns, score_train_set
 
 
 @curry
@@ -67,7 +67,8 @@ def isolation_forest_learner(df: pd.DataFrame,
         'package_version': sklearn.__version__,
         'training_samples': len(df)}}
 
-    return p, p(df), log
+    declare_columns(p, reads=features, writes=[prediction_column])
+    return p, score_train_set(p, df), log
 
 
 isolation_forest_learner.__doc__ += learner_return_docstring("Isolation Forest")
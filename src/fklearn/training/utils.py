@@ -1,13 +1,18 @@
+from contextlib import contextmanager
 from functools import reduce, wraps
+from inspect import Parameter, Signature, signature
 from time import time
 import re
-from typing import Any, List
+import threading
+from typing import Any, Dict, Iterable, Iterator, List, Optional
 
 import pandas as pd
 from toolz import curry
 import toolz as fp
 
-from fklearn.types import LearnerReturnType, UncurriedLearnerFnType
+from fklearn.types import LearnerReturnType, PredictFnType, UncurriedLearnerFnType
+
+_train_predictions_state = threading.local()
 
 
 @curry
@@ -31,6 +36,134 @@ def print_learner_run(learner: UncurriedLearnerFnType, learner_name: str) -> Unc
     return printed_learner
 
 
+@contextmanager
+def skip_train_predictions(skip: bool = True) -> Iterator[None]:
+    """
+    Context where learners that support it skip applying their predict function to
+    the training set, returning it unchanged instead. Used by `build_pipeline` to avoid
+    scoring the training set in the final step of fit-only pipelines.
+
+    Parameters
+    ----------
+    skip : bool
+        Whether learners should skip scoring the training set inside the context.
+    """
+    previous = train_predictions_skipped()
+    _train_predictions_state.skip = skip
+    try:
+        yield
+    finally:
+        _train_predictions_state.skip = previous
+
+
+def score_train_set(p: PredictFnType, df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Applies a learner predict function to its training set, unless inside a
+    `skip_train_predictions` context, where the training set is returned unchanged.
+
+    Parameters
+    ----------
+    p : function pandas.DataFrame -> pandas.DataFrame
+        The predict function of the learner.
+
+    df : pandas.DataFrame
+        The training set of the learner.
+
+    Returns
+    ----------
+    new_df : pandas.DataFrame
+        The scored training set, or the training set itself when skipping.
+    """
+    return df if train_predictions_skipped() else p(df)
+
+
+def train_predictions_skipped() -> bool:
+    """
+    Whether learners should skip scoring their training set. See `skip_train_predictions`.
+    """
+    return getattr(_train_predictions_state, "skip", False)
+
+
+def declare_columns(p: PredictFnType, reads: Iterable[str], writes: Iterable[str]) -> PredictFnType:
+    """
+    Declares the columns a learner predict function reads and writes, as its `declared_columns`
+    attribute, so they are kept out of the learner log. `build_pipeline` uses them to record the
+    column lineage of the pipeline and to find which input columns are needed for prediction.
+
+    Parameters
+    ----------
+    p : function pandas.DataFrame -> pandas.DataFrame
+        The predict function of the learner.
+
+    reads : iterable of str
+        The columns the predict function needs from its input DataFrame.
+
+    writes : iterable of str
+        The columns the predict function creates or overwrites.
+
+    Returns
+    ----------
+    p : function pandas.DataFrame -> pandas.DataFrame
+        The same predict function.
+    """
+    p.declared_columns = {"reads": list(fp.unique(reads)), "writes": list(fp.unique(writes))}  # type: ignore
+    return p
+
+
+def declared_columns(p: PredictFnType) -> Optional[Dict[str, List[str]]]:
+    """
+    The columns declared on a predict function with `declare_columns`, or None if it declares none.
+    """
+    return getattr(p, "declared_columns", None)
+
+
+def compose_declared_columns(*predict_fns: PredictFnType) -> PredictFnType:
+    """
+    Composes predict functions, applied from right to left like `toolz.compose`, and declares
+    on the composition the columns declared by each of them. The columns are only declared if
+    all of them declare them. Keyword arguments of the composition, like `apply_shap`, are passed
+    to the predict functions that accept them, and appear in its signature so pipelines route them.
+
+    Parameters
+    ----------
+    predict_fns : functions pandas.DataFrame -> pandas.DataFrame
+        The predict functions to compose.
+
+    Returns
+    ----------
+    p : function pandas.DataFrame, **kwargs -> pandas.DataFrame
+        The composed predict function.
+    """
+    fns = list(reversed(predict_fns))
+
+    # the keyword arguments each predict function accepts, or None if it accepts any
+    fns_parameters = [list(signature(fn).parameters.values())[1:] for fn in fns]
+    fns_kwargs = [None if any(parameter.kind == Parameter.VAR_KEYWORD for parameter in parameters)
+                  else {parameter.name for parameter in parameters}
+                  for parameters in fns_parameters]
+
+    def p(new_df: pd.DataFrame, **kwargs: Any) -> pd.DataFrame:
+        for fn, fn_kwargs in zip(fns, fns_kwargs):
+            new_df = fn(new_df, **{key: value for key, value in kwargs.items()
+                                   if fn_kwargs is None or key in fn_kwargs})
+        return new_df
+
+    keyword_parameters = fp.unique((parameter.replace(kind=Parameter.KEYWORD_ONLY)
+                                    for parameter in fp.concat(fns_parameters)
+                                    if parameter.kind not in (Parameter.VAR_POSITIONAL, Parameter.VAR_KEYWORD)),
+                                   key=lambda parameter: parameter.name)
+    new_df_parameter = Parameter("new_df", Parameter.POSITIONAL_OR_KEYWORD, annotation=pd.DataFrame)
+    p.__signature__ = Signature([new_df_parameter, *keyword_parameters],  # type: ignore
+                                return_annotation=pd.DataFrame)
+
+    declarations = [declared_columns(fn) for fn in reversed(predict_fns)]
+    if all(declaration is not None for declaration in declarations):
+        declare_columns(p,
+                        reads=fp.concat(declaration["reads"] for declaration in declarations),  # type: ignore
+                        writes=fp.concat(declaration["writes"] for declaration in declarations))  # type: ignore
+    return p
+
+
 def expand_features_encoded(df: pd.DataFrame,
                             features: List[str]) -> List[str]:
 
@@ -0,0 +1,267 @@
+import hashlib
+import os
+import pickle
+import re
+from datetime import date, datetime, timedelta
+from fnmatch import fnmatchcase
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from fklearn.types import LogType, ValidatorReturnType
+
+# suffix of the columns holding references to the values stored as separate objects
+REF_SUFFIX = "@ref"
+KEY_COLUMNS = ["log_id", "fold_num", "eval_num"]
+
+_SCALAR_TYPES = (type(None), bool, int, float, str, np.bool_, np.integer, np.floating,
+                 datetime, date, timedelta, pd.Timestamp, pd.Timedelta)
+_PART_NAME = re.compile(r"^part-(\d+)-(\d+)\.parquet$")
+
+
+def _is_scalar(value: Any) -> bool:
+    return isinstance(value, _SCALAR_TYPES)
+
+
+def _flatten_log(log: LogType, prefix: str, row: Dict[str, Any], store_object: Callable[[Any], str]) -> None:
+    for key, value in log.items():
+        name = prefix + str(key)
+        if isinstance(value, dict):
+            _flatten_log(value, name + ".", row, store_object)
+        elif _is_scalar(value):
+            row[name] = value
+        elif isinstance(value, (list, tuple)) and all(_is_scalar(v) for v in value):
+            row[name] = list(value)
+        elif isinstance(value, (list, tuple)):
+            # lists of logs, like the train logs of every fold, are flattened by position
+            _flatten_log({str(position): v for position, v in enumerate(value)}, name + ".", row, store_object)
+        else:
+            row[name + REF_SUFFIX] = store_object(value)
+
+
+def flatten_validator_log(log: LogType, log_id: int,
+                          store_object: Callable[[Any], str]) -> List[Dict[str, Any]]:
+    """
+    Flattens a validator log into one row per evaluation of each fold, the layout `LogStore` writes.
+
+    Nested dicts, like the logs of split evaluators or the `train_log`, become columns named
+    after their keys joined by dots, like `train_log.lgbm_classification_learner.learning_rate`.
+    The `split_log` values that are lists with one item per evaluation of the fold are split
+    among the rows, like `extract` does. Other lists, like the `train_log` of every fold kept with
+    `return_all_train_logs`, are flattened by position, into columns like `train_log.0.learning_rate`.
+    Scalars and lists of scalars are kept as they are, while any other value, like the fitted model
+    in the `train_log`, is handed to `store_object` and its reference is kept in a column with the `@ref` suffix.
+
+    Parameters
+    ----------
+    log : dict
+        A validator log, with a `validator_log` and usually a `train_log`.
+
+    log_id : int
+        The id of the log, kept in the `log_id` column.
+
+    store_object : function(value) -> str
+        Stores a value that can't be kept in a column and returns its reference.
+
+    Returns
+    ----------
+    rows : list of dict
+        The flattened rows of the log.
+    """
+    log_row = {"log_id": log_id}  # type: Dict[str, Any]
+    _flatten_log({k: v for k, v in log.items() if k != "validator_log"}, "", log_row, store_object)
+
+    rows = []
+    for fold in log.get("validator_log", []):
+        eval_results = fold.get("eval_results", [])
+        split_log = fold.get("split_log", {})
+        for eval_num, eval_result in enumerate(eval_results):
+            row = dict(log_row, fold_num=fold.get("fold_num"), eval_num=eval_num)
+            fold_split_log = {k: v[eval_num] if isinstance(v, list) and len(v) == len(eval_results) else v
+                              for k, v in split_log.items()}
+            _flatten_log(fold_split_log, "split_log.", row, store_object)
+            _flatten_log(eval_result, "", row, store_object)
+            rows.append(row)
+    return rows
+
+
+def _arrow_kind(value: Any) -> str:
+    if isinstance(value, (bool, np.bool_)):
+        return "bool"
+    if isinstance(value, (int, float, np.integer, np.floating)):
+        return "number"
+    if isinstance(value, (datetime, date)):
+        return "datetime"
+    if isinstance(value, (timedelta, pd.Timedelta)):
+        return "timedelta"
+    return type(value).__name__
+
+
+def _arrow_safe(df: pd.DataFrame) -> pd.DataFrame:
+    # Parquet columns and lists have a single type, so the ones mixing, say, strings and numbers are kept as strings
+    is_null = lambda v: _is_scalar(v) and pd.isnull(v)
+    as_str = lambda v: v if is_null(v) else [str(x) for x in v] if isinstance(v, list) else str(v)
+
+    mixed = []
+    for col in df.columns[df.dtypes == object]:
+        values = [v for v in df[col] if not is_null(v)]
+        items = [x for v in values if isinstance(v, list) for x in v if not is_null(x)]
+        if len({_arrow_kind(v) for v in values}) > 1 or len({_arrow_kind(x) for x in items}) > 1:
+            mixed.append(col)
+    return df.assign(**{col: df[col].map(as_str) for col in mixed})
+
+
+class LogStore:
+    """
+    Append-only columnar store of validator and tuning logs, kept as a folder of Parquet files.
+
+    Each call to `append` flattens the logs with `flatten_validator_log` and writes them as a new
+    Parquet file, so the store grows without rewriting what was already saved. Values that don't
+    fit in a column, like fitted models, are pickled once into the `objects` subfolder and referenced
+    by the hash of their contents. `read` only loads the requested columns of each file, so a few
+    metrics can be queried without deserializing whole logs. Requires pyarrow, installed with
+    `pip install fklearn[parquet]`, and a single process appending to the store at a time.
+
+    `append` can be passed as the `save_intermediary_fn` of the tuning functions, like
+    `random_search_tuner(..., save_intermediary_fn=LogStore("tuning_logs").append)`.
+
+    Parameters
+    ----------
+    path : str
+        The folder to keep the logs in. It is created if it does not exist.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.objects_path = os.path.join(path, "objects")
+        os.makedirs(self.objects_path, exist_ok=True)
+
+    def _parts(self) -> List[Tuple[str, int, int]]:
+        parts = []
+        for name in os.listdir(self.path):
+            match = _PART_NAME.match(name)
+            if match:
+                parts.append((os.path.join(self.path, name), int(match.group(1)), int(match.group(2))))
+        return sorted(parts, key=lambda part: part[1])
+
+    def __len__(self) -> int:
+        """
+        The number of logs in the store.
+        """
+        return sum(n_logs for _, _, n_logs in self._parts())
+
+    def store_object(self, value: Any) -> str:
+        """
+        Pickles a value into the `objects` subfolder, unless an identical one is there already,
+        and returns its reference.
+        """
+        payload = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        ref = hashlib.sha1(payload).hexdigest()
+        object_path = os.path.join(self.objects_path, ref + ".pkl")
+        if not os.path.exists(object_path):
+            temp_path = object_path + ".tmp"
+            with open(temp_path, "wb") as obj:
+                obj.write(payload)
+            os.replace(temp_path, object_path)
+        return ref
+
+    def load_object(self, ref: str) -> Any:
+        """
+        Loads a value stored by reference, from the value of an `@ref` column.
+        """
+        with open(os.path.join(self.objects_path, ref + ".pkl"), "rb") as obj:
+            return pickle.load(obj)
+
+    def append(self, logs: Union[ValidatorReturnType, List[ValidatorReturnType]]) -> List[int]:
+        """
+        Appends one validator log, or a list of them, to the store.
+
+        Parameters
+        ----------
+        logs : dict or list of dict
+            The validator logs to append, like the ones given to `save_intermediary_fn`.
+
+        Returns
+        ----------
+        log_ids : list of int
+            The ids the logs are stored under.
+        """
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        logs = [logs] if isinstance(logs, dict) else logs
+        first_id = len(self)
+        log_ids = list(range(first_id, first_id + len(logs)))
+
+        rows = [row for log_id, log in zip(log_ids, logs)
+                for row in flatten_validator_log(log, log_id, self.store_object)]
+        df = _arrow_safe(pd.DataFrame(rows, columns=list(dict.fromkeys(KEY_COLUMNS + [k for r in rows for k in r]))))
+
+        part_path = os.path.join(self.path, "part-{0:09d}-{1:06d}.parquet".format(first_id, len(logs)))
+        temp_path = part_path + ".tmp"
+        pq.write_table(pa.Table.from_pandas(df, preserve_index=False), temp_path)
+        os.replace(temp_path, part_path)
+        return log_ids
+
+    def columns(self) -> List[str]:
+        """
+        The columns of all the logs in the store, read from the schema of each file.
+        """
+        import pyarrow.parquet as pq
+
+        names = [name for part_path, _, _ in self._parts() for name in pq.read_schema(part_path).names]
+        return list(dict.fromkeys(KEY_COLUMNS + names))
+
+    def read(self,
+             columns: Optional[List[str]] = None,
+             log_ids: Optional[List[int]] = None,
+             load_objects: bool = False) -> pd.DataFrame:
+        """
+        Reads the logs in the store into a DataFrame with one row per evaluation of each fold,
+        loading only the requested columns.
+
+        Parameters
+        ----------
+        columns : list of str, optional
+            The columns to load, besides the `log_id`, `fold_num` and `eval_num` keys. They can be
+            shell-style patterns, like `"roc_auc_evaluator__*"` or `"train_log.*.learning_rate"`.
+            All columns are loaded if None.
+
+        log_ids : list of int, optional
+            The ids of the logs to load. Files without any of them are not read.
+            All logs are loaded if None.
+
+        load_objects : bool
+            If True, the values stored by reference are loaded into columns named without the
+            `@ref` suffix. Otherwise, the `@ref` columns hold their references.
+
+        Returns
+        ----------
+        logs : pandas.DataFrame
+            The requested columns of the logs, in the order they were appended.
+        """
+        import pyarrow.parquet as pq
+
+        wanted_ids = None if log_ids is None else set(log_ids)
+        frames = []
+        for part_path, first_id, n_logs in self._parts():
+            if wanted_ids is not None and not wanted_ids.intersection(range(first_id, first_id + n_logs)):
+                continue
+
+            names = pq.read_schema(part_path).names
+            part_columns = names if columns is None else \
+                [name for name in names if name in KEY_COLUMNS or any(fnmatchcase(name, c) for c in columns)]
+            part = pq.read_table(part_path, columns=part_columns).to_pandas()
+            frames.append(part if wanted_ids is None else part[part["log_id"].isin(wanted_ids)])
+
+        if not frames:
+            return pd.DataFrame(columns=KEY_COLUMNS)
+
+        df = pd.concat(frames, ignore_index=True, sort=False)
+        if load_objects:
+            refs = [col for col in df.columns if col.endswith(REF_SUFFIX)]
+            load = lambda ref: ref if pd.isnull(ref) else self.load_object(ref)
+            df = (df.assign(**{col[:-len(REF_SUFFIX)]: df[col].map(load) for col in refs})
+                  .drop(columns=refs))
+        return df
@@ -77,6 +77,7 @@ def random_search_tuner(space: LogType,
         Partially defined saver function that receives a log result from a
         tuning step and appends it into a file
         Example: save_intermediary_result(save_path='tuning.pkl')
+        or the `append` of a columnar log store: LogStore(path='tuning_logs').append
 
     n_jobs : int
         Number of parallel processes to spawn when evaluating a training function
@@ -162,6 +163,7 @@ def grid_search_cv(space: LogType,
         Partially defined saver function that receives a log result from a
         tuning step and saves it into a file
         Example: save_intermediary_result(save_path='tuning.pkl')
+        or the `append` of a columnar log store: LogStore(path='tuning_logs').append
 
     load_intermediary_fn : function(path) -> save to file
         Partially defined load function that receives a path and loads previous logs
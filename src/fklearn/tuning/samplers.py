@@ -7,6 +7,7 @@ from joblib import Parallel, delayed
 from numpy import random
 from toolz.curried import curry, first, compose, valfilter, sorted, pipe, take
 
+from fklearn.training.pipeline import resumable_predict_fn
 from fklearn.tuning.utils import order_feature_importance_avg_from_logs, get_best_performing_log, gen_dict_extract, \
     get_avg_metric_from_extractor, get_used_features, gen_validator_log
 from fklearn.types import EvalFnType, ExtractorFnType, LogListType, LogType, PredictFnType
@@ -146,12 +147,15 @@ def remove_by_feature_shuffling(log: LogType,
     features_to_shuffle = order_feature_importance_avg_from_logs(log)[-max_removed_by_step:] \
         if speed_up_by_importance else get_used_features(log)
 
-    def shuffle(feature: str) -> pd.DataFrame:
-        return eval_data.assign(**{feature: eval_data[feature].sample(frac=1.0)})
+    # pipelines are resumed from the first step that reads the shuffled feature
+    predict_with = resumable_predict_fn(predict_fn, eval_data, features_to_shuffle)
+
+    def shuffled_predict(feature: str) -> pd.DataFrame:
+        return predict_with({feature: eval_data[feature].sample(frac=1.0)})
 
     feature_to_delta_metric = compose(lambda m: curr_metric - m,
                                       get_avg_metric_from_extractor(extractor=extractor, metric_name=metric_name),
-                                      gen_validator_log(fold_num=0, test_size=eval_size), eval_fn, predict_fn, shuffle)
+                                      gen_validator_log(fold_num=0, test_size=eval_size), eval_fn, shuffled_predict)
 
     if parallel:
         metrics = Parallel(n_jobs=nthread, backend="threading")(
@@ -82,6 +82,7 @@ def feature_importance_backward_selection(train_data: pd.DataFrame,
             Partially defined saver function that receives a log result from a
             tuning step and appends it into a file
             Example: save_intermediary_result(save_path='tuning.pkl')
+            or the `append` of a columnar log store: LogStore(path='tuning_logs').append
 
         n_jobs : int (default 1)
             Number of parallel processes to spawn.
@@ -193,6 +194,7 @@ def poor_man_boruta_selection(train_data: pd.DataFrame,
             Partially defined saver function that receives a log result from a
             tuning step and appends it into a file
             Example: save_intermediary_result(save_path='tuning.pkl')
+            or the `append` of a columnar log store: LogStore(path='tuning_logs').append
 
         speed_up_by_importance: bool (default True)
             If it should narrow search looking at feature importance first before getting PIMP importance. If True,
@@ -350,6 +352,7 @@ def backward_subset_feature_selection(train_data: pd.DataFrame,
             Partially defined saver function that receives a log result from a
             tuning step and appends it into a file
             Example: save_intermediary_result(save_path='tuning.pkl')
+            or the `append` of a columnar log store: LogStore(path='tuning_logs').append
 
         n_jobs : int
             Number of parallel processes to spawn.
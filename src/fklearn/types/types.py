@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import Any, Callable, Dict, List, Tuple, Union
+from typing import Any, Callable, Dict, List, Sequence, Tuple, Union
 
 import pandas as pd
 
@@ -25,7 +25,7 @@ UncurriedEvalFnType = Callable[..., EvalReturnType]
 EvalFnType = Callable[[pd.DataFrame], EvalReturnType]
 
 # Splitter types
-FoldType = List[Tuple[pd.Index, List[pd.Index]]]
+FoldType = Sequence[Tuple[pd.Index, List[pd.Index]]]
 SplitterReturnType = Tuple[FoldType, LogListType]
 SplitterFnType = Callable[[pd.DataFrame], SplitterReturnType]
 
@@ -1,6 +1,9 @@
+import inspect
+import numbers
 import warnings
-from typing import Any, Callable, Iterable, List
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
 
+import joblib
 import numpy as np
 import pandas as pd
 import toolz as fp
@@ -12,6 +15,7 @@ from sklearn.metrics import (average_precision_score, brier_score_loss,
 from toolz import curry, last, first
 from scipy import optimize
 from sklearn.linear_model import LogisticRegression
+from sklearn.utils import check_random_state
 
 from fklearn.types import (EvalFnType, EvalReturnType, PredictFnType,
                            UncurriedEvalFnType)
@@ -752,12 +756,158 @@ def ndcg_evaluator(test_data: pd.DataFrame,
     return {eval_name: ndcg_score}
 
 
+def _cached(cache: Dict[Tuple, Any], key: Tuple, compute: Callable[[], Any]) -> Any:
+    if key not in cache:
+        cache[key] = compute()
+    return cache[key]
+
+
+def _descending_order(test_data: pd.DataFrame, prediction_column: str, cache: Dict[Tuple, Any]) -> np.ndarray:
+    # the same order ndcg_evaluator uses, so ties are broken in the same way
+    return _cached(cache, ("order", prediction_column),
+                   lambda: np.argsort(test_data[prediction_column].values)[::-1])
+
+
+def _binary_curve(test_data: pd.DataFrame,
+                  prediction_column: str,
+                  target_column: str,
+                  weight_column: Optional[str],
+                  cache: Dict[Tuple, Any]) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+    """
+    Cumulative weights of positives and negatives above each distinct prediction, from the
+    highest prediction to the lowest, or None when the ROC and PR AUCs can't be derived from them
+    and the evaluators must run on their own.
+    """
+    def compute() -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        scores = test_data[prediction_column].values
+        # the raw target values, as the evaluators raise on targets like 0.5 that would be cast to 0
+        raw_target = test_data[target_column].values
+        weights = np.ones(len(scores)) if weight_column is None else test_data[weight_column].values.astype(float)
+
+        if (scores.dtype.kind not in "iuf" or not np.isfinite(scores).all() or raw_target.dtype.kind not in "biuf"
+                or set(np.unique(raw_target)) != {0, 1} or not (weights > 0).all()):
+            return None
+
+        target = raw_target.astype(int)
+
+        order = _descending_order(test_data, prediction_column, cache)
+        sorted_scores = scores[order]
+        threshold_idxs = np.r_[np.flatnonzero(np.diff(sorted_scores)), len(sorted_scores) - 1]
+        tps = np.cumsum((target * weights)[order])[threshold_idxs]
+        fps = np.cumsum(((1 - target) * weights)[order])[threshold_idxs]
+        return tps, fps
+
+    return _cached(cache, ("curve", prediction_column, target_column, weight_column), compute)
+
+
+def _fused_roc_auc(test_data: pd.DataFrame, cache: Dict[Tuple, Any], prediction_column: str,
+                   target_column: str, weight_column: str, eval_name: str) -> Optional[EvalReturnType]:
+    curve = _binary_curve(test_data, prediction_column, target_column, weight_column, cache)
+    if curve is None:
+        return None
+
+    tps, fps = curve
+    score = np.trapz(np.r_[0, tps / tps[-1]], np.r_[0, fps / fps[-1]])
+    return {"roc_auc_evaluator__" + target_column if eval_name is None else eval_name: score}
+
+
+def _fused_pr_auc(test_data: pd.DataFrame, cache: Dict[Tuple, Any], prediction_column: str,
+                  target_column: str, weight_column: str, eval_name: str) -> Optional[EvalReturnType]:
+    curve = _binary_curve(test_data, prediction_column, target_column, weight_column, cache)
+    if curve is None:
+        return None
+
+    tps, fps = curve
+    score = np.sum(np.diff(np.r_[0, tps / tps[-1]]) * tps / (tps + fps))
+    return {"pr_auc_evaluator__" + target_column if eval_name is None else eval_name: score}
+
+
+def _fused_expected_calibration_error(test_data: pd.DataFrame, cache: Dict[Tuple, Any], prediction_column: str,
+                                      target_column: str, eval_name: str, n_bins: int,
+                                      bin_choice: str) -> Optional[EvalReturnType]:
+    if bin_choice not in ("count", "prob"):
+        return None
+
+    predictions = test_data[prediction_column].values.astype(float)
+    actuals = test_data[target_column].values.astype(float)
+    if np.isnan(predictions).any() or np.isnan(actuals).any():
+        return None
+
+    def compute_bins() -> np.ndarray:
+        if bin_choice == "count":
+            return pd.qcut(test_data[prediction_column], q=n_bins, labels=False).values.astype(int)
+        return pd.cut(test_data[prediction_column], bins=n_bins, labels=False).values.astype(int)
+
+    bins = _cached(cache, ("bins", prediction_column, n_bins, bin_choice), compute_bins)
+    counts = np.bincount(bins, minlength=n_bins)
+    if (counts == 0).any():
+        return None
+
+    sample_weight = counts if bin_choice == "prob" else None
+    distance = mean_absolute_error(np.bincount(bins, actuals, minlength=n_bins) / counts,
+                                   np.bincount(bins, predictions, minlength=n_bins) / counts,
+                                   sample_weight=sample_weight)
+
+    if eval_name is None:
+        eval_name = "expected_calibration_error_evaluator__" + target_column
+
+    return {eval_name: distance}
+
+
+def _fused_ndcg(test_data: pd.DataFrame, cache: Dict[Tuple, Any], prediction_column: str, target_column: str,
+                k: int, exponential_gain: bool, eval_name: str) -> Optional[EvalReturnType]:
+    # ndcg_evaluator selects the target by label, which matches the positions only with the default index
+    if (isinstance(k, (int, float)) and not 0 < k <= len(test_data)) \
+            or not test_data.index.equals(pd.RangeIndex(len(test_data))) \
+            or test_data[prediction_column].isna().any():
+        return None
+
+    target = test_data[target_column].values
+    cum_gain = target[_descending_order(test_data, prediction_column, cache)[:k]]
+    ideal_cum_gain = _cached(cache, ("sorted_target", target_column), lambda: np.sort(target)[::-1])[:k]
+
+    if exponential_gain:
+        cum_gain = (2 ** cum_gain) - 1
+        ideal_cum_gain = (2 ** ideal_cum_gain) - 1
+
+    discount = np.log2(np.arange(len(cum_gain)) + 2.0)
+
+    if eval_name is None:
+        eval_name = f"ndcg_evaluator__{target_column}"
+
+    return {eval_name: np.sum(cum_gain / discount) / np.sum(ideal_cum_gain / discount)}
+
+
+def _fused_evaluator(evaluator: EvalFnType) -> Optional[Tuple[Callable[..., Optional[EvalReturnType]], Dict]]:
+    """
+    The fused version of a partially applied evaluator and its arguments, or None if it has no fused version.
+    """
+    fused_fn = _FUSED_EVALUATORS.get(getattr(evaluator, "func", None))
+    if fused_fn is None or evaluator.args:  # type: ignore
+        return None
+
+    try:
+        arguments = inspect.signature(evaluator.func).bind_partial(**evaluator.keywords)  # type: ignore
+    except TypeError:
+        return None
+    arguments.apply_defaults()
+    return fused_fn, fp.dissoc(arguments.arguments, "test_data")
+
+
 @curry
 def combined_evaluators(test_data: pd.DataFrame,
-                        evaluators: List[EvalFnType]) -> EvalReturnType:
+                        evaluators: List[EvalFnType],
+                        fused: bool = False) -> EvalReturnType:
     """
     Combine partially applies evaluation functions.
 
+    When `fused` is True, the ROC AUC, PR AUC, expected calibration error and NDCG
+    evaluators share the sort of the predictions, the cumulative positive and negative
+    counts and the calibration bins computed for each set of prediction, target and weight
+    columns, instead of each computing them again. Their results match the separate
+    evaluators up to floating point rounding. Other evaluators, and the cases the
+    shared computation doesn't cover, like null predictions or a single class, run as usual.
+
     Parameters
     ----------
     test_data : Pandas' DataFrame
@@ -766,12 +916,91 @@ def combined_evaluators(test_data: pd.DataFrame,
     evaluators: List
         List of evaluator functions
 
+    fused: bool (default=False)
+        Whether to share the sorts and bins among the supported evaluators.
+
     Returns
     ----------
     log: dict
         A log-like dictionary with the column mean
     """
-    return fp.merge(e(test_data) for e in evaluators)
+    if not fused:
+        return fp.merge(e(test_data) for e in evaluators)
+
+    cache = {}  # type: Dict[Tuple, Any]
+
+    def evaluate(evaluator: EvalFnType) -> EvalReturnType:
+        fused_evaluator = _fused_evaluator(evaluator)
+        result = None if fused_evaluator is None else fused_evaluator[0](test_data, cache, **fused_evaluator[1])
+        return evaluator(test_data) if result is None else result
+
+    return fp.merge(evaluate(e) for e in evaluators)
+
+
+_FUSED_EVALUATORS = {
+    roc_auc_evaluator.func: _fused_roc_auc,
+    pr_auc_evaluator.func: _fused_pr_auc,
+    expected_calibration_error_evaluator.func: _fused_expected_calibration_error,
+    ndcg_evaluator.func: _fused_ndcg,
+}  # type: Dict[Any, Callable[..., Optional[EvalReturnType]]]
+
+
+def _partition_positions(codes: np.ndarray, n_groups: int) -> List[np.ndarray]:
+    """
+    Positions of the rows with each code from 0 to `n_groups` - 1, in their original order.
+    Rows with negative codes are left out.
+    """
+    order = np.argsort(codes, kind="stable")
+    bounds = np.cumsum(np.bincount(np.maximum(codes + 1, 0), minlength=n_groups + 1))
+    return np.split(order, bounds[:-1])[1:]
+
+
+def _evaluate_partitions(test_data: pd.DataFrame,
+                         eval_fn: EvalFnType,
+                         eval_name: str,
+                         split_values: Iterable,
+                         value_codes: np.ndarray,
+                         partitions: List[np.ndarray],
+                         n_jobs: int) -> EvalReturnType:
+    empty = np.array([], dtype=int)
+    splits = [(eval_name + "_" + str(value), partitions[code] if code >= 0 else empty)
+              for value, code in zip(split_values, value_codes)]
+
+    if n_jobs == 1:
+        results = [eval_fn(test_data.iloc[positions]) for _, positions in splits]
+    else:
+        # threads share test_data, and evaluators are often closures that can't be pickled
+        results = joblib.Parallel(n_jobs=n_jobs, backend="threading")(
+            joblib.delayed(eval_fn)(test_data.iloc[positions]) for _, positions in splits)
+
+    return {name: result for (name, _), result in zip(splits, results)}
+
+
+def _value_codes(uniques: pd.Index, split_values: List) -> np.ndarray:
+    # null split values select no rows, as with an equality mask
+    codes = uniques.get_indexer(split_values) if len(split_values) else np.array([], dtype=int)
+    nulls = np.array([pd.api.types.is_scalar(value) and pd.isnull(value) for value in split_values], dtype=bool)
+    return np.where(nulls, -1, codes)
+
+
+def _factorize_keeping_nulls(values: Any) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Codes and uniques of `values` in order of appearance, as `pd.factorize`, but with
+    nulls as one more value instead of the -1 code.
+    """
+    codes, uniques = pd.factorize(values)
+    nulls = codes == -1
+    if not nulls.any():
+        return codes, np.asarray(uniques)
+
+    # the nulls get the code after the values that first appear before them
+    first_null = int(np.argmax(nulls))
+    null_code = int(codes[:first_null].max()) + 1 if first_null else 0
+    codes = np.where(nulls, null_code, np.where(codes >= null_code, codes + 1, codes))
+    return codes, np.insert(np.asarray(uniques, dtype=object), null_code, np.nan)
+
+
+_TIME_FORMAT_FREQS = {"%Y": "A", "%Y-%m": "M", "%Y-%m-%d": "D"}
 
 
 @curry
@@ -779,7 +1008,8 @@ def split_evaluator(test_data: pd.DataFrame,
                     eval_fn: EvalFnType,
                     split_col: str,
                     split_values: Iterable = None,
-                    eval_name: str = None) -> EvalReturnType:
+                    eval_name: str = None,
+                    n_jobs: int = 1) -> EvalReturnType:
     """
     Splits the dataset into the categories in `split_col` and evaluate
     model performance in each split. Useful when you belive the model
@@ -803,19 +1033,25 @@ def split_evaluator(test_data: pd.DataFrame,
     eval_name : String, optional (default=None)
         the name of the evaluator as it will appear in the logs.
 
+    n_jobs : int (default=1)
+        The number of threads used to evaluate the splits.
+
     Returns
     ----------
     log: dict
         A log-like dictionary with evaluation results by split.
     """
-    if split_values is None:
-        split_values = test_data[split_col].unique()
+    # partitions the rows once, instead of comparing the whole column with each split value
+    codes, uniques = pd.factorize(test_data[split_col])
+    partitions = _partition_positions(codes, len(uniques))
+
+    split_values = list(test_data[split_col].unique() if split_values is None else split_values)
 
     if eval_name is None:
         eval_name = 'split_evaluator__' + split_col
 
-    return {eval_name + "_" + str(value): eval_fn(test_data.loc[lambda df: df[split_col] == value])
-            for value in split_values}
+    return _evaluate_partitions(test_data, eval_fn, eval_name, split_values,
+                                _value_codes(pd.Index(uniques), split_values), partitions, n_jobs)
 
 
 @curry
@@ -824,7 +1060,8 @@ def temporal_split_evaluator(test_data: pd.DataFrame,
                              time_col: str,
                              time_format: str = "%Y-%m",
                              split_values: Iterable[str] = None,
-                             eval_name: str = None) -> EvalReturnType:
+                             eval_name: str = None,
+                             n_jobs: int = 1) -> EvalReturnType:
     """
     Splits the dataset into the temporal categories by `time_col` and evaluate
     model performance in each split.
@@ -853,14 +1090,25 @@ def temporal_split_evaluator(test_data: pd.DataFrame,
     eval_name : String, optional (default=None)
         the name of the evaluator as it will appear in the logs.
 
+    n_jobs : int (default=1)
+        The number of threads used to evaluate the splits.
+
     Returns
     -------
     log: dict
         A log-like dictionary with evaluation results by split.
     """
 
-    formatted_time_col = test_data[time_col].dt.strftime(time_format)
-    unique_values = formatted_time_col.unique()
+    time = test_data[time_col]
+
+    # groups the times first, by integer period codes for the usual formats, so only one time per group is formatted
+    freq = _TIME_FORMAT_FREQS.get(time_format) if time.dt.tz is None else None
+    time_codes = _factorize_keeping_nulls(time.dt.to_period(freq).array.asi8 if freq else time)[0]
+    first_positions = np.unique(time_codes, return_index=True)[1]
+
+    # the first times of the groups are in order of appearance, so the formatted values are as well
+    format_codes, unique_values = _factorize_keeping_nulls(time.iloc[first_positions].dt.strftime(time_format).values)
+    partitions = _partition_positions(format_codes[time_codes], len(unique_values))
 
     if eval_name is None:
         eval_name = 'split_evaluator__' + time_col
@@ -871,8 +1119,19 @@ def temporal_split_evaluator(test_data: pd.DataFrame,
         if not (all(sv in unique_values for sv in split_values)):
             raise ValueError('All split values must be present in the column (after date formatting it')
 
-    return {eval_name + "_" + str(value): eval_fn(test_data.loc[lambda df: formatted_time_col == value])
-            for value in split_values}
+    split_values = list(split_values)
+    return _evaluate_partitions(test_data, eval_fn, eval_name, split_values,
+                                _value_codes(pd.Index(unique_values), split_values), partitions, n_jobs)
+
+
+def _aggregate_logs(logs: List[Any], agg_fn: Callable[[List[Any]], Any]) -> Any:
+    # aggregates the numeric values of logs with the same structure, key by key,
+    # keeping the value of the first log for the others, like names or lists of logs
+    if isinstance(logs[0], dict):
+        return {key: _aggregate_logs([log[key] for log in logs if key in log], agg_fn) for key in logs[0]}
+    if all(isinstance(value, (numbers.Number, np.number)) for value in logs):
+        return agg_fn(logs)
+    return logs[0]
 
 
 @curry
@@ -882,12 +1141,28 @@ def permutation_evaluator(test_data: pd.DataFrame,
                           baseline: bool = True,
                           features: List[str] = None,
                           shuffle_all_at_once: bool = False,
-                          random_state: int = None) -> EvalReturnType:
+                          random_state: int = None,
+                          n_repeats: int = 1,
+                          batch_size: int = 1,
+                          max_batch_bytes: Optional[int] = None,
+                          n_jobs: int = 1,
+                          backend: str = "threading",
+                          resumable: bool = False) -> EvalReturnType:
     """
     Permutation importance evaluator.
     It works by shuffling one or more features on test_data dataframe,
     getting the preditions with predict_fn, and evaluating the results with eval_fn.
 
+    Every feature, or every set of features shuffled at once, is shuffled with its own permutation
+    of the rows in each repeat.
+    Several shuffled copies of test_data can be scored in a single call to predict_fn
+    with `batch_size`, which requires predict_fn to score each row independently and keep
+    the rows in order, as the learners and pipelines of fklearn do.
+
+    With `resumable`, each shuffled copy is instead scored from the first pipeline step that
+    reads the shuffled features, reusing the outputs of the previous steps on the unshuffled
+    test_data. See `fklearn.training.pipeline.resumable_predict_fn`.
+
     Parameters
     ----------
     test_data : Pandas' DataFrame
@@ -912,6 +1187,30 @@ def permutation_evaluator(test_data: pd.DataFrame,
     random_state: int
         Seed to be used by the random number generator.
 
+    n_repeats: int
+        The number of times each feature is shuffled. With more than one repeat, the results
+        of each feature are the mean of the repeats, and their standard deviations are returned
+        in "permutation_importance_std". Only numeric results are aggregated, the others are
+        taken from the first repeat.
+
+    batch_size: int
+        The number of shuffled copies of test_data scored in each call to predict_fn.
+
+    max_batch_bytes: int, optional (default=None)
+        The maximum memory of the shuffled copies scored together, which caps `batch_size`.
+
+    n_jobs: int
+        The number of batches scored in parallel.
+
+    backend: str
+        The joblib backend used to score the batches in parallel. With the default "threading" backend
+        the batches share test_data, while process based backends (e.g. "loky") copy it to every worker.
+
+    resumable: bool
+        Whether to resume the pipeline from the first step that reads the shuffled features, instead of
+        scoring the shuffled copies with the whole pipeline. It requires predict_fn to come from
+        `build_pipeline` and its learners to declare the columns they read and write.
+
     eval_name : String, optional (default=None)
         the name of the evaluator as it will appear in the logs.
 
@@ -925,19 +1224,62 @@ def permutation_evaluator(test_data: pd.DataFrame,
     if features is None:
         features = list(test_data.columns)
 
-    def col_shuffler(f: str) -> np.ndarray:
-        return test_data[f].sample(frac=1.0, random_state=random_state).values
+    feature_sets = {'-'.join(features): features} if shuffle_all_at_once else {f: [f] for f in features}
+
+    # every feature and repeat is shuffled by its own seeded generator, so the permutations are independent
+    # and don't depend on how the shuffled copies are batched, nor are they all kept in memory
+    rng = check_random_state(random_state)
+    seeds = rng.randint(np.iinfo(np.int32).max, size=(len(feature_sets), n_repeats))
+    variants = [(features_to_shuffle, seed)
+                for features_to_shuffle, repeat_seeds in zip(feature_sets.values(), seeds) for seed in repeat_seeds]
+
+    def shuffled_columns(features_to_shuffle: List[str], seed: int) -> Dict[str, np.ndarray]:
+        permutation = np.random.RandomState(seed).permutation(test_data.shape[0])
+        return {f: test_data[f].values[permutation] for f in features_to_shuffle}
+
+    def shuffled_data(features_to_shuffle: List[str], seed: int) -> pd.DataFrame:
+        return test_data.assign(**shuffled_columns(features_to_shuffle, seed))
+
+    # pipelines are resumed from the first step that reads the shuffled features instead of batched
+    if resumable:
+        if not hasattr(predict_fn, "resumable_on"):
+            raise ValueError("resumable permutation importance needs the predict function of a pipeline "
+                             "from build_pipeline")
+        predict_shuffled = predict_fn.resumable_on(  # type: ignore
+            test_data, list(set(fp.concat(feature_sets.values()))))
 
-    def permutation_eval(features_to_shuffle: List[str]) -> EvalReturnType:
-        shuffled_cols = {f: col_shuffler(f) for f in features_to_shuffle}
-        return eval_fn(predict_fn(test_data.assign(**shuffled_cols)))
+    def permutation_eval(batch: List[Tuple[List[str], int]]) -> List[EvalReturnType]:
+        if resumable:
+            return [eval_fn(predict_shuffled(shuffled_columns(*variant))) for variant in batch]
 
-    if shuffle_all_at_once:
-        permutation_results = {'-'.join(features): permutation_eval(features)}
+        if len(batch) == 1:
+            return [eval_fn(predict_fn(shuffled_data(*batch[0])))]
+
+        predictions = predict_fn(pd.concat([shuffled_data(*variant) for variant in batch]))
+        n_rows = test_data.shape[0]
+        return [eval_fn(predictions.iloc[i * n_rows:(i + 1) * n_rows]) for i in range(len(batch))]
+
+    if max_batch_bytes is not None:
+        batch_size = max(1, min(batch_size, max_batch_bytes // max(test_data.memory_usage(deep=True).sum(), 1)))
+    batches = list(fp.partition_all(batch_size, variants))
+
+    if n_jobs == 1:
+        batch_results = list(map(permutation_eval, batches))
     else:
-        permutation_results = {f: permutation_eval([f]) for f in features}
+        batch_results = joblib.Parallel(n_jobs=n_jobs, backend=backend)(
+            joblib.delayed(permutation_eval)(list(batch)) for batch in batches)
 
-    feature_importance = {'permutation_importance': permutation_results}
+    repeat_results = dict(zip(feature_sets, fp.partition(n_repeats, fp.concat(batch_results))))
+
+    if n_repeats == 1:
+        feature_importance = {'permutation_importance': {name: results[0]
+                                                         for name, results in repeat_results.items()}}
+    else:
+        feature_importance = {
+            'permutation_importance': {name: _aggregate_logs(list(results), np.mean)
+                                       for name, results in repeat_results.items()},
+            'permutation_importance_std': {name: _aggregate_logs(list(results), np.std)
+                                           for name, results in repeat_results.items()}}
 
     if baseline:
         baseline_results = {'permutation_importance_baseline': eval_fn(predict_fn(test_data))}
@@ -1,7 +1,8 @@
 import operator
+from collections.abc import Sequence
 from datetime import datetime, timedelta
 from itertools import chain, repeat, starmap
-from typing import Callable, Iterable, List, Tuple, Union
+from typing import Any, Callable, Iterable, List, Tuple, Union
 
 import numpy as np
 import pandas as pd
@@ -10,7 +11,7 @@ from sklearn.utils import check_random_state
 from toolz.curried import curry, partial, pipe, assoc, accumulate, map, filter
 
 from fklearn.common_docstrings import splitter_return_docstring
-from fklearn.types import DateType, LogType, SplitterReturnType
+from fklearn.types import DateType, FoldType, LogType, SplitterReturnType
 
 
 def _log_time_fold(time_fold: Tuple[pd.Series, pd.Series]) -> LogType:
@@ -43,19 +44,140 @@ def _get_sc_folds(date_range: Union[pd.DatetimeIndex, pd.PeriodIndex],
                 list)
 
 
-def _get_sc_test_fold_idx_and_logs(test_data: pd.DataFrame,
+def _sorted_time(time: pd.Series) -> Tuple[np.ndarray, pd.api.extensions.ExtensionArray]:
+    """
+    Sorts a time column once, so its time windows can be found with binary searches.
+    Returns the positions of the non null times in time order and the sorted times.
+    Null times are left out, since they are never inside a time window.
+    """
+    valid_positions = np.flatnonzero(time.notna().values)
+    order = valid_positions[np.argsort(time.values[valid_positions], kind="stable")]
+    return order, time.array.take(order)
+
+
+def _time_window(sorted_time: pd.api.extensions.ExtensionArray,
+                 start: DateType,
+                 end: DateType,
+                 closed_end: bool = False) -> Tuple[int, int]:
+    """
+    Bounds, in the times sorted by `_sorted_time`, of the window [start, end), or [start, end] if `closed_end`.
+    """
+    return (int(sorted_time.searchsorted(start, side="left")),
+            int(sorted_time.searchsorted(end, side="right" if closed_end else "left")))
+
+
+def _window_positions(order: np.ndarray, window: Tuple[int, int]) -> np.ndarray:
+    """
+    Positions, in ascending order, of the rows in a window found with `_time_window`.
+    """
+    return np.sort(order[window[0]:window[1]])
+
+
+def _window_encoder(order: np.ndarray, n_rows: int) -> Callable[[Tuple[int, int]], Any]:
+    """
+    Returns a function that encodes the positions of the rows in a window found with `_time_window`
+    compactly. When the time column is sorted and has no nulls, every window is a range of positions,
+    otherwise the positions are stored as int32 when possible.
+    """
+    if len(order) == n_rows and (len(order) == 0 or (order[-1] == n_rows - 1 and (np.diff(order) == 1).all())):
+        return lambda window: range(window[0], window[1])
+
+    dtype = np.int32 if n_rows < np.iinfo(np.int32).max else np.int64
+    return lambda window: _window_positions(order, window).astype(dtype)
+
+
+def _log_time_window(sorted_time: pd.api.extensions.ExtensionArray,
+                     train_window: Tuple[int, int],
+                     test_window: Tuple[int, int]) -> LogType:
+    """
+    Same as `_log_time_fold`, but with the time bounds read from the sorted times.
+    """
+    def bounds(window: Tuple[int, int]) -> Tuple[Any, Any, int]:
+        start, end = window
+        return (sorted_time[start], sorted_time[end - 1], end - start) if end > start else (pd.NaT, pd.NaT, 0)
+
+    train_start, train_end, train_size = bounds(train_window)
+    test_start, test_end, test_size = bounds(test_window)
+    return {"train_start": train_start, "train_end": train_end, "train_size": train_size,
+            "test_start": test_start, "test_end": test_end, "test_size": test_size}
+
+
+class LazyFolds(Sequence):
+    """
+    A sequence of folds that builds each fold only when it is accessed, so `validator`
+    and `parallel_validator` hold one fold at a time instead of all of them. The indexes
+    of each fold are encoded compactly, as ranges of positions or int32 arrays, which
+    `validator_iteration` selects directly. Use `list_folds` to get the usual list of folds.
+
+    Parameters
+    ----------
+    n_folds : int
+        The number of folds.
+
+    fold_fn : function int -> tuple
+        A function that builds the fold with the given number, as a tuple with the
+        training positions and a list with the positions of each test set.
+    """
+
+    def __init__(self, n_folds: int, fold_fn: Callable[[int], Tuple[Any, List[Any]]]) -> None:
+        self.n_folds = n_folds
+        self.fold_fn = fold_fn
+
+    def __len__(self) -> int:
+        return self.n_folds
+
+    def __getitem__(self, fold_num: Any) -> Any:
+        if isinstance(fold_num, slice):
+            return [self[i] for i in range(*fold_num.indices(self.n_folds))]
+        if fold_num < 0:
+            fold_num += self.n_folds
+        if not 0 <= fold_num < self.n_folds:
+            raise IndexError("fold number out of range")
+        return self.fold_fn(fold_num)
+
+
+def list_folds(folds: Iterable[Tuple[Any, List[Any]]]) -> FoldType:
+    """
+    Converts folds, like the `LazyFolds` of lazy splitters, to the list of folds
+    with `pandas.Index` indexes returned by the other splitters.
+
+    Parameters
+    ----------
+    folds : iterable of tuple
+        The folds, each a tuple with the training indexes and a list with the indexes of each test set.
+
+    Returns
+    ----------
+    folds : list of tuple
+        The folds, with their indexes as `pandas.Index`.
+    """
+    def to_index(index: Any) -> pd.Index:
+        return pd.Index(np.asarray(index, dtype=np.int64))
+
+    return [(to_index(train_index), [to_index(test_index) for test_index in test_indexes])
+            for train_index, test_indexes in folds]
+
+
+def _get_sc_test_fold_idx_and_logs(test_time: pd.Series,
                                    train_time: pd.Series,
-                                   time_column: str,
                                    first_test_moment: DateType,
                                    last_test_moment: DateType,
                                    min_samples: int,
                                    freq: str) -> Tuple[List[LogType], List[List[pd.Index]]]:
     periods_range = pd.period_range(start=first_test_moment, end=last_test_moment, freq=freq)
 
-    def date_filter_fn(period: DateType) -> pd.DataFrame:
-        return test_data[test_data[time_column].dt.to_period(freq) == period]
+    order, sorted_time = _sorted_time(test_time)
+    # the periods of the sorted times are sorted, so each period is a contiguous range of them
+    sorted_periods = sorted_time.to_period(freq).asi8
 
-    folds = _get_sc_folds(periods_range, date_filter_fn, time_column, min_samples)
+    def period_fold(period: pd.Period) -> pd.Series:
+        start, end = np.searchsorted(sorted_periods, [period.ordinal, period.ordinal + 1], side="left")
+        return test_time.iloc[np.sort(order[start:end])]
+
+    folds = pipe(periods_range,
+                 map(period_fold),
+                 filter(lambda s: len(s.index) > min_samples),
+                 list)
 
     logs = list(map(_log_time_fold, zip(repeat(train_time), folds)))  # get fold logs
     test_indexes = list(map(lambda test: [test.index], folds))  # final formatting with idx
@@ -257,7 +379,8 @@ def time_learning_curve_splitter(train_data: pd.DataFrame,
                                  time_column: str,
                                  freq: str = 'M',
                                  holdout_gap: timedelta = timedelta(days=0),
-                                 min_samples: int = 1000) -> SplitterReturnType:
+                                 min_samples: int = 1000,
+                                 lazy: bool = False) -> SplitterReturnType:
     """
     Splits the data into temporal buckets given by the specified frequency.
 
@@ -287,6 +410,11 @@ def time_learning_curve_splitter(train_data: pd.DataFrame,
 
     min_samples : int
         The minimum number of samples required in the split to keep the split.
+
+    lazy: bool
+        If True, the folds are returned as `LazyFolds`, which build the indexes of each fold only when
+        it is accessed and encode them as ranges of positions or int32 arrays, with the holdout encoded
+        once for all folds. Use `list_folds` to get the usual list of folds.
     """
 
     train_data = train_data.reset_index()
@@ -296,16 +424,21 @@ def time_learning_curve_splitter(train_data: pd.DataFrame,
     # training will end at last timestamp in range
     effective_training_time_end = date_range[-1]
 
-    test_time = train_data[train_data[time_column] > (effective_training_time_end + holdout_gap)][time_column]
+    order, sorted_time = _sorted_time(train_data[time_column])
+    encode = _window_encoder(order, len(train_data))
 
-    def date_filter_fn(date: DateType) -> pd.DataFrame:
-        return train_data[train_data[time_column] <= date]
+    # training folds are every time up to each date, and the holdout is every time after the gap
+    test_window = (int(sorted_time.searchsorted(effective_training_time_end + holdout_gap, side="right")),
+                   len(sorted_time))
+    train_windows = [window for window in ((0, int(sorted_time.searchsorted(date, side="right")))
+                                           for date in date_range)
+                     if window[1] - window[0] > min_samples]
 
-    folds = _get_lc_folds(date_range, date_filter_fn, test_time, time_column, min_samples)
+    test_index = encode(test_window)
+    folds = LazyFolds(len(train_windows), lambda i: (encode(train_windows[i]), [test_index]))
+    logs = [_log_time_window(sorted_time, train_window, test_window) for train_window in train_windows]
 
-    logs = list(map(_log_time_fold, folds))  # get fold logs
-    folds_indexes = _lc_fold_to_indexes(folds)  # final formatting with idx
-    return folds_indexes, logs
+    return (folds if lazy else list_folds(folds)), logs
 
 
 time_learning_curve_splitter.__doc__ += splitter_return_docstring
@@ -506,7 +639,7 @@ def stability_curve_time_splitter(train_data: pd.DataFrame,
     first_test_moment = test_data[time_column].min()
     last_test_moment = test_data[time_column].max()
 
-    logs, test_indexes = _get_sc_test_fold_idx_and_logs(test_data, train_time, time_column, first_test_moment,
+    logs, test_indexes = _get_sc_test_fold_idx_and_logs(test_data[time_column], train_time, first_test_moment,
                                                         last_test_moment, min_samples, freq)
 
     # From "list of dicts" to "dict of lists" hack:
@@ -583,7 +716,7 @@ def stability_curve_time_in_space_splitter(train_data: pd.DataFrame,
     first_test_moment = test_data[time_column].min()
     last_test_moment = test_data[time_column].max()
 
-    logs, test_indexes = _get_sc_test_fold_idx_and_logs(test_data, train_time, time_column, first_test_moment,
+    logs, test_indexes = _get_sc_test_fold_idx_and_logs(test_data[time_column], train_time, first_test_moment,
                                                         last_test_moment, min_samples, freq)
 
     # From "list of dicts" to "dict of lists" hack:
@@ -662,7 +795,7 @@ def stability_curve_time_space_splitter(train_data: pd.DataFrame,
     first_test_moment = test_data[time_column].min()
     last_test_moment = test_data[time_column].max()
 
-    logs, test_indexes = _get_sc_test_fold_idx_and_logs(test_data, train_time, time_column, first_test_moment,
+    logs, test_indexes = _get_sc_test_fold_idx_and_logs(test_data[time_column], train_time, first_test_moment,
                                                         last_test_moment, min_samples, freq)
 
     # From "list of dicts" to "dict of lists" hack:
@@ -685,7 +818,8 @@ def forward_stability_curve_time_splitter(train_data: pd.DataFrame,
                                           holdout_gap: timedelta = timedelta(days=0),
                                           holdout_size: timedelta = timedelta(days=90),
                                           step: timedelta = timedelta(days=90),
-                                          move_training_start_with_steps: bool = True) -> SplitterReturnType:
+                                          move_training_start_with_steps: bool = True,
+                                          lazy: bool = False) -> SplitterReturnType:
     """
     Splits the data into temporal buckets with both the training and testing folds both moving forward.
     The folds move forward by a fixed timedelta step.
@@ -724,6 +858,11 @@ def forward_stability_curve_time_splitter(train_data: pd.DataFrame,
     move_training_start_with_steps: bool
         If True, the training start date will increase by `step` for each fold.
         If False, the training start date remains fixed at the `training_time_start` value.
+
+    lazy: bool
+        If True, the folds are returned as `LazyFolds`, which build the indexes of each fold only when
+        it is accessed and encode them as ranges of positions or int32 arrays. Use it with many folds
+        or large datasets, and `list_folds` to get the usual list of folds.
     """
 
     if isinstance(training_time_start, str):
@@ -757,15 +896,17 @@ def forward_stability_curve_time_splitter(train_data: pd.DataFrame,
         for i in range(n_folds)
     ]
 
-    train_idx = [train_data[(train_data[time_column] >= start) & (train_data[time_column] < end)].index
-                 for start, end in train_ranges]
-    test_idx = [[train_data[(train_data[time_column] >= start) & (train_data[time_column] < end)].index]
-                for start, end in test_ranges]
+    order, sorted_time = _sorted_time(train_data[time_column])
+    encode = _window_encoder(order, len(train_data))
+
+    train_windows = [_time_window(sorted_time, start, end) for start, end in train_ranges]
+    test_windows = [_time_window(sorted_time, start, end) for start, end in test_ranges]
 
-    logs = [_log_time_fold((train_data.iloc[i][time_column], train_data.iloc[j[0]][time_column])) for i, j in
-            zip(train_idx, test_idx)]
+    folds = LazyFolds(n_folds, lambda i: (encode(train_windows[i]), [encode(test_windows[i])]))
+    logs = [_log_time_window(sorted_time, train_window, test_window)
+            for train_window, test_window in zip(train_windows, test_windows)]
 
-    return list(zip(train_idx, test_idx)), logs
+    return (folds if lazy else list_folds(folds)), logs
 
 
 forward_stability_curve_time_splitter.__doc__ += splitter_return_docstring
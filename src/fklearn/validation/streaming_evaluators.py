@@ -0,0 +1,549 @@
+from functools import reduce
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from fklearn.types import EvalReturnType
+
+StateType = Dict[str, Any]
+
+
+class StreamingEvaluator:
+    """
+    An evaluator that computes its metric from a compact state, like histograms or running
+    moments, instead of the whole test set. The state is updated with each chunk of the test
+    set, states from different chunks or workers can be merged, and the final state is turned
+    into the usual log-like dictionary. States are dictionaries of numbers and numpy arrays,
+    so they can be pickled and sent between processes.
+
+    A `StreamingEvaluator` can also be called with a DataFrame, like any other evaluator.
+
+    Parameters
+    ----------
+    init_fn : function () -> dict
+        Returns the state of an empty test set.
+
+    update_fn : function (dict, pandas.DataFrame) -> dict
+        Returns the state updated with a chunk of the test set.
+
+    merge_fn : function (dict, dict) -> dict
+        Returns the state of the union of the test sets of two states.
+
+    finalize_fn : function dict -> dict
+        Returns the log-like dictionary of the evaluation from a state.
+    """
+
+    def __init__(self,
+                 init_fn: Callable[[], StateType],
+                 update_fn: Callable[[StateType, pd.DataFrame], StateType],
+                 merge_fn: Callable[[StateType, StateType], StateType],
+                 finalize_fn: Callable[[StateType], EvalReturnType]) -> None:
+        self.init_fn = init_fn
+        self.update_fn = update_fn
+        self.merge_fn = merge_fn
+        self.finalize_fn = finalize_fn
+
+    def init(self) -> StateType:
+        return self.init_fn()
+
+    def update(self, state: StateType, chunk: pd.DataFrame) -> StateType:
+        return self.update_fn(state, chunk)
+
+    def merge(self, state: StateType, other: StateType) -> StateType:
+        return self.merge_fn(state, other)
+
+    def finalize(self, state: StateType) -> EvalReturnType:
+        return self.finalize_fn(state)
+
+    def __call__(self, test_data: pd.DataFrame) -> EvalReturnType:
+        return self.finalize(self.update(self.init(), test_data))
+
+
+def streaming_evaluate(evaluator: StreamingEvaluator, chunks: Iterable[pd.DataFrame]) -> EvalReturnType:
+    """
+    Evaluates a test set given in chunks, like the ones from `fklearn.training.pipeline.stream_predict`,
+    holding only one chunk in memory at a time.
+
+    Parameters
+    ----------
+    evaluator : StreamingEvaluator
+        The streaming evaluator.
+
+    chunks : iterable of pandas.DataFrame
+        The chunks of the test set, with target and predictions.
+
+    Returns
+    ----------
+    log: dict
+        A log-like dictionary with the evaluation of the whole test set.
+    """
+    return evaluator.finalize(reduce(evaluator.update, chunks, evaluator.init()))
+
+
+def merge_states(evaluator: StreamingEvaluator, states: Iterable[StateType]) -> StateType:
+    """
+    Merges the states of a streaming evaluator computed on different parts of a test set, for
+    example by parallel scoring jobs, into the state of the whole test set.
+
+    Parameters
+    ----------
+    evaluator : StreamingEvaluator
+        The streaming evaluator the states were computed with.
+
+    states : iterable of dict
+        The states to merge.
+
+    Returns
+    ----------
+    state: dict
+        The state of the whole test set, to be finalized with `evaluator.finalize`.
+    """
+    return reduce(evaluator.merge, states, evaluator.init())
+
+
+def _add_states(state: StateType, other: StateType) -> StateType:
+    return {key: state[key] + other[key] for key in state}
+
+
+def _weights(chunk: pd.DataFrame, weight_column: Optional[str] = None) -> np.ndarray:
+    return np.ones(len(chunk)) if weight_column is None else chunk[weight_column].values.astype(float)
+
+
+def _moments(x: np.ndarray, y: np.ndarray, w: np.ndarray) -> StateType:
+    total = w.sum()
+    if total == 0:
+        return {"weight": 0.0, "mean_x": 0.0, "mean_y": 0.0, "m2_x": 0.0, "m2_y": 0.0, "c_xy": 0.0}
+
+    mean_x, mean_y = np.sum(w * x) / total, np.sum(w * y) / total
+    dx, dy = x - mean_x, y - mean_y
+    return {"weight": total, "mean_x": mean_x, "mean_y": mean_y,
+            "m2_x": np.sum(w * dx * dx), "m2_y": np.sum(w * dy * dy), "c_xy": np.sum(w * dx * dy)}
+
+
+def _merge_moments(state: StateType, other: StateType) -> StateType:
+    # pairwise update of Chan et al., which is stable for any split of the test set
+    if other["weight"] == 0:
+        return state
+    if state["weight"] == 0:
+        return other
+
+    total = state["weight"] + other["weight"]
+    dx, dy = other["mean_x"] - state["mean_x"], other["mean_y"] - state["mean_y"]
+    scale = state["weight"] * other["weight"] / total
+    return {"weight": total,
+            "mean_x": state["mean_x"] + dx * other["weight"] / total,
+            "mean_y": state["mean_y"] + dy * other["weight"] / total,
+            "m2_x": state["m2_x"] + other["m2_x"] + dx * dx * scale,
+            "m2_y": state["m2_y"] + other["m2_y"] + dy * dy * scale,
+            "c_xy": state["c_xy"] + other["c_xy"] + dx * dy * scale}
+
+
+def _sum_evaluator(loss_fn: Callable[[pd.DataFrame], np.ndarray],
+                   weight_column: Optional[str],
+                   eval_name: str) -> StreamingEvaluator:
+    """
+    A streaming evaluator of the weighted mean of a per row loss.
+    """
+    def update(state: StateType, chunk: pd.DataFrame) -> StateType:
+        w = _weights(chunk, weight_column)
+        return _add_states(state, {"weight": w.sum(), "loss": np.sum(w * loss_fn(chunk))})
+
+    return StreamingEvaluator(lambda: {"weight": 0.0, "loss": 0.0}, update, _add_states,
+                              lambda state: {eval_name: state["loss"] / state["weight"] if state["weight"] else np.nan})
+
+
+def roc_auc_streaming_evaluator(prediction_column: str = "prediction",
+                                target_column: str = "target",
+                                weight_column: Optional[str] = None,
+                                eval_name: Optional[str] = None,
+                                n_bins: int = 10000,
+                                score_range: tuple = (0.0, 1.0)) -> StreamingEvaluator:
+    """
+    Streaming version of `roc_auc_evaluator`. Keeps a histogram of the prediction scores of
+    each class with `n_bins` equally spaced bins in `score_range`, and counts scores in the same
+    bin as ties, so the AUC is exact when the scores take at most one value per bin and
+    otherwise deviates by less than the fraction of pairs that share a bin.
+
+    Parameters
+    ----------
+    prediction_column : Strings
+        The name of the column with the prediction scores.
+
+    target_column : String
+        The name of the column with the binary target.
+
+    weight_column : String (default=None)
+        The name of the column with the sample weights.
+
+    eval_name : String, optional (default=None)
+        the name of the evaluator as it will appear in the logs.
+
+    n_bins : int (default=10000)
+        The number of bins of the score histograms.
+
+    score_range : tuple of float (default=(0.0, 1.0))
+        The lowest and highest scores. Scores outside of the range are counted in the first or last bin.
+
+    Returns
+    ----------
+    evaluator: StreamingEvaluator
+        A streaming evaluator of the ROC AUC Score
+    """
+    if eval_name is None:
+        eval_name = "roc_auc_evaluator__" + target_column
+
+    lower, upper = score_range
+
+    def init() -> StateType:
+        return {"positives": np.zeros(n_bins), "negatives": np.zeros(n_bins), "invalid": 0}
+
+    def update(state: StateType, chunk: pd.DataFrame) -> StateType:
+        scores = chunk[prediction_column].values.astype(float)
+        target = chunk[target_column].values.astype(int)
+        w = _weights(chunk, weight_column)
+
+        valid = np.isfinite(scores) & np.isin(target, [0, 1])
+        bins = np.clip(((scores[valid] - lower) / (upper - lower) * n_bins).astype(int), 0, n_bins - 1)
+        return _add_states(state, {
+            "positives": np.bincount(bins, w[valid] * (target[valid] == 1), minlength=n_bins),
+            "negatives": np.bincount(bins, w[valid] * (target[valid] == 0), minlength=n_bins),
+            "invalid": int(np.sum(~valid))})
+
+    def finalize(state: StateType) -> EvalReturnType:
+        positives, negatives = state["positives"], state["negatives"]
+        if state["invalid"] or positives.sum() == 0 or negatives.sum() == 0:
+            # as roc_auc_evaluator, with a single class or invalid scores
+            return {eval_name: np.nan}
+
+        # each positive ranks above the negatives of lower bins and ties with the ones of its bin
+        negatives_below = np.cumsum(negatives) - negatives
+        score = np.sum(positives * (negatives_below + 0.5 * negatives)) / (positives.sum() * negatives.sum())
+        return {eval_name: score}
+
+    return StreamingEvaluator(init, update, _add_states, finalize)
+
+
+def logloss_streaming_evaluator(prediction_column: str = "prediction",
+                                target_column: str = "target",
+                                weight_column: Optional[str] = None,
+                                eval_name: Optional[str] = None,
+                                eps: float = 1e-15) -> StreamingEvaluator:
+    """
+    Streaming version of `logloss_evaluator`, keeping the sum of the losses and of the weights.
+    Unlike `logloss_evaluator`, a test set with a single class is still scored.
+
+    Parameters
+    ----------
+    prediction_column : Strings
+        The name of the column with the prediction scores.
+
+    target_column : String
+        The name of the column with the binary target.
+
+    weight_column : String (default=None)
+        The name of the column with the sample weights.
+
+    eval_name : String, optional (default=None)
+        the name of the evaluator as it will appear in the logs.
+
+    eps : float (default=1e-15)
+        The scores are clipped to [eps, 1 - eps], as in `sklearn.metrics.log_loss`.
+
+    Returns
+    ----------
+    evaluator: StreamingEvaluator
+        A streaming evaluator of the logloss score.
+    """
+    if eval_name is None:
+        eval_name = "logloss_evaluator__" + target_column
+
+    def loss(chunk: pd.DataFrame) -> np.ndarray:
+        scores = np.clip(chunk[prediction_column].values.astype(float), eps, 1 - eps)
+        target = chunk[target_column].values.astype(int)
+        return -(target * np.log(scores) + (1 - target) * np.log(1 - scores))
+
+    return _sum_evaluator(loss, weight_column, eval_name)
+
+
+def brier_score_streaming_evaluator(prediction_column: str = "prediction",
+                                    target_column: str = "target",
+                                    weight_column: Optional[str] = None,
+                                    eval_name: Optional[str] = None) -> StreamingEvaluator:
+    """
+    Streaming version of `brier_score_evaluator`, keeping the sum of the squared errors and of the weights.
+
+    Parameters
+    ----------
+    prediction_column : Strings
+        The name of the column with the prediction scores.
+
+    target_column : String
+        The name of the column with the binary target.
+
+    weight_column : String (default=None)
+        The name of the column with the sample weights.
+
+    eval_name : String, optional (default=None)
+        The name of the evaluator as it will appear in the logs.
+
+    Returns
+    ----------
+    evaluator: StreamingEvaluator
+        A streaming evaluator of the Brier score.
+    """
+    if eval_name is None:
+        eval_name = "brier_score_evaluator__" + target_column
+
+    return _sum_evaluator(lambda chunk: (chunk[target_column].values.astype(int)
+                                         - chunk[prediction_column].values) ** 2,
+                          weight_column, eval_name)
+
+
+def mse_streaming_evaluator(prediction_column: str = "prediction",
+                            target_column: str = "target",
+                            weight_column: Optional[str] = None,
+                            eval_name: Optional[str] = None) -> StreamingEvaluator:
+    """
+    Streaming version of `mse_evaluator`, keeping the sum of the squared errors and of the weights.
+
+    Parameters
+    ----------
+    prediction_column : Strings
+        The name of the column with the predictions.
+
+    target_column : String
+        The name of the column with the continuous target.
+
+    weight_column : String (default=None)
+        The name of the column with the sample weights.
+
+    eval_name : String, optional (default=None)
+        the name of the evaluator as it will appear in the logs.
+
+    Returns
+    ----------
+    evaluator: StreamingEvaluator
+        A streaming evaluator of the MSE Score
+    """
+    if eval_name is None:
+        eval_name = "mse_evaluator__" + target_column
+
+    return _sum_evaluator(lambda chunk: (chunk[target_column].values - chunk[prediction_column].values) ** 2,
+                          weight_column, eval_name)
+
+
+def r2_streaming_evaluator(prediction_column: str = "prediction",
+                           target_column: str = "target",
+                           weight_column: Optional[str] = None,
+                           eval_name: Optional[str] = None) -> StreamingEvaluator:
+    """
+    Streaming version of `r2_evaluator`, keeping the running moments of the target and
+    the sum of the squared errors.
+
+    Parameters
+    ----------
+    prediction_column : Strings
+        The name of the column with the prediction.
+
+    target_column : String
+        The name of the column with the continuous target.
+
+    weight_column : String (default=None)
+        The name of the column with the sample weights.
+
+    eval_name : String, optional (default=None)
+        the name of the evaluator as it will appear in the logs.
+
+    Returns
+    ----------
+    evaluator: StreamingEvaluator
+        A streaming evaluator of the R2 Score
+    """
+    if eval_name is None:
+        eval_name = "r2_evaluator__" + target_column
+
+    def init() -> StateType:
+        return {"moments": _moments(np.zeros(0), np.zeros(0), np.zeros(0)), "squared_error": 0.0}
+
+    def update(state: StateType, chunk: pd.DataFrame) -> StateType:
+        target, w = chunk[target_column].values.astype(float), _weights(chunk, weight_column)
+        return merge(state, {"moments": _moments(target, target, w),
+                             "squared_error": np.sum(w * (target - chunk[prediction_column].values) ** 2)})
+
+    def merge(state: StateType, other: StateType) -> StateType:
+        return {"moments": _merge_moments(state["moments"], other["moments"]),
+                "squared_error": state["squared_error"] + other["squared_error"]}
+
+    def finalize(state: StateType) -> EvalReturnType:
+        total_error = state["moments"]["m2_y"]
+        if total_error == 0:
+            # as sklearn, a constant target is perfectly explained only without errors
+            return {eval_name: 1.0 if state["squared_error"] == 0 else 0.0}
+        return {eval_name: 1 - state["squared_error"] / total_error}
+
+    return StreamingEvaluator(init, update, merge, finalize)
+
+
+def mean_prediction_streaming_evaluator(prediction_column: str = "prediction",
+                                        eval_name: Optional[str] = None) -> StreamingEvaluator:
+    """
+    Streaming version of `mean_prediction_evaluator`, keeping the sum and count of the non null values.
+
+    Parameters
+    ----------
+    prediction_column : Strings
+        The name of the column to compute the mean.
+
+    eval_name : String, optional (default=None)
+        the name of the evaluator as it will appear in the logs.
+
+    Returns
+    ----------
+    evaluator: StreamingEvaluator
+        A streaming evaluator of the column mean
+    """
+    if eval_name is None:
+        eval_name = 'mean_evaluator__' + prediction_column
+
+    def update(state: StateType, chunk: pd.DataFrame) -> StateType:
+        values = chunk[prediction_column]
+        return _add_states(state, {"sum": values.sum(), "count": int(values.count())})
+
+    def finalize(state: StateType) -> EvalReturnType:
+        return {eval_name: state["sum"] / state["count"] if state["count"] else np.nan}
+
+    return StreamingEvaluator(lambda: {"sum": 0.0, "count": 0}, update, _add_states, finalize)
+
+
+def correlation_streaming_evaluator(prediction_column: str = "prediction",
+                                    target_column: str = "target",
+                                    eval_name: Optional[str] = None) -> StreamingEvaluator:
+    """
+    Streaming version of `correlation_evaluator`, keeping the running moments and co-moment of
+    prediction and target. Rows where either is null are left out, as in `pandas.DataFrame.corr`.
+
+    Parameters
+    ----------
+    prediction_column : Strings
+        The name of the column with the prediction.
+
+    target_column : String
+        The name of the column with the continuous target.
+
+    eval_name : String, optional (default=None)
+        the name of the evaluator as it will appear in the logs.
+
+    Returns
+    ----------
+    evaluator: StreamingEvaluator
+        A streaming evaluator of the Pearson correlation
+    """
+    if eval_name is None:
+        eval_name = "correlation_evaluator__" + target_column
+
+    def update(state: StateType, chunk: pd.DataFrame) -> StateType:
+        x, y = chunk[prediction_column].values.astype(float), chunk[target_column].values.astype(float)
+        valid = ~(np.isnan(x) | np.isnan(y))
+        return _merge_moments(state, _moments(x[valid], y[valid], np.ones(valid.sum())))
+
+    def finalize(state: StateType) -> EvalReturnType:
+        denominator = np.sqrt(state["m2_x"] * state["m2_y"])
+        return {eval_name: state["c_xy"] / denominator if state["weight"] > 1 and denominator > 0 else np.nan}
+
+    return StreamingEvaluator(lambda: _moments(np.zeros(0), np.zeros(0), np.zeros(0)), update, _merge_moments,
+                              finalize)
+
+
+def expected_calibration_error_streaming_evaluator(prediction_column: str = "prediction",
+                                                   target_column: str = "target",
+                                                   eval_name: Optional[str] = None,
+                                                   n_bins: int = 100,
+                                                   score_range: tuple = (0.0, 1.0)) -> StreamingEvaluator:
+    """
+    Streaming version of `expected_calibration_error_evaluator` with `bin_choice="prob"`,
+    keeping the count, prediction sum and target sum of each bin. Equally populated bins need
+    the quantiles of the whole test set, so the bins are `n_bins` equally spaced bins in
+    `score_range` instead of in the range of the predictions, and empty bins are left out.
+
+    Parameters
+    ----------
+    prediction_column : Strings
+        The name of the column with the prediction scores.
+
+    target_column : String
+        The name of the column with the binary target.
+
+    eval_name : String, optional (default=None)
+        The name of the evaluator as it will appear in the logs.
+
+    n_bins: Int (default=100)
+        The number of bins.
+
+    score_range : tuple of float (default=(0.0, 1.0))
+        The lowest and highest scores. Scores outside of the range are counted in the first or last bin.
+
+    Returns
+    -------
+    evaluator: StreamingEvaluator
+       A streaming evaluator of the expected calibration error.
+    """
+    if eval_name is None:
+        eval_name = "expected_calibration_error_evaluator__" + target_column
+
+    lower, upper = score_range
+
+    def init() -> StateType:
+        return {"count": np.zeros(n_bins), "predictions": np.zeros(n_bins), "actuals": np.zeros(n_bins)}
+
+    def update(state: StateType, chunk: pd.DataFrame) -> StateType:
+        predictions = chunk[prediction_column].values.astype(float)
+        actuals = chunk[target_column].values.astype(float)
+
+        valid = ~(np.isnan(predictions) | np.isnan(actuals))
+        predictions, actuals = predictions[valid], actuals[valid]
+        bins = np.clip(((predictions - lower) / (upper - lower) * n_bins).astype(int), 0, n_bins - 1)
+        return _add_states(state, {"count": np.bincount(bins, minlength=n_bins).astype(float),
+                                   "predictions": np.bincount(bins, predictions, minlength=n_bins),
+                                   "actuals": np.bincount(bins, actuals, minlength=n_bins)})
+
+    def finalize(state: StateType) -> EvalReturnType:
+        filled = state["count"] > 0
+        if not filled.any():
+            return {eval_name: np.nan}
+
+        count = state["count"][filled]
+        distance = np.abs(state["actuals"][filled] - state["predictions"][filled]) / count
+        return {eval_name: np.sum(count * distance) / np.sum(count)}
+
+    return StreamingEvaluator(init, update, _add_states, finalize)
+
+
+def combined_streaming_evaluators(evaluators: List[StreamingEvaluator]) -> StreamingEvaluator:
+    """
+    Combines streaming evaluators into one, whose state is the list of their states,
+    so every evaluator is updated with each chunk as it is read.
+
+    Parameters
+    ----------
+    evaluators: List
+        List of streaming evaluators
+
+    Returns
+    ----------
+    evaluator: StreamingEvaluator
+        A streaming evaluator with the logs of all evaluators.
+    """
+    def init() -> StateType:
+        return {"states": [e.init() for e in evaluators]}
+
+    def update(state: StateType, chunk: pd.DataFrame) -> StateType:
+        return {"states": [e.update(s, chunk) for e, s in zip(evaluators, state["states"])]}
+
+    def merge(state: StateType, other: StateType) -> StateType:
+        return {"states": [e.merge(s, o) for e, s, o in zip(evaluators, state["states"], other["states"])]}
+
+    def finalize(state: StateType) -> EvalReturnType:
+        return reduce(lambda log, e_s: {**log, **e_s[0].finalize(e_s[1])}, zip(evaluators, state["states"]), {})
+
+    return StreamingEvaluator(init, update, merge, finalize)
@@ -1,8 +1,18 @@
 import gc
+import hashlib
 import inspect
+import os
+import pickle
+import shutil
+import tempfile
+import threading
 import warnings
-from typing import Dict, Tuple, List
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterable, Iterator, Tuple, List, Optional
 
+import cloudpickle
+import joblib
+import numpy as np
 import pandas as pd
 from joblib import Parallel, delayed
 from toolz import compose
@@ -14,6 +24,134 @@ from fklearn.types import EvalFnType, LearnerFnType, LogType
 from fklearn.types import SplitterFnType, ValidatorReturnType, PerturbFnType
 
 
+def materialize_fold(data: pd.DataFrame,
+                     index: pd.Index,
+                     columns: Optional[List[str]] = None,
+                     zero_copy: bool = False) -> pd.DataFrame:
+    """
+    Selects the rows of a fold by position, copying only the `columns` they need. Folds of
+    contiguous positions, like the time folds of sorted data, are selected with a slice.
+
+    Parameters
+    ----------
+    data : pandas.DataFrame
+        A Pandas' DataFrame with training and testing subsets
+
+    index : numpy.Array or range
+        The positions of the fold rows in `data`.
+
+    columns : list of str
+        The columns of `data` used by the learner and the evaluator. If None, all columns are selected.
+
+    zero_copy : bool
+        If True, the slices of contiguous folds are returned as views of `data` instead of copies.
+        The learner and the evaluator must then not modify their input in place, as that would
+        modify `data`, or fail when `data` is memory-mapped.
+
+    Returns
+    ----------
+    fold_data : pandas.DataFrame
+        The rows of `data` in the fold.
+    """
+    missing_columns = [col for col in columns or [] if col not in data.columns]
+    if missing_columns:
+        raise KeyError("Columns not in data: {0}".format(missing_columns))
+
+    column_positions = slice(None) if columns is None else data.columns.get_indexer(columns)
+
+    # lazy splitters encode the positions of folds of sorted data as ranges
+    if isinstance(index, range) and index.step == 1:
+        fold_data = data.iloc[index.start:index.stop, column_positions]
+        return fold_data if zero_copy else fold_data.copy()
+
+    positions = np.asarray(index)
+
+    if (positions.ndim == 1 and len(positions) > 1 and positions.dtype.kind in "iu"
+            and positions[-1] - positions[0] == len(positions) - 1 and (np.diff(positions) == 1).all()):
+        fold_data = data.iloc[positions[0]:positions[-1] + 1, column_positions]
+        return fold_data if zero_copy else fold_data.copy()
+
+    return data.iloc[positions, column_positions]
+
+
+def compact_oof_predictions(test_predictions: pd.DataFrame,
+                            test_index: pd.Index,
+                            oof_columns: List[str],
+                            oof_path: Optional[str] = None) -> LogType:
+    """
+    Keeps only some columns of the out of fold predictions of a test set, as typed NumPy arrays
+    aligned to the positions of the test rows in the validation data.
+
+    Parameters
+    ----------
+    test_predictions : pandas.DataFrame
+        The predictions on the test set.
+
+    test_index : numpy.Array or range
+        The positions of the test rows in the validation data.
+
+    oof_columns : list of str
+        The columns to keep, like the prediction columns and the keys to join them with.
+
+    oof_path : str
+        Folder where the arrays are dumped with joblib and memory-mapped back, so they are not
+        kept in memory. The files are not removed, so remove the folder once they are no longer
+        needed. If None, the arrays are kept in memory.
+
+    Returns
+    ----------
+    oof_predictions : dict
+        The positions of the test rows, as `positions`, and the arrays of `oof_columns`, as `columns`.
+    """
+    if len(test_predictions) != len(test_index):
+        raise ValueError("test_predictions has {0} rows but the test set has {1}"
+                         .format(len(test_predictions), len(test_index)))
+
+    oof_predictions = {"positions": np.asarray(test_index, dtype=np.int64),
+                       "columns": {col: test_predictions[col].to_numpy() for col in oof_columns}}
+    if oof_path is None:
+        return oof_predictions
+
+    os.makedirs(oof_path, exist_ok=True)
+    handle, oof_file = tempfile.mkstemp(prefix="oof_", suffix=".pkl", dir=oof_path)
+    os.close(handle)
+    joblib.dump(oof_predictions, oof_file)
+    return joblib.load(oof_file, mmap_mode="r")
+
+
+def assemble_oof_predictions(validator_log: List[LogType]) -> pd.DataFrame:
+    """
+    Assembles the compact out of fold predictions of a validator run with `oof_columns` into
+    a single DataFrame, by concatenating the arrays of each fold and test set once.
+
+    Parameters
+    ----------
+    validator_log : list of dict
+        The `validator_log` of a validator run with `predict_oof=True` and `oof_columns`.
+
+    Returns
+    ----------
+    oof_predictions : pandas.DataFrame
+        The out of fold predictions, indexed by the position of each row in the validation data,
+        with the `fold_num` and the `eval_num` (the number of the test set in the fold) of each row.
+    """
+    parts = [(log["fold_num"], eval_num, oof) for log in validator_log
+             for eval_num, oof in enumerate(log["oof_predictions"])]
+    if not parts:
+        raise ValueError("validator_log has no out of fold predictions")
+    if not all(isinstance(oof, dict) for _, _, oof in parts):
+        raise TypeError("assemble_oof_predictions needs the compact predictions of a validator run with oof_columns")
+
+    sizes = [len(oof["positions"]) for _, _, oof in parts]
+    columns = list(parts[0][2]["columns"])
+    data = {col: np.concatenate([oof["columns"][col] for _, _, oof in parts]) for col in columns}
+    data["fold_num"] = np.repeat([fold_num for fold_num, _, _ in parts], sizes)
+    data["eval_num"] = np.repeat([eval_num for _, eval_num, _ in parts], sizes)
+
+    index = pd.Index(np.concatenate([oof["positions"] for _, _, oof in parts]), name="position")
+    return pd.DataFrame(data, index=index)
+
+
 def validator_iteration(data: pd.DataFrame,
                         train_index: pd.Index,
                         test_indexes: pd.Index,
@@ -22,7 +160,11 @@ def validator_iteration(data: pd.DataFrame,
                         eval_fn: EvalFnType,
                         predict_oof: bool = False,
                         return_eval_logs_on_train: bool = False,
-                        verbose: bool = False) -> LogType:
+                        verbose: bool = False,
+                        columns: Optional[List[str]] = None,
+                        oof_columns: Optional[List[str]] = None,
+                        oof_path: Optional[str] = None,
+                        zero_copy: bool = False) -> LogType:
     """
     Perform an iteration of train test split, training and evaluation.
 
@@ -58,13 +200,48 @@ def validator_iteration(data: pd.DataFrame,
     verbose : bool
         Whether to print the starting status of the fold to be evaluated.
 
+    columns : list of str
+        The columns of `data` used by `train_fn` and `eval_fn`. If given, only these columns
+        are materialized for each fold. See `materialize_fold`.
+
+    oof_columns : list of str
+        The columns of the out of fold predictions to keep when `predict_oof` is True, like the
+        prediction columns and the keys to join them with. They are kept as NumPy arrays aligned to the
+        positions of the test rows, instead of the whole DataFrame. See `compact_oof_predictions`.
+        If None, the whole DataFrame of predictions is kept.
+
+    oof_path : str
+        Folder where the compact out of fold predictions are memory-mapped, instead of kept in memory.
+        Only used with `oof_columns`.
+
+    zero_copy : bool
+        If True, contiguous folds are passed to `train_fn` and `eval_fn` as views of `data` instead
+        of copies, saving memory and time. Only use it with functions that don't modify their input
+        in place. See `materialize_fold`.
+
     Returns
     ----------
     A log-like dictionary evaluations.
     """
 
-    train_data = data.iloc[train_index]
+    train_data = materialize_fold(data, train_index, columns, zero_copy)
+    test_sets = (materialize_fold(data, test_index, columns, zero_copy) for test_index in test_indexes)
+
+    return _fit_and_evaluate_fold(train_data, test_sets, test_indexes, fold_num, train_fn, eval_fn, predict_oof,
+                                  return_eval_logs_on_train, verbose, oof_columns, oof_path)
 
+
+def _fit_and_evaluate_fold(train_data: pd.DataFrame,
+                           test_sets: Iterable[pd.DataFrame],
+                           test_indexes: pd.Index,
+                           fold_num: int,
+                           train_fn: LearnerFnType,
+                           eval_fn: EvalFnType,
+                           predict_oof: bool,
+                           return_eval_logs_on_train: bool,
+                           verbose: bool,
+                           oof_columns: Optional[List[str]],
+                           oof_path: Optional[str]) -> LogType:
     empty_set_warn = "Splitter on validator_iteration in generating an empty training dataset. train_data.shape is %s" \
                      % str(train_data.shape)
     warnings.warn(empty_set_warn) if train_data.shape[0] == 0 else None  # type: ignore
@@ -78,10 +255,12 @@ def validator_iteration(data: pd.DataFrame,
 
     if verbose:
         print(f"Running validation for {fold_num} fold.")
-    for test_index in (tqdm(test_indexes) if verbose else test_indexes):
-        test_predictions = predict_fn(data.iloc[test_index])
+    for test_index, test_data in zip(tqdm(test_indexes) if verbose else test_indexes, test_sets):
+        test_predictions = predict_fn(test_data)
         eval_results.append(eval_fn(test_predictions))
-        if predict_oof:
+        if predict_oof and oof_columns is not None:
+            oof_predictions.append(compact_oof_predictions(test_predictions, test_index, oof_columns, oof_path))
+        elif predict_oof:
             oof_predictions.append(test_predictions)
 
     logs = {'fold_num': fold_num,
@@ -91,6 +270,125 @@ def validator_iteration(data: pd.DataFrame,
     return assoc(logs, "oof_predictions", oof_predictions) if predict_oof else logs
 
 
+def _fn_fingerprint(fn: Callable) -> str:
+    fingerprint = getattr(fn, "fingerprint", None)
+    if fingerprint is not None:
+        # pipelines are hashed by their steps and options, leaving out their cache
+        learners, *options = fingerprint
+        return joblib.hash(([_fn_fingerprint(learner) for learner in learners], options))
+
+    try:
+        # curried module level functions are hashed by name and arguments
+        return joblib.hash(fn)
+    except (pickle.PicklingError, TypeError, AttributeError):
+        pass
+
+    try:
+        # closures are hashed by code and captured values
+        return hashlib.sha1(cloudpickle.dumps(fn)).hexdigest()
+    except (pickle.PicklingError, TypeError, AttributeError) as e:
+        raise ValueError("%r can't be fingerprinted to key the checkpoints of its folds (%s). Pass an explicit "
+                         "`checkpoint_key` identifying the run instead." % (fn, e))
+
+
+def validator_checkpoint_key(train_data: pd.DataFrame,
+                             split_fn: SplitterFnType,
+                             train_fn: LearnerFnType,
+                             eval_fn: EvalFnType,
+                             **options: Any) -> str:
+    """
+    Fingerprints a validation run, to key the checkpoints of its folds. Runs with the same data,
+    the same split, train and evaluation functions, with the same arguments, and the same
+    `options` share their checkpoints.
+
+    Pipelines built by `build_pipeline` are fingerprinted by their learners and options, leaving
+    out their step cache, and other closures with `cloudpickle`. Closures that can't be pickled,
+    for instance because they hold a lock or a connection, raise a ValueError.
+
+    Parameters
+    ----------
+    train_data : pandas.DataFrame
+        The data of the run.
+
+    split_fn : function pandas.DataFrame ->  list of tuple
+        The split function of the run.
+
+    train_fn : function pandas.DataFrame -> prediction_function, predictions_dataset, logs
+        The learning function of the run.
+
+    eval_fn : function pandas.DataFrame -> dict
+        The evaluation function of the run.
+
+    options :
+        Any other argument that changes the logs of the folds, like `predict_oof` or `columns`.
+
+    Returns
+    ----------
+    key : str
+        The hash of the run.
+    """
+    try:
+        data = (list(train_data.columns), [str(dtype) for dtype in train_data.dtypes],
+                pd.util.hash_pandas_object(train_data).values)
+    except TypeError:
+        # columns of unhashable values, like lists, are hashed by their pickled form
+        data = joblib.hash(train_data)
+
+    options = {k: _fn_fingerprint(v) if callable(v) else v for k, v in options.items()}
+    return joblib.hash((data, [_fn_fingerprint(fn) for fn in (split_fn, train_fn, eval_fn)], sorted(options.items())))
+
+
+def _checkpoint_path(checkpoint_folder: str, fold_num: int) -> str:
+    return os.path.join(checkpoint_folder, "fold-{0:06d}.pkl".format(fold_num))
+
+
+def load_checkpoint(checkpoint_folder: str, fold_num: int) -> Optional[LogType]:
+    """
+    Loads the log of a fold checkpointed in `checkpoint_folder`, or returns None if the fold
+    was not finished.
+    """
+    fold_path = _checkpoint_path(checkpoint_folder, fold_num)
+    return joblib.load(fold_path) if os.path.exists(fold_path) else None
+
+
+def save_checkpoint(checkpoint_folder: str, fold_num: int, log: LogType) -> None:
+    """
+    Checkpoints the log of a finished fold in `checkpoint_folder`. The log is written to a temporary
+    file that is then renamed, so an interrupted run never leaves a partially written checkpoint.
+    Logs that can't be pickled are not checkpointed.
+    """
+    os.makedirs(checkpoint_folder, exist_ok=True)
+    fold_path = _checkpoint_path(checkpoint_folder, fold_num)
+    temp_path = "{0}.{1}.{2}.tmp".format(fold_path, os.getpid(), threading.get_ident())
+    try:
+        joblib.dump(log, temp_path)
+        os.replace(temp_path, fold_path)
+    except (pickle.PicklingError, TypeError, AttributeError) as error:
+        warnings.warn("Fold {0} was not checkpointed, since its log can't be pickled: {1}".format(fold_num, error))
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+
+def checkpointed_validator_iteration(checkpoint_folder: Optional[str],
+                                     fold_num: int,
+                                     iteration_fn: Callable[..., LogType],
+                                     *args: Any) -> LogType:
+    """
+    Runs `iteration_fn(*args)` for a fold, unless its log was checkpointed in `checkpoint_folder`
+    by a previous run, checkpointing the log it returns. Runs the fold without checkpoints
+    if `checkpoint_folder` is None.
+    """
+    if checkpoint_folder is None:
+        return iteration_fn(*args)
+
+    log = load_checkpoint(checkpoint_folder, fold_num)
+    if log is None:
+        log = iteration_fn(*args)
+        save_checkpoint(checkpoint_folder, fold_num, log)
+    return log
+
+
 @curry
 def validator(train_data: pd.DataFrame,
               split_fn: SplitterFnType,
@@ -102,7 +400,13 @@ def validator(train_data: pd.DataFrame,
               return_eval_logs_on_train: bool = False,
               return_all_train_logs: bool = False,
               verbose: bool = False,
-              drop_empty_folds: bool = False) -> ValidatorReturnType:
+              drop_empty_folds: bool = False,
+              columns: Optional[List[str]] = None,
+              checkpoint_path: Optional[str] = None,
+              oof_columns: Optional[List[str]] = None,
+              oof_path: Optional[str] = None,
+              zero_copy: bool = False,
+              checkpoint_key: Optional[str] = None) -> ValidatorReturnType:
     """
     Splits the training data into folds given by the split function and performs a train-evaluation sequence on each
     fold by calling ``validator_iteration`` given the evaluation function. The output is a log containing, for each
@@ -152,6 +456,35 @@ def validator(train_data: pd.DataFrame,
     drop_empty_folds : bool
         Whether to drop empty folds from validation and allocate them into an error log
 
+    columns : list of str
+        The columns of `train_data` used by `train_fn` and `eval_fn`. If given, only these columns
+        are materialized for each fold, instead of all of them.
+
+    checkpoint_path : str
+        Folder where the log of each finished fold is checkpointed, under a key fingerprinting
+        the data, functions and options of the run (see `validator_checkpoint_key`). Rerunning the
+        same validation loads the finished folds from the checkpoints and only trains the missing ones.
+        The checkpoints are kept after the run, so remove the folder once they are no longer needed.
+        If None, folds are not checkpointed.
+
+    oof_columns : list of str
+        The columns of the out of fold predictions to keep when `predict_oof` is True, as NumPy arrays
+        aligned to the positions of the test rows. Use `assemble_oof_predictions` to get them as a single
+        DataFrame. If None, the whole DataFrame of predictions of each test set is kept.
+
+    oof_path : str
+        Folder where the compact out of fold predictions are memory-mapped, instead of kept in memory.
+        Only used with `oof_columns`.
+
+    zero_copy : bool
+        If True, contiguous folds are passed to `train_fn` and `eval_fn` as views of `train_data` instead
+        of copies, saving memory and time. Only use it with functions that don't modify their input
+        in place. See `materialize_fold`.
+
+    checkpoint_key : str
+        Identifies the run in `checkpoint_path`, instead of `validator_checkpoint_key`. Needed for
+        functions that can't be fingerprinted, and must change whenever the data, functions or options do.
+
     Returns
     ----------
     A list of log-like dictionary evaluations.
@@ -159,6 +492,14 @@ def validator(train_data: pd.DataFrame,
 
     folds, logs = split_fn(train_data)
 
+    checkpoint_folder = None
+    if checkpoint_path is not None:
+        checkpoint_folder = os.path.join(checkpoint_path, checkpoint_key or validator_checkpoint_key(
+            train_data, split_fn, train_fn, eval_fn, perturb_fn_train=perturb_fn_train,
+            perturb_fn_test=perturb_fn_test, predict_oof=predict_oof,
+            return_eval_logs_on_train=return_eval_logs_on_train, columns=columns,
+            oof_columns=oof_columns if predict_oof else None))
+
     train_fn = compose(train_fn, perturb_fn_train)
     eval_fn = compose(eval_fn, perturb_fn_test)
 
@@ -171,8 +512,10 @@ def validator(train_data: pd.DataFrame,
         if (train_fold_is_null or test_contains_null_folds) and drop_empty_folds:
             return {"empty_fold": True}
         else:
-            iter_results = validator_iteration(train_data, train_index, test_indexes, fold_num,
-                                               train_fn, eval_fn, predict_oof, return_eval_logs_on_train, verbose)
+            iter_results = checkpointed_validator_iteration(checkpoint_folder, fold_num, validator_iteration,
+                                                            train_data, train_index, test_indexes, fold_num,
+                                                            train_fn, eval_fn, predict_oof, return_eval_logs_on_train,
+                                                            verbose, columns, oof_columns, oof_path, zero_copy)
 
         return assoc(iter_results, "empty_fold", False)
 
@@ -233,10 +576,36 @@ def parallel_validator_iteration(train_data: pd.DataFrame,
                                  eval_fn: EvalFnType,
                                  predict_oof: bool,
                                  return_eval_logs_on_train: bool = False,
-                                 verbose: bool = False) -> LogType:
+                                 verbose: bool = False,
+                                 columns: Optional[List[str]] = None,
+                                 oof_columns: Optional[List[str]] = None,
+                                 oof_path: Optional[str] = None,
+                                 zero_copy: bool = False) -> LogType:
     (fold_num, (train_index, test_indexes)) = fold
     return validator_iteration(train_data, train_index, test_indexes, fold_num, train_fn, eval_fn, predict_oof,
-                               return_eval_logs_on_train, verbose)
+                               return_eval_logs_on_train, verbose, columns, oof_columns, oof_path, zero_copy)
+
+
+@lru_cache(maxsize=1)
+def _load_shared_data(data_path: str) -> pd.DataFrame:
+    # memory-maps the numeric blocks of the data, so each worker process reads it only once
+    return joblib.load(data_path, mmap_mode="r")
+
+
+def shared_parallel_validator_iteration(data_path: str,
+                                        fold: Tuple[int, Tuple[pd.Index, pd.Index]],
+                                        train_fn: LearnerFnType,
+                                        eval_fn: EvalFnType,
+                                        predict_oof: bool,
+                                        return_eval_logs_on_train: bool = False,
+                                        verbose: bool = False,
+                                        columns: Optional[List[str]] = None,
+                                        oof_columns: Optional[List[str]] = None,
+                                        oof_path: Optional[str] = None,
+                                        zero_copy: bool = False) -> LogType:
+    return parallel_validator_iteration(_load_shared_data(data_path), fold, train_fn, eval_fn, predict_oof,
+                                        return_eval_logs_on_train, verbose, columns, oof_columns, oof_path,
+                                        zero_copy)
 
 
 @curry
@@ -247,7 +616,15 @@ def parallel_validator(train_data: pd.DataFrame,
                        n_jobs: int = 1,
                        predict_oof: bool = False,
                        return_eval_logs_on_train: bool = False,
-                       verbose: bool = False) -> ValidatorReturnType:
+                       verbose: bool = False,
+                       backend: str = "threading",
+                       temp_folder: Optional[str] = None,
+                       columns: Optional[List[str]] = None,
+                       checkpoint_path: Optional[str] = None,
+                       oof_columns: Optional[List[str]] = None,
+                       oof_path: Optional[str] = None,
+                       zero_copy: bool = False,
+                       checkpoint_key: Optional[str] = None) -> ValidatorReturnType:
     """
     Splits the training data into folds given by the split function and
     performs a train-evaluation sequence on each fold. Tries to run each
@@ -285,18 +662,99 @@ def parallel_validator(train_data: pd.DataFrame,
     verbose: bool
         Whether to show more information about the cross validation or not
 
+    backend : str
+        The joblib backend used to run the folds. With the default "threading" backend
+        the folds share `train_data` directly. With a process based backend (e.g. "loky"
+        or "multiprocessing") `train_data` is dumped once to `temp_folder` and memory-mapped
+        by the workers, so it is not pickled for every fold. Prefer process based backends
+        with learners that hold the GIL, such as the pandas heavy ones.
+
+    temp_folder : str
+        Folder where `train_data` is dumped when using a process based backend.
+        If None, a temporary folder is created and removed at the end of the validation.
+
+    columns : list of str
+        The columns of `train_data` used by `train_fn` and `eval_fn`. If given, only these columns
+        are materialized for each fold, instead of all of them.
+
+    checkpoint_path : str
+        Folder where the log of each finished fold is checkpointed, as in `validator`, whose
+        checkpoints are shared with this function. Only the folds missing from the checkpoints
+        are sent to the workers, which checkpoint each fold as soon as it finishes.
+        If None, folds are not checkpointed.
+
+    oof_columns : list of str
+        The columns of the out of fold predictions to keep when `predict_oof` is True, as NumPy arrays
+        aligned to the positions of the test rows. Use `assemble_oof_predictions` to get them as a single
+        DataFrame. If None, the whole DataFrame of predictions of each test set is kept.
+
+    oof_path : str
+        Folder where the compact out of fold predictions are memory-mapped, instead of kept in memory.
+        Only used with `oof_columns`.
+
+    zero_copy : bool
+        If True, contiguous folds are passed to `train_fn` and `eval_fn` as views of `train_data` instead
+        of copies, saving memory and time. Only use it with functions that don't modify their input
+        in place. See `materialize_fold`.
+
+    checkpoint_key : str
+        Identifies the run in `checkpoint_path`, instead of `validator_checkpoint_key`. Needed for
+        functions that can't be fingerprinted, and must change whenever the data, functions or options do.
+
     Returns
     ----------
     A list log-like dictionary evaluations.
     """
     folds, logs = split_fn(train_data)
 
-    result = Parallel(n_jobs=n_jobs, backend="threading")(
-        delayed(parallel_validator_iteration)(train_data, x, train_fn, eval_fn, predict_oof, return_eval_logs_on_train,
-                                              verbose)
-        for x in enumerate(folds))
+    checkpoint_folder = None
+    if checkpoint_path is not None:
+        checkpoint_folder = os.path.join(checkpoint_path, checkpoint_key or validator_checkpoint_key(
+            train_data, split_fn, train_fn, eval_fn, perturb_fn_train=identity, perturb_fn_test=identity,
+            predict_oof=predict_oof, return_eval_logs_on_train=return_eval_logs_on_train, columns=columns,
+            oof_columns=oof_columns if predict_oof else None))
+
+    finished = {}  # type: Dict[int, LogType]
+    if checkpoint_folder is not None:
+        checkpoints = ((fold_num, load_checkpoint(checkpoint_folder, fold_num)) for fold_num in range(len(folds)))
+        finished = {fold_num: log for fold_num, log in checkpoints if log is not None}
+    missing_fold_nums = []  # type: List[int]
+
+    def missing_folds() -> Iterator[Tuple[int, Tuple[pd.Index, pd.Index]]]:
+        # lazily, so lazy folds are still built one at a time as they are dispatched
+        for fold_num, fold in enumerate(folds):
+            if fold_num not in finished:
+                missing_fold_nums.append(fold_num)
+                yield fold_num, fold
+
+    if len(finished) == len(folds):
+        missing_results = []  # type: List[LogType]
+    elif backend in ("threading", "sequential"):
+        missing_results = Parallel(n_jobs=n_jobs, backend=backend)(
+            delayed(checkpointed_validator_iteration)(checkpoint_folder, x[0], parallel_validator_iteration,
+                                                      train_data, x, train_fn, eval_fn, predict_oof,
+                                                      return_eval_logs_on_train, verbose, columns,
+                                                      oof_columns, oof_path, zero_copy)
+            for x in missing_folds())
+    else:
+        data_folder = tempfile.mkdtemp(prefix="fklearn_validator_", dir=temp_folder)
+        try:
+            data_path = os.path.join(data_folder, "train_data.pkl")
+            joblib.dump(train_data, data_path)
+            missing_results = Parallel(n_jobs=n_jobs, backend=backend)(
+                delayed(checkpointed_validator_iteration)(checkpoint_folder, x[0],
+                                                          shared_parallel_validator_iteration,
+                                                          data_path, x, train_fn, eval_fn, predict_oof,
+                                                          return_eval_logs_on_train, verbose, columns,
+                                                          oof_columns, oof_path, zero_copy)
+                for x in missing_folds())
+        finally:
+            shutil.rmtree(data_folder, ignore_errors=True)
     gc.collect()
 
+    finished.update(zip(missing_fold_nums, missing_results))
+    result = [finished[fold_num] for fold_num in range(len(folds))]
+
     train_log = {"train_log": [fold_result["train_log"] for fold_result in result]}
 
     @curry
@@ -310,3 +768,110 @@ def parallel_validator(train_data: pd.DataFrame,
                           list)
 
     return assoc(train_log, "validator_log", validator_logs)
+
+
+@curry
+def multi_validator(train_data: pd.DataFrame,
+                    split_fn: SplitterFnType,
+                    train_fns: Dict[str, LearnerFnType],
+                    eval_fn: EvalFnType,
+                    n_jobs: int = 1,
+                    backend: str = "threading",
+                    predict_oof: bool = False,
+                    return_eval_logs_on_train: bool = False,
+                    return_all_train_logs: bool = False,
+                    verbose: bool = False,
+                    columns: Optional[List[str]] = None,
+                    oof_columns: Optional[List[str]] = None,
+                    oof_path: Optional[str] = None,
+                    zero_copy: bool = False) -> Dict[str, ValidatorReturnType]:
+    """
+    Validates several candidate train functions on the same folds in one pass. The folds are
+    computed once and the train and test sets of each fold are materialized once, then shared
+    by the fits of all candidates, instead of calling `validator` once per candidate.
+
+    Parameters
+    ----------
+    train_data : pandas.DataFrame
+        A Pandas' DataFrame with training data
+
+    split_fn : function pandas.DataFrame ->  list of tuple
+        Partially defined split function that takes a dataset and returns
+        a list of folds. Each fold is a Tuple of arrays. The fist array in
+        each tuple contains training indexes while the second array
+        contains validation indexes.
+
+    train_fns : dict of str to function pandas.DataFrame -> prediction_function, predictions_dataset, logs
+        The candidate learning functions, by name. They share the data of each fold, so they
+        must not modify their input in place.
+
+    eval_fn : function pandas.DataFrame -> dict
+        A partially defined evaluation function that takes a dataset with prediction and
+        returns the evaluation logs.
+
+    n_jobs : int
+        Number of candidate fits to run in parallel. The folds are materialized as the fits are
+        dispatched, so only the data of a few folds is in memory at a time.
+
+    backend : str
+        The joblib backend used to run the fits. With the default "threading" backend the
+        candidates share the data of each fold directly, while process based backends pickle
+        it for every fit.
+
+    predict_oof : bool
+        Whether to return out of fold predictions on the logs
+
+    return_eval_logs_on_train : bool
+        Whether to apply eval_fn to the training set of each split and return the resulting logs in the train logs
+
+    return_all_train_logs : bool
+        Whether to return the train logs corresponding to all the splits or to return
+        only the train log corresponding to the first split (default behavior = only first split)
+
+    verbose : bool
+        Whether to show more information about the cross validation or not
+
+    columns : list of str
+        The columns of `train_data` used by the train functions and `eval_fn`. If given, only these
+        columns are materialized for each fold, instead of all of them.
+
+    oof_columns : list of str
+        The columns of the out of fold predictions to keep when `predict_oof` is True.
+        See `validator`.
+
+    oof_path : str
+        Folder where the compact out of fold predictions are memory-mapped. See `validator`.
+
+    zero_copy : bool
+        If True, contiguous folds are passed to `train_fn` and `eval_fn` as views of `train_data` instead
+        of copies, saving memory and time. Only use it with functions that don't modify their input
+        in place. See `materialize_fold`.
+
+    Returns
+    ----------
+    logs : dict of str to dict
+        The log of each candidate, by name, with the same structure as the log of `validator`.
+    """
+    folds, logs = split_fn(train_data)
+    names = list(train_fns)
+
+    def fold_tasks() -> Iterator:
+        for fold_num, (train_index, test_indexes) in enumerate(folds):
+            fold_train_data = materialize_fold(train_data, train_index, columns, zero_copy)
+            test_sets = [materialize_fold(train_data, test_index, columns, zero_copy) for test_index in test_indexes]
+            for name in names:
+                yield delayed(_fit_and_evaluate_fold)(fold_train_data, test_sets, test_indexes, fold_num,
+                                                      train_fns[name], eval_fn, predict_oof,
+                                                      return_eval_logs_on_train, verbose, oof_columns, oof_path)
+
+    results = Parallel(n_jobs=n_jobs, backend=backend)(fold_tasks())
+    gc.collect()
+
+    def candidate_log(fold_results: List[LogType]) -> ValidatorReturnType:
+        train_logs = [fold_result["train_log"] for fold_result in fold_results]
+        return {"train_log": train_logs if return_all_train_logs else first(train_logs),
+                "perturbator_log": {"perturbated_train": [], "perturbated_test": []},
+                "validator_log": [dict(dissoc(fold_result, "train_log"), empty_fold=False, split_log=split_log)
+                                  for split_log, fold_result in zip(logs, fold_results)]}
+
+    return {name: candidate_log(results[i::len(names)]) for i, name in enumerate(names)}
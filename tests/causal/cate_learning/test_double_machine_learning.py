@@ -2,6 +2,7 @@ from collections import Counter
 
 import pandas as pd
 import numpy as np
+import pytest
 from sklearn.ensemble import RandomForestRegressor
 
 from fklearn.causal.cate_learning.double_machine_learning import non_parametric_double_ml_learner, _cv_estimate
@@ -85,3 +86,55 @@ def test_non_parametric_double_ml_learner_curry():
 
     pd.testing.assert_frame_equal(m1_df, m1(df_train))
     pd.testing.assert_frame_equal(m2_df, m2(df_train))
+
+
+def test_non_parametric_double_ml_learner_parallel_and_reuse():
+
+    rng = np.random.RandomState(0)
+    df_train = pd.DataFrame(dict(x1=rng.normal(size=200), x2=rng.normal(size=200)))
+    df_train["t"] = df_train["x1"] + rng.normal(size=200)
+    df_train["y"] = df_train["t"] * (1 + df_train["x2"]) + df_train["x1"] + rng.normal(size=200)
+
+    fit_fn = non_parametric_double_ml_learner(feature_columns=["x1", "x2"],
+                                              treatment_column="t",
+                                              outcome_column="y",
+                                              debias_model=LinearRegression(),
+                                              denoise_model=LinearRegression(),
+                                              denoise_feature_columns=["x1"],
+                                              final_model=LinearRegression(),
+                                              cv_splits=4)
+
+    _, pred, log = fit_fn(df_train)
+    _, parallel_pred, parallel_log = fit_fn(df_train, n_jobs=2, backend="loky")
+
+    pd.testing.assert_frame_equal(parallel_pred, pred)
+    for name in ["debias_models", "denoise_models"]:
+        assert len(parallel_log[name]) == 4
+        for model, parallel_model in zip(log[name], parallel_log[name]):
+            np.testing.assert_allclose(parallel_model.coef_, model.coef_)
+
+    # the first stage of a previous fit is reused, and only the final model is fitted
+    _, rf_pred, _ = fit_fn(df_train, final_model=RandomForestRegressor(n_estimators=5, random_state=0))
+    _, reused_pred, reused_log = fit_fn(df_train, final_model=RandomForestRegressor(n_estimators=5, random_state=0),
+                                        fitted_nuisance_log=log)
+
+    pd.testing.assert_frame_equal(reused_pred, rf_pred)
+    assert reused_log["debias_models"] == log["debias_models"]
+    assert reused_log["denoise_models"] == log["denoise_models"]
+
+    # nuisance models fitted on other rows, folds, columns or features are not reused
+    swapped = df_train.rename(columns={"t": "y", "y": "t"})
+    with pytest.raises(ValueError, match="samples"):
+        fit_fn(df_train.iloc[:100], fitted_nuisance_log=log)
+    with pytest.raises(ValueError, match="folds"):
+        fit_fn(df_train, cv_splits=2, fitted_nuisance_log=log)
+    with pytest.raises(ValueError, match="treatment column"):
+        fit_fn(swapped.assign(t2=swapped["t"]), treatment_column="t2", fitted_nuisance_log=log)
+    with pytest.raises(ValueError, match="outcome column"):
+        fit_fn(swapped.assign(y2=swapped["y"]), outcome_column="y2", fitted_nuisance_log=log)
+    with pytest.raises(ValueError, match="features"):
+        fit_fn(df_train, denoise_feature_columns=["x2"], fitted_nuisance_log=log)
+    with pytest.raises(ValueError, match="data"):
+        fit_fn(df_train.sample(frac=1.0, random_state=1), fitted_nuisance_log=log)
+    with pytest.raises(ValueError, match="data"):
+        fit_fn(df_train.assign(y=df_train["y"] + 1), fitted_nuisance_log=log)
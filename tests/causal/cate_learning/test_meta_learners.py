@@ -10,13 +10,14 @@ from pandas.testing import assert_frame_equal
 from fklearn.causal.cate_learning.meta_learners import (
     TREATMENT_FEATURE, _append_treatment_feature, _create_treatment_flag,
     _filter_by_treatment, _fit_by_treatment, _get_learners, _get_model_fcn,
-    _get_unique_treatments, _predict_by_treatment_flag,
+    _get_unique_treatments, _predict_on_treatment_and_control,
     _simulate_t_learner_treatment_effect, _simulate_treatment_effect,
     causal_s_classification_learner, causal_t_classification_learner)
 from fklearn.exceptions.exceptions import (MissingControlError,
                                            MissingTreatmentError,
                                            MultipleTreatmentsError)
 from fklearn.training.classification import logistic_classification_learner
+from fklearn.training.utils import declare_columns
 from fklearn.types import LearnerFnType
 
 
@@ -250,7 +251,7 @@ def ones_or_zeros_model(df):
     return p(df)
 
 
-def test__predict_by_treatment_flag_positive():
+def test__predict_on_treatment_and_control_positive():
     df = pd.DataFrame(
         {
             "x1": [1.3, 1.0, 1.8, -0.1],
@@ -259,13 +260,12 @@ def test__predict_by_treatment_flag_positive():
         }
     )
 
-    assert (
-        _predict_by_treatment_flag(df, ones_or_zeros_model, True, "prediction")
-        == np.ones(df.shape[0])
-    ).all()
+    on_treatment, _ = _predict_on_treatment_and_control(df, ones_or_zeros_model, "prediction")
 
+    assert (on_treatment == np.ones(df.shape[0])).all()
 
-def test__predict_by_treatment_flag_negative():
+
+def test__predict_on_treatment_and_control_negative():
     df = pd.DataFrame(
         {
             "x1": [1.3, 1.0, 1.8, -0.1],
@@ -274,14 +274,32 @@ def test__predict_by_treatment_flag_negative():
         }
     )
 
-    assert (
-        _predict_by_treatment_flag(df, ones_or_zeros_model, False, "prediction")
-        == np.zeros(df.shape[0])
-    ).all()
+    _, on_control = _predict_on_treatment_and_control(df, ones_or_zeros_model, "prediction")
+
+    assert (on_control == np.zeros(df.shape[0])).all()
+
+
+def test__predict_on_treatment_and_control():
+    df = pd.DataFrame(
+        {
+            "x1": [1.3, 1.0, 1.8, -0.1],
+            "x2": [10, 4, 15, 6],
+            "target": [1, 1, 1, 0],
+        }
+    )
+    model = MagicMock(side_effect=ones_or_zeros_model)
+
+    on_treatment, on_control = _predict_on_treatment_and_control(df, model, "prediction")
+
+    assert (on_treatment == np.ones(df.shape[0])).all()
+    assert (on_control == np.zeros(df.shape[0])).all()
+    # both scenarios are scored in a single call, without changing the input
+    model.assert_called_once()
+    assert TREATMENT_FEATURE not in df.columns
 
 
-@patch("fklearn.causal.cate_learning.meta_learners._predict_by_treatment_flag")
-def test__simulate_treatment_effect(mock_predict_by_treatment_flag):
+@patch("fklearn.causal.cate_learning.meta_learners._predict_on_treatment_and_control")
+def test__simulate_treatment_effect(mock_predict_on_treatment_and_control):
     df = pd.DataFrame(
         {
             "x1": [1.3, 1.0, 1.8, -0.1],
@@ -318,17 +336,13 @@ def test__simulate_treatment_effect(mock_predict_by_treatment_flag):
 
     # This test will score the model for all treatments available and for all treatment-control pairs. In this test,
     # since we have control and treatment for treatments A and B, we expect to have 4 model outputs - two for each
-    # treatment. The output of the following data will be used to calculate the uplift.
-
-    mock_predict_by_treatment_flag.side_effect = [
-        [0.3, 0.3, 0.0, 1.0],
-        # treatment = A, apply treatment = 1
-        [0.2, 0.5, 0.3, 0.0],
-        # treatment = A, apply treatment = 0
-        [0.6, 0.7, 0.0, 1.0],
-        # treatment = B, apply treatment = 1
-        [1.0, 0.5, 1.0, 1.0]
-        # treatment = B, apply treatment = 0
+    # treatment, scored together. The output of the following data will be used to calculate the uplift.
+
+    mock_predict_on_treatment_and_control.side_effect = [
+        # treatment = A, apply treatment = 1 and treatment = 0
+        (np.array([0.3, 0.3, 0.0, 1.0]), np.array([0.2, 0.5, 0.3, 0.0])),
+        # treatment = B, apply treatment = 1 and treatment = 0
+        (np.array([0.6, 0.7, 0.0, 1.0]), np.array([1.0, 0.5, 1.0, 1.0])),
     ]
 
     learners = {
@@ -347,6 +361,54 @@ def test__simulate_treatment_effect(mock_predict_by_treatment_flag):
     assert_frame_equal(results, expected)
 
 
+def test__predict_on_treatment_and_control_declared_columns():
+    df = pd.DataFrame(
+        {
+            "x1": [1.3, 1.0, 1.8, -0.1],
+            "x2": [10, 4, 15, 6],
+            "target": [1, 1, 1, 0],
+        }
+    )
+    scored_columns = []
+
+    def declared_model(new_df):
+        scored_columns.append(list(new_df.columns))
+        return ones_or_zeros_model(new_df)
+
+    declare_columns(declared_model, reads=["x1", TREATMENT_FEATURE], writes=["prediction"])
+    on_treatment, on_control = _predict_on_treatment_and_control(df, declared_model, "prediction")
+
+    # only the columns the model declares it reads are stacked
+    assert scored_columns == [["x1", TREATMENT_FEATURE]]
+    assert (on_treatment == np.ones(df.shape[0])).all()
+    assert (on_control == np.zeros(df.shape[0])).all()
+
+
+@pytest.mark.parametrize("declared", [True, False])
+def test_causal_s_classification_learner_transformers_read_other_columns(base_input_df, declared):
+    # a transformer that reads a column that is not a feature of the learner
+    def segment_transformer(df):
+        def p(new_df):
+            return new_df.assign(segment_prediction=new_df["prediction"] * new_df["segment"])
+
+        if declared:
+            declare_columns(p, reads=["prediction", "segment"], writes=["segment_prediction"])
+        return p, p(df), {"segment_transformer": {}}
+
+    df = base_input_df.assign(segment=[1, 2, 1, 2, 1, 2, 1, 2, 1])
+    p, result, _ = causal_s_classification_learner(
+        df,
+        treatment_col="treatment",
+        control_name="control",
+        prediction_column="segment_prediction",
+        learner=logistic_classification_learner(target="target", features=["x1", "x2"]),
+        learner_transformers=[segment_transformer],
+    )
+
+    assert_frame_equal(p(df), result)
+    assert (result["uplift"] == result[["treatment_A__uplift", "treatment_B__uplift"]].max(axis=1)).all()
+
+
 @patch("fklearn.causal.cate_learning.meta_learners._simulate_treatment_effect")
 @patch("fklearn.causal.cate_learning.meta_learners._fit_by_treatment")
 @patch("fklearn.causal.cate_learning.meta_learners._get_unique_treatments")
@@ -564,3 +626,39 @@ def test_causal_t_classification_learner(
     mock_get_unique_treatments.assert_called()
     mock_get_learners.assert_called()
     mock_simulate_t_learner_treatment_effect.assert_called()
+
+
+@pytest.mark.parametrize("backend", ["threading", "loky"])
+@pytest.mark.parametrize(
+    "causal_learner", [causal_s_classification_learner, causal_t_classification_learner]
+)
+def test_causal_learners_parallel_fit(causal_learner, backend, base_input_df):
+    learner = logistic_classification_learner(
+        features=["x1", "x2"], target="target", params={"max_iter": 10}
+    )
+
+    p, result, log = causal_learner(
+        base_input_df,
+        treatment_col="treatment",
+        control_name="control",
+        prediction_column="prediction",
+        learner=learner,
+    )
+    parallel_p, parallel_result, parallel_log = causal_learner(
+        base_input_df,
+        treatment_col="treatment",
+        control_name="control",
+        prediction_column="prediction",
+        learner=learner,
+        n_jobs=2,
+        backend=backend,
+    )
+
+    assert_frame_equal(parallel_result, result)
+    assert_frame_equal(parallel_p(base_input_df), p(base_input_df))
+    learner_log = log[causal_learner.__name__]
+    parallel_learner_log = parallel_log[causal_learner.__name__]
+    assert list(parallel_learner_log) == list(learner_log)
+    for treatment in ["A", "B"]:
+        assert parallel_learner_log[treatment]["logistic_classification_learner"]["training_samples"] == \
+            learner_log[treatment]["logistic_classification_learner"]["training_samples"]
@@ -0,0 +1,32 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.linear_model import LinearRegression
+from sklearn.model_selection import cross_val_predict
+
+from fklearn.causal.cross_fitting import cross_fit
+
+
+def test_cross_fit():
+    rng = np.random.RandomState(0)
+    df = pd.DataFrame(dict(x1=rng.normal(size=60), x2=rng.normal(size=60)), index=rng.permutation(60))
+    df["t"] = df["x1"] + rng.normal(size=60)
+    df["y"] = df["x1"] + df["x2"] + rng.normal(size=60)
+
+    nuisances = {"t_model": (LinearRegression(), ["x1"], "t"), "y_model": (LinearRegression(), ["x1", "x2"], "y")}
+    cv_preds, models = cross_fit(df, nuisances, 3)
+
+    for name, (model, features, y) in nuisances.items():
+        np.testing.assert_allclose(cv_preds[name].values, cross_val_predict(model, df[features], df[y], cv=3))
+        assert (cv_preds[name].index == df.index).all()
+        assert len(models[name]) == 3
+
+    # the fitted models are only predicted when they are reused
+    reused_preds, reused_models = cross_fit(df, nuisances, 3, n_jobs=2, fitted_models={"t_model": models["t_model"]})
+
+    assert reused_models["t_model"] == models["t_model"]
+    for name in nuisances:
+        pd.testing.assert_series_equal(reused_preds[name], cv_preds[name])
+
+    with pytest.raises(ValueError):
+        cross_fit(df, nuisances, 4, fitted_models={"t_model": models["t_model"]})
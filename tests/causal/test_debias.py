@@ -116,3 +116,8 @@ def test_debias_with_double_ml():
     result2 = debias_with_double_ml(df, "t", "y", ["x"], suffix="_d", denoise=False).round(3)
 
     pd.testing.assert_frame_equal(expected.drop(columns=["y_d"]), result2)
+
+    result3 = debias_with_double_ml(df, "t", "y", ["x"], suffix="_d", cv=3, n_jobs=2).round(3)
+    expected3 = debias_with_double_ml(df, "t", "y", ["x"], suffix="_d", cv=3).round(3)
+
+    pd.testing.assert_frame_equal(expected3, result3)
@@ -1,8 +1,10 @@
+import numpy as np
 import pandas as pd
 
 from fklearn.causal.effects import linear_effect
 from fklearn.causal.validation.auc import (area_under_the_cumulative_gain_curve, area_under_the_cumulative_effect_curve,
-                                           area_under_the_relative_cumulative_gain_curve)
+                                           area_under_the_relative_cumulative_gain_curve,
+                                           bootstrap_areas_under_the_curves)
 
 
 def test_area_under_the_cumulative_effect_curve():
@@ -42,3 +44,21 @@ def test_area_under_the_relative_cumulative_gain_curve():
     result = area_under_the_relative_cumulative_gain_curve(df, prediction="x", outcome="y", treatment="t", min_rows=3,
                                                            steps=df.shape[0], effect_fn=linear_effect)
     assert round(result, 3) == 0.344
+
+
+def test_bootstrap_areas_under_the_curves():
+    rng = np.random.RandomState(42)
+    size = 1000
+    df = pd.DataFrame(dict(t=rng.randint(0, 3, size), x=rng.normal(size=size)))
+    df["y"] = rng.normal(size=size) + df["t"] * (1 + df["x"])
+
+    result = bootstrap_areas_under_the_curves(df, prediction="x", outcome="y", treatment="t", min_rows=50,
+                                              steps=20, n_bootstraps=200, random_state=0)
+
+    area_fns = [area_under_the_cumulative_effect_curve, area_under_the_cumulative_gain_curve,
+                area_under_the_relative_cumulative_gain_curve]
+    assert result.index.tolist() == [area_fn.__name__ for area_fn in area_fns]
+    for area_fn in area_fns:
+        area = area_fn(df, prediction="x", outcome="y", treatment="t", min_rows=50, steps=20)
+        assert result.loc[area_fn.__name__, "area"] == area
+        assert result.loc[area_fn.__name__, "lower"] < area < result.loc[area_fn.__name__, "upper"]
@@ -1,9 +1,11 @@
 import numpy as np
 import pandas as pd
+import pytest
 
 from fklearn.causal.effects import linear_effect
 from fklearn.causal.validation.curves import (effect_by_segment, cumulative_effect_curve, cumulative_gain_curve,
-                                              relative_cumulative_gain_curve, effect_curves)
+                                              relative_cumulative_gain_curve, effect_curves, bootstrap_effect_curves,
+                                              _weighted_cumulative_linear_effect)
 
 
 def test_effect_by_segment():
@@ -89,3 +91,81 @@ def test_effect_curves():
                            effect_fn=linear_effect)
 
     pd.testing.assert_frame_equal(result, expected, atol=1e-07)
+
+
+def test_cumulative_effect_curve_prefix_sums():
+    rng = np.random.RandomState(42)
+    size = 500
+    df = pd.DataFrame(dict(
+        t=rng.randint(0, 3, size),
+        x=rng.randint(0, 20, size),
+        y=rng.normal(size=size) + 100.,
+    ), index=rng.permutation(size))
+    df["y"] += 2 * df["t"]
+    # the treatment is constant in the first rows and some rows have no treatment or outcome
+    df.loc[df["x"] == 19, "t"] = 1
+    df.loc[df.sample(20, random_state=1).index, "y"] = np.nan
+    df["t"] = df["t"].astype(float)
+    df.loc[df.sample(20, random_state=2).index, "t"] = np.nan
+
+    def generic_linear_effect(df, treatment_column, outcome_column):
+        return linear_effect(df, treatment_column, outcome_column)
+
+    for min_rows, steps in [(1, 100), (2, size), (30, 7)]:
+        result = cumulative_effect_curve(df, prediction="x", outcome="y", treatment="t", min_rows=min_rows,
+                                         steps=steps)
+        expected = cumulative_effect_curve(df, prediction="x", outcome="y", treatment="t", min_rows=min_rows,
+                                           steps=steps, effect_fn=generic_linear_effect)
+
+        np.testing.assert_allclose(result, expected, rtol=1e-9, atol=1e-12)
+        assert np.isnan(result[0]) == np.isnan(expected[0])
+
+
+def test_weighted_cumulative_linear_effect():
+    rng = np.random.RandomState(3)
+    size = 200
+    df = pd.DataFrame(dict(t=rng.randint(0, 3, size).astype(float), y=rng.normal(size=size)))
+    df["y"] += df["t"]
+    df.loc[[0, 1, 50], "t"] = np.nan
+    df.loc[[2, 60], "y"] = np.nan
+    weights = rng.poisson(1.0, (4, size)).astype(float)
+    prefix = np.array([9, 99, size - 1])
+
+    result = _weighted_cumulative_linear_effect(df["t"].to_numpy(), df["y"].to_numpy(), prefix, weights)
+
+    # each row counts as many times as its weight, like a resample with repeated rows
+    expected = [[linear_effect(df.head(p + 1).loc[np.repeat(np.arange(p + 1), w[:p + 1].astype(int))], "t", "y")
+                 for p in prefix] for w in weights]
+    np.testing.assert_allclose(result, expected, rtol=1e-9)
+
+
+def test_bootstrap_effect_curves():
+    rng = np.random.RandomState(42)
+    size = 1000
+    df = pd.DataFrame(dict(t=rng.randint(0, 3, size), x=rng.normal(size=size)))
+    df["y"] = rng.normal(size=size) + df["t"] * (1 + df["x"])
+
+    result = bootstrap_effect_curves(df, prediction="x", outcome="y", treatment="t", min_rows=50, steps=20,
+                                     n_bootstraps=100, random_state=0)
+
+    curves = ["cumulative_effect_curve", "cumulative_gain_curve", "relative_cumulative_gain_curve"]
+    expected = effect_curves(df, prediction="x", outcome="y", treatment="t", min_rows=50, steps=20)
+    pd.testing.assert_frame_equal(result[expected.columns], expected)
+    for curve in curves:
+        assert (result[f"{curve}_lower"] <= result[f"{curve}_upper"]).all()
+        assert (result[f"{curve}_lower"] < result[curve]).mean() > 0.9
+        assert (result[f"{curve}_upper"] > result[curve]).mean() > 0.9
+    # the whole sample is in every resample
+    np.testing.assert_allclose(result["relative_cumulative_gain_curve_lower"].iloc[-1], 0, atol=1e-12)
+
+    # the resamples don't depend on how they are chunked
+    for resampling in ["poisson", "multinomial"]:
+        chunked = bootstrap_effect_curves(df, prediction="x", outcome="y", treatment="t", min_rows=50, steps=20,
+                                          n_bootstraps=20, resampling=resampling, random_state=1)
+        parallel = bootstrap_effect_curves(df, prediction="x", outcome="y", treatment="t", min_rows=50, steps=20,
+                                           n_bootstraps=20, resampling=resampling, random_state=1,
+                                           max_bytes=100000, n_jobs=2)
+        pd.testing.assert_frame_equal(chunked, parallel)
+
+    with pytest.raises(ValueError):
+        bootstrap_effect_curves(df, prediction="x", outcome="y", treatment="t", resampling="jackknife")
@@ -4,10 +4,13 @@ import numpy as np
 import pandas as pd
 import pytest
 from sklearn.datasets import load_boston
+from toolz import curry
 
 from fklearn.data.datasets import make_tutorial_data
 from fklearn.metrics.pd_extractors import (combined_evaluator_extractor,
                                            evaluator_extractor, extract,
+                                           extract_lc, extract_tuning,
+                                           learning_curve_evaluator_extractor, repeat_split_log,
                                            split_evaluator_extractor,
                                            split_evaluator_extractor_iteration,
                                            temporal_split_evaluator_extractor)
@@ -211,6 +214,11 @@ def test_extract():
         time_col='time', time_format='%Y', base_extractor=base_extractors)
 
     assert extract(cv_results, base_extractors).shape == (5, 9)
+    assert_same_frame(extract(cv_results, splitter_extractor),
+                      _concat_extract(cv_results, _concat_split_evaluator_extractor(
+                          split_col='RAD', split_values=[4.0, 5.0, 24.0],
+                          base_extractor=_concat_combined_evaluator_extractor(
+                              base_extractors=base_extractors.keywords["base_extractors"]))))
     assert extract(cv_results, splitter_extractor).shape == (15, 10)
 
     assert extract(tlc_results, base_extractors).shape == (12, 9)
@@ -226,3 +234,126 @@ def test_extract():
     n_time_year_folds = len(df['time'].dt.strftime('%Y').unique())
     assert temporal_week_splitter_extractor(temporal_week_results).shape == (n_time_week_folds, 3)
     assert temporal_year_splitter_extractor(temporal_year_results).shape == (n_time_year_folds, 3)
+
+
+# the extractors concatenating one DataFrame per evaluation, which the records extraction must reproduce
+@curry
+def _concat_combined_evaluator_extractor(result, base_extractors):
+    return pd.concat([x(result) for x in base_extractors], axis=1)
+
+
+@curry
+def _concat_split_evaluator_extractor(result, split_col, split_values, base_extractor, eval_name=None):
+    if eval_name is None:
+        eval_name = 'split_evaluator__' + split_col
+
+    return pd.concat([base_extractor(result.get(eval_name + '_' + str(split_value), {}))
+                      .assign(**{eval_name: split_value})
+                      for split_value in split_values])
+
+
+@curry
+def _concat_extract(validator_results, extractor):
+    def extract_base_iteration(result):
+        extracted_results = pd.concat(list(map(extractor, result['eval_results'])))
+        repeat_fn = repeat_split_log(results_len=len(extracted_results))
+        assignments = {k: repeat_fn(result['split_log'][k]) for k in result['split_log'].keys()}
+        return extracted_results.assign(fold_num=result['fold_num']).assign(**assignments)
+
+    return pd.concat(list(map(extract_base_iteration, validator_results)))
+
+
+@curry
+def _concat_extract_tuning(tuning_log, base_extractor, model_learner_name):
+    return pd.concat([base_extractor(iteration["validator_log"])
+                      .assign(**iteration["train_log"][model_learner_name]["parameters"])
+                      for iteration in tuning_log])
+
+
+def assert_same_frame(actual, expected):
+    pd.testing.assert_frame_equal(actual, expected, check_exact=True)
+    assert type(actual.index) is type(expected.index)  # noqa: E721
+    assert list(actual.dtypes) == list(expected.dtypes)
+
+
+def _validator_log(metric_values, split_log_values, n_folds=4):
+    eval_results = [
+        {"metric__a": v, "split_evaluator__g_x": {"metric__b": v}, "split_evaluator__g_y": {}}
+        for v in metric_values
+    ]
+    return [{"fold_num": fold,
+             "split_log": {"train_size": 10 * fold, "test_size": [3] * len(eval_results[fold % 2:]),
+                           "start": split_log_values[fold % len(split_log_values)]},
+             "eval_results": eval_results[fold % 2:]}
+            for fold in range(n_folds)]
+
+
+@pytest.mark.parametrize("metric_values, split_log_values", [
+    ([0.5, 0.75, 1.0], [1, 2]),
+    ([1, 2, 3], [pd.Timestamp("2020-01-01"), pd.Timestamp("2020-02-01")]),
+    ([0.5, np.nan, 1], ["a", "b"]),
+    ([True, False, True], [1.5, 2]),
+    ([True, 1, 0.5], ["a", 1]),
+    ([np.float64(0.5), np.int64(1), "x"], [True, np.bool_(False)]),
+    ([np.float32(0.5), np.float32(1.0), np.float32(2.0)], [1, 2]),
+    ([None, 0.5, 1.0], [pd.Timestamp("2020-01-01"), 2]),
+    ([0.5, 0.75, 1.0], [pd.Timestamp("2020-01-01", tz="UTC"), pd.NaT]),
+])
+def test_extract_same_as_concat(metric_values, split_log_values):
+    logs = _validator_log(metric_values, split_log_values)
+
+    def extractors(combined, split):
+        base = combined(base_extractors=[evaluator_extractor(evaluator_name="metric__a"),
+                                         evaluator_extractor(evaluator_name="split_evaluator__g_y")])
+        return [
+            base,
+            split(split_col="g", split_values=["x", "y", "z"],
+                  base_extractor=evaluator_extractor(evaluator_name="metric__b")),
+            combined(base_extractors=[base, split(split_col="g", split_values=["x"],
+                                                  base_extractor=evaluator_extractor(evaluator_name="metric__b"))]),
+        ]
+
+    for bulk, concat in zip(extractors(combined_evaluator_extractor, split_evaluator_extractor),
+                            extractors(_concat_combined_evaluator_extractor, _concat_split_evaluator_extractor)):
+        assert_same_frame(extract(logs, bulk), _concat_extract(logs, concat))
+
+    # columns some folds don't have are filled with NaN
+    partial_logs = [dict(log, split_log={"only_" + str(log["fold_num"]): v})
+                    for log, v in zip(logs, split_log_values * 2)]
+    extractor = evaluator_extractor(evaluator_name="metric__a")
+    assert_same_frame(extract(partial_logs, extractor), _concat_extract(partial_logs, extractor))
+
+
+def test_extract_tuning_same_as_concat():
+    logs = _validator_log([0.5, 0.75, 1.0], [1, 2])
+    lc_logs = [dict(log, eval_results=[dict(r, lc_period_end=pd.Timestamp("2020-01-01") + timedelta(days=i))
+                                       for i, r in enumerate(log["eval_results"])])
+               for log in logs]
+    extractor = evaluator_extractor(evaluator_name="metric__a")
+
+    for parameters in [{"learning_rate": 0.1, "num_estimators": 10},
+                       {"learning_rate": 0.1, "max_depth": None, "objective": "binary"},
+                       {"learning_rate": np.float32(0.1)}]:
+        tuning_log = [{"validator_log": lc_logs[:i + 1],
+                       "train_log": {"learner": {"parameters": dict(parameters, seed=i)}}}
+                      for i in range(4)]
+        bulk = extract_tuning(tuning_log, extract_lc(extractor=extractor), "learner")
+        concat = _concat_extract_tuning(tuning_log, _concat_extract(
+            extractor=learning_curve_evaluator_extractor(base_extractor=extractor)), "learner")
+        assert_same_frame(bulk, concat)
+
+    with pytest.raises(ValueError, match="No objects to concatenate"):
+        extract([], extractor)
+
+
+def test_extract_does_not_swallow_errors():
+    logs = _validator_log([0.5, 0.75, 1.0], [1, 2])
+    calls = []
+
+    def failing_extractor(result):
+        calls.append(result)
+        raise TypeError("failing extractor")
+
+    with pytest.raises(TypeError, match="failing extractor"):
+        extract(logs, combined_evaluator_extractor(base_extractors=[failing_extractor]))
+    assert len(calls) == 1
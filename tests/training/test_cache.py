@@ -0,0 +1,103 @@
+import pandas as pd
+import pytest
+
+from fklearn.training.cache import DiskStepCache, InMemoryStepCache, fit_step, step_fingerprint
+from fklearn.training.imputation import placeholder_imputer
+from fklearn.training.pipeline import build_pipeline
+from fklearn.training.regression import linear_regression_learner
+from fklearn.training.transformation import capper, custom_transformer
+
+
+@pytest.fixture
+def train_df():
+    return pd.DataFrame({
+        'x1': [10.0, 13.0, 10.0, 13.0, None, 13.0],
+        "x2": [0, 1, 1, 0, 1, 0],
+        'y': [2.3, 4.0, 100.0, -3.9, 100.0, -3.9]
+    })
+
+
+def test_step_fingerprint(train_df):
+    imputer = placeholder_imputer(columns_to_impute=["x1"], placeholder_value=-999)
+
+    assert step_fingerprint(imputer, train_df) == step_fingerprint(imputer, train_df.copy())
+    assert step_fingerprint(imputer, train_df) != step_fingerprint(imputer, train_df.assign(x2=1))
+    assert step_fingerprint(imputer, train_df) != step_fingerprint(
+        placeholder_imputer(columns_to_impute=["x1"], placeholder_value=-1), train_df)
+    assert step_fingerprint(capper(columns_to_cap=["x1"]), train_df) is not None
+
+    assert step_fingerprint(custom_transformer(columns_to_transform=["x1"],
+                                               transformation_function=lambda x: x), train_df) is None
+
+    def local_learner(df):
+        return lambda new_df: new_df, df, {}
+
+    assert step_fingerprint(local_learner, train_df) is None
+
+
+@pytest.mark.parametrize("make_cache", [lambda path: InMemoryStepCache(max_entries=2),
+                                        lambda path: DiskStepCache(str(path), max_entries=2)])
+def test_fit_step(train_df, tmp_path, make_cache):
+    cache = make_cache(tmp_path)
+    imputer = placeholder_imputer(columns_to_impute=["x1"], placeholder_value=-999)
+
+    (predict_fn, new_df, log), status = fit_step(imputer, train_df, cache)
+    assert status == "miss"
+
+    (cached_predict_fn, cached_df, cached_log), status = fit_step(imputer, train_df, cache)
+    assert status == "hit"
+    pd.testing.assert_frame_equal(cached_df, new_df)
+    pd.testing.assert_frame_equal(cached_predict_fn(train_df), predict_fn(train_df))
+    assert cached_log.keys() == log.keys()
+
+    for placeholder_value in [-1, -2]:
+        fit_step(placeholder_imputer(columns_to_impute=["x1"], placeholder_value=placeholder_value), train_df, cache)
+
+    stats = cache.stats()
+    assert {k: stats[k] for k in ["hits", "misses", "evictions", "entries"]} == \
+        {"hits": 1, "misses": 3, "evictions": 1, "entries": 2}
+    assert stats["bytes"] > 0
+    assert fit_step(imputer, train_df, cache)[1] == "miss"
+
+
+@pytest.mark.parametrize("make_cache", [lambda path, max_bytes: InMemoryStepCache(max_bytes=max_bytes),
+                                        lambda path, max_bytes: DiskStepCache(str(path), max_bytes=max_bytes)])
+def test_fit_step_max_bytes(train_df, tmp_path, make_cache):
+    one_step = make_cache(tmp_path / "one_step", 2 ** 30)
+    fit_step(placeholder_imputer(columns_to_impute=["x1"], placeholder_value=-999), train_df, one_step)
+    step_bytes = one_step.stats()["bytes"]
+
+    cache = make_cache(tmp_path / "cache", int(step_bytes * 2.5))
+    for placeholder_value in [-1, -2, -3, -4]:
+        fit_step(placeholder_imputer(columns_to_impute=["x1"], placeholder_value=placeholder_value), train_df, cache)
+
+    stats = cache.stats()
+    assert stats["entries"] == 2
+    assert stats["evictions"] == 2
+    assert stats["bytes"] <= cache.max_bytes
+    assert fit_step(placeholder_imputer(columns_to_impute=["x1"], placeholder_value=-4), train_df, cache)[1] == "hit"
+    assert fit_step(placeholder_imputer(columns_to_impute=["x1"], placeholder_value=-1), train_df, cache)[1] == "miss"
+
+    too_small = make_cache(tmp_path / "too_small", 1)
+    fit_step(placeholder_imputer(columns_to_impute=["x1"], placeholder_value=-1), train_df, too_small)
+    assert too_small.stats()["entries"] == 0
+
+
+def test_build_pipeline_cache(train_df):
+    cache = InMemoryStepCache()
+
+    def train_fn(features):
+        return build_pipeline(placeholder_imputer(columns_to_impute=["x1"], placeholder_value=-999),
+                              capper(columns_to_cap=["x1"]),
+                              linear_regression_learner(features=features, target="y"),
+                              cache=cache)
+
+    _, pred_train, log = train_fn(["x1", "x2"])(train_df)
+    assert log["__fkml__"]["cache"] == {"hits": 0, "misses": 3, "uncacheable": 0}
+
+    predict_fn, cached_pred_train, cached_log = train_fn(["x1"])(train_df)
+    assert cached_log["__fkml__"]["cache"] == {"hits": 2, "misses": 1, "uncacheable": 0}
+    pd.testing.assert_frame_equal(cached_pred_train, train_fn(["x1"])(train_df)[1])
+    assert list(cached_log["__fkml__"]["learners"]) == ["placeholder_imputer", "capper",
+                                                        "linear_regression_learner"]
+    assert "obj" not in cached_log["__fkml__"]["learners"]["placeholder_imputer"]["log"]
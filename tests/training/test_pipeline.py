@@ -1,4 +1,5 @@
 import itertools
+import tracemalloc
 
 import numpy as np
 import pandas as pd
@@ -6,9 +7,17 @@ import pytest
 import toolz as fp
 
 from fklearn.training.imputation import placeholder_imputer
-from fklearn.training.pipeline import build_pipeline
+from fklearn.training.pipeline import (build_pipeline, predict_latency_percentiles, read_chunks,
+                                       resumable_predict_fn, stream_predict, write_chunks)
 from fklearn.training.regression import xgb_regression_learner
-from fklearn.training.transformation import count_categorizer, onehot_categorizer
+from fklearn.training.transformation import count_categorizer, discrete_ecdfer, ecdfer, onehot_categorizer
+from fklearn.training.utils import declare_columns
+
+try:
+    import pyarrow  # noqa: F401
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
 
 
 @pytest.mark.parametrize("has_repeated_learners", [False, True])
@@ -164,6 +173,10 @@ def test_build_pipeline_serialisation():
     fkml = {"pipeline": ["dummy_learner", "dummy_learner_2", "dummy_learner_3"],
             "output_columns": ['id', 'x1', 'y'],
             "features": ['id', 'x1', 'y'],
+            "column_lineage": [{"learner": "dummy_learner", "reads": None, "writes": []},
+                               {"learner": "dummy_learner_2", "reads": None, "writes": []},
+                               {"learner": "dummy_learner_3", "reads": None, "writes": []}],
+            "required_columns": None,
             "learners": {"dummy_learner": {"fn": fn, "log": {"dummy_learner_1": {}}},
                          "dummy_learner_2": {"fn": fn, "log": {"dummy_learner_2": {}}},
                          "dummy_learner_3": {"fn": fn, "log": {"dummy_learner_3": {}}, "obj": "a"}}}
@@ -240,6 +253,10 @@ def test_build_pipeline_repeated_learners_serialisation():
     fkml = {"pipeline": ["dummy_learner", "dummy_learner_2", "dummy_learner"],
             "output_columns": ['id', 'x1', 'y'],
             "features": ['id', 'x1', 'y'],
+            "column_lineage": [{"learner": "dummy_learner", "reads": None, "writes": []},
+                               {"learner": "dummy_learner_2", "reads": None, "writes": []},
+                               {"learner": "dummy_learner", "reads": None, "writes": []}],
+            "required_columns": None,
             "learners": {
                 "dummy_learner": [
                     {"fn": fn, "log": {"dummy_learner_1": {}}},
@@ -248,3 +265,271 @@ def test_build_pipeline_repeated_learners_serialisation():
 
     assert log["__fkml__"] == fkml
     assert "obj" not in log.keys()
+
+
+def test_build_pipeline_predict_kwargs_routing():
+    test_df = pd.DataFrame({"x": [1, 2, 3], "y": [2, 4, 6]})
+
+    def learner_x(df):
+        def p(dataset, mult=1, add=0):
+            return dataset.assign(x=dataset.x * mult + add)
+
+        return p, p(df), {}
+
+    def learner_y(df):
+        def p(dataset, mult=1):
+            return dataset.assign(y=dataset.y * mult)
+
+        return p, p(df), {}
+
+    predict_fn, _, _ = build_pipeline(learner_x, learner_y)(test_df)
+
+    expected_df = pd.DataFrame({"x": [3, 5, 7], "y": [4, 8, 12]})
+
+    pd.util.testing.assert_frame_equal(predict_fn(test_df, mult=2, add=1, unused=3), expected_df)
+    pd.util.testing.assert_frame_equal(predict_fn(test_df), test_df)
+
+
+def test_build_pipeline_instrument_predict():
+    test_df = pd.DataFrame({"x": [1, 2, 3], "y": [2, 4, 6]})
+
+    def dummy_learner(df):
+        return lambda dataset: dataset, df, {"dummy_learner": {}}
+
+    def kwargs_learner(df):
+        def p(dataset, mult=2):
+            return dataset.assign(x=dataset.x * mult)
+
+        return p, p(df), {"kwargs_learner": {}}
+
+    predict_fn, _, _ = build_pipeline(dummy_learner, kwargs_learner, instrument_predict=True)(test_df)
+
+    for _ in range(5):
+        predict_fn(test_df, mult=3)
+
+    latencies = predict_latency_percentiles(predict_fn, percentiles=(50, 99))
+
+    assert list(latencies.columns) == ["step", "calls", "p50", "p99"]
+    assert list(latencies["step"]) == ["dummy_learner", "kwargs_learner"]
+    assert list(latencies["calls"]) == [5, 5]
+    assert (latencies["p99"] >= latencies["p50"]).all()
+
+    not_instrumented_fn, _, _ = build_pipeline(dummy_learner)(test_df)
+
+    with pytest.raises(ValueError):
+        predict_latency_percentiles(not_instrumented_fn)
+
+
+def test_build_pipeline_prune_columns():
+    df_train = pd.DataFrame({
+        'id': ["id1", "id2", "id3", "id4", "id3", "id4"],
+        'x1': [10.0, 13.0, 10.0, 13.0, None, 13.0],
+        "x2": [0, 1, 1, 0, 1, 0],
+        "cat": ["c1", "c1", "c2", None, "c2", "c4"],
+        "unused": [1, 2, 3, 4, 5, 6],
+        'y': [2.3, 4.0, 100.0, -3.9, 100.0, -3.9]
+    })
+
+    df_test = df_train.assign(x1=[12.0, 1000.0, -4.0, 0.0, -4.0, 0.0])
+
+    learners = [placeholder_imputer(columns_to_impute=["x1", "x2"], placeholder_value=-999),
+                onehot_categorizer(columns_to_categorize=["cat"], hardcode_nans=True),
+                xgb_regression_learner(features=["x1", "x2", "cat"], target="y",
+                                       num_estimators=20, extra_params={"seed": 42})]
+
+    predict_fn, _, log = build_pipeline(*learners)(df_train)
+    pruned_predict_fn, _, pruned_log = build_pipeline(*learners, prune_columns=True, keep_columns=["id"])(df_train)
+
+    lineage = pruned_log["__fkml__"]["column_lineage"]
+    assert [step["learner"] for step in lineage] == ["placeholder_imputer", "onehot_categorizer",
+                                                     "xgb_regression_learner"]
+    assert lineage[0] == {"learner": "placeholder_imputer", "reads": ["x1", "x2"], "writes": ["x1", "x2"]}
+    assert set(lineage[1]["writes"]) == {"fklearn_feat__cat==c1", "fklearn_feat__cat==c2",
+                                         "fklearn_feat__cat==c4", "fklearn_feat__cat==nan"}
+    assert lineage[2]["writes"] == ["prediction"]
+    assert pruned_log["__fkml__"]["required_columns"] == ["x1", "x2", "cat"]
+
+    pred_test = predict_fn(df_test)
+    pruned_pred_test = pruned_predict_fn(df_test)
+
+    assert list(pruned_pred_test.columns) == ["x1", "x2", "id", "fklearn_feat__cat==c1", "fklearn_feat__cat==c2",
+                                              "fklearn_feat__cat==c4", "fklearn_feat__cat==nan", "prediction"]
+    pd.util.testing.assert_frame_equal(pruned_pred_test, pred_test[pruned_pred_test.columns])
+    pd.util.testing.assert_frame_equal(pruned_predict_fn(df_test.drop(columns=["unused", "y"])), pruned_pred_test)
+
+    def undeclared_learner(df):
+        return lambda dataset: dataset, df, {}
+
+    with pytest.warns(UserWarning):
+        not_pruned_predict_fn, _, not_pruned_log = build_pipeline(undeclared_learner, prune_columns=True)(df_train)
+
+    assert not_pruned_log["__fkml__"]["required_columns"] is None
+    pd.util.testing.assert_frame_equal(not_pruned_predict_fn(df_train), df_train)
+
+
+@pytest.mark.parametrize("n_jobs", [1, 2])
+def test_stream_predict(tmp_path, n_jobs):
+    df_train = pd.DataFrame({
+        'x1': np.linspace(0, 10, 40),
+        "x2": np.tile([0, 1, 1, 0], 10),
+        'y': np.linspace(0, 10, 40) * 2 + np.tile([0.5, -0.5], 20)
+    })
+
+    df_test = pd.DataFrame({
+        'x1': np.linspace(-5, 15, 35),
+        "x2": np.tile([1, 0, 0, 1, 0, 1, 1], 5),
+        'y': np.linspace(0, 1, 35)
+    })
+
+    predict_fn, _, _ = build_pipeline(
+        xgb_regression_learner(features=["x1", "x2"], target="y", num_estimators=20, extra_params={"seed": 42}),
+        ecdfer(ecdf_column="ecdf"),
+        discrete_ecdfer(ecdf_column="discrete_ecdf", ascending=False))(df_train)
+
+    expected = predict_fn(df_test)
+
+    chunks = (df_test.iloc[start:start + 8] for start in range(0, len(df_test), 8))
+    pd.util.testing.assert_frame_equal(pd.concat(stream_predict(predict_fn, chunks, n_jobs=n_jobs)), expected)
+
+    input_path, output_path = str(tmp_path / "input.csv"), str(tmp_path / "output.csv")
+    df_test.to_csv(input_path, index=False)
+
+    assert [len(chunk) for chunk in read_chunks(input_path, chunksize=10)] == [10, 10, 10, 5]
+
+    n_rows = write_chunks(stream_predict(predict_fn, [input_path], chunksize=10, n_jobs=n_jobs), output_path,
+                          keep_index=False)
+
+    assert n_rows == len(df_test)
+    pd.util.testing.assert_frame_equal(pd.read_csv(output_path), predict_fn(pd.read_csv(input_path)), check_dtype=False)
+
+    # the index is kept by default
+    indexed_test = df_test.set_index(pd.Index(["row%d" % i for i in range(len(df_test))], name="row_id"))
+    write_chunks(stream_predict(predict_fn, [indexed_test.iloc[:10], indexed_test.iloc[10:]]), output_path)
+    pd.util.testing.assert_frame_equal(pd.read_csv(output_path, index_col=0), predict_fn(indexed_test),
+                                       check_dtype=False)
+
+
+@pytest.mark.skipif(not HAS_PYARROW, reason="pyarrow is not available")
+def test_stream_predict_parquet(tmp_path):
+    df = pd.DataFrame({"x": np.arange(25, dtype=float)})
+
+    def p(new_df, mult=2):
+        return new_df.assign(y=new_df.x * mult)
+
+    input_path, output_path = str(tmp_path / "input.parquet"), str(tmp_path / "output.parquet")
+    df.to_parquet(input_path)
+
+    n_rows = write_chunks(stream_predict(p, input_path, chunksize=10, mult=3), output_path, keep_index=False)
+
+    assert n_rows == len(df)
+    pd.util.testing.assert_frame_equal(pd.read_parquet(output_path), p(df, mult=3))
+
+    # the index is kept by default
+    indexed_df = df.set_index(pd.Index(np.arange(25) * 10, name="row_id"))
+    write_chunks(stream_predict(p, [indexed_df.iloc[:10], indexed_df.iloc[10:]]), output_path)
+    pd.util.testing.assert_frame_equal(pd.read_parquet(output_path), p(indexed_df))
+
+
+def test_build_pipeline_fit_only():
+    df_train = pd.DataFrame({
+        'x1': np.linspace(0, 10, 40),
+        "x2": np.tile([0, 1, 1, 0], 10),
+        'y': np.linspace(0, 10, 40) * 2 + np.tile([0.5, -0.5], 20)
+    })
+
+    learners = [placeholder_imputer(columns_to_impute=["x1", "x2"], placeholder_value=-999),
+                xgb_regression_learner(features=["x1", "x2"], target="y", num_estimators=20,
+                                       extra_params={"seed": 42})]
+
+    predict_fn, pred_train, log = build_pipeline(*learners)(df_train)
+    fit_only_predict_fn, fit_only_train, fit_only_log = build_pipeline(*learners, fit_only=True,
+                                                                       track_memory=True)(df_train)
+
+    assert "prediction" not in fit_only_train.columns
+    pd.util.testing.assert_frame_equal(fit_only_train, pred_train.drop(columns=["prediction"]))
+    pd.util.testing.assert_frame_equal(fit_only_predict_fn(df_train), pred_train)
+    assert fit_only_log["__fkml__"]["peak_memory"] > 0
+    assert "peak_memory" not in log["__fkml__"]
+
+    # memory allocated before the fit is not counted when tracemalloc is already tracing
+    tracemalloc.start()
+    try:
+        allocated_before = np.ones(10 ** 7)
+        _, _, traced_log = build_pipeline(*learners, fit_only=True, track_memory=True)(df_train)
+        assert tracemalloc.is_tracing()
+    finally:
+        tracemalloc.stop()
+    assert 0 < traced_log["__fkml__"]["peak_memory"] < allocated_before.nbytes
+
+    # only the last step skips scoring, so the ecdfer is still fitted on the model predictions
+    _, fit_only_ecdf_train, _ = build_pipeline(*learners, ecdfer(), fit_only=True)(df_train)
+    assert "prediction" in fit_only_ecdf_train.columns
+
+    # pipelines nested in the last step of a fit-only pipeline skip scoring only in their own last step
+    def nested_pipeline_learner(*nested_learners):
+        def learner(df):
+            inner_predict_fn, inner_train, _ = build_pipeline(*nested_learners)(df)
+            return lambda new_df: inner_predict_fn(new_df), inner_train, {}
+        return learner
+
+    _, nested_train, _ = build_pipeline(nested_pipeline_learner(*learners), fit_only=True)(df_train)
+    assert "prediction" not in nested_train.columns
+
+    nested_predict_fn, nested_train, _ = build_pipeline(nested_pipeline_learner(*learners, ecdfer()),
+                                                        fit_only=True)(df_train)
+    pd.util.testing.assert_frame_equal(nested_train, ecdfer(pred_train)[1])
+    pd.util.testing.assert_frame_equal(nested_predict_fn(df_train), nested_train)
+
+
+@pytest.mark.parametrize("prune_columns", [False, True])
+def test_resumable_predict_fn(prune_columns):
+    df_train = pd.DataFrame({
+        'id': ["id1", "id2", "id3", "id4", "id3", "id4"],
+        'x1': [10.0, 13.0, 10.0, 13.0, None, 13.0],
+        "x2": [0, 1, 1, 0, 1, 0],
+        "cat": ["c1", "c1", "c2", None, "c2", "c4"],
+        'y': [2.3, 4.0, 100.0, -3.9, 100.0, -3.9]
+    })
+    df_test = df_train.assign(x1=[12.0, 1000.0, -4.0, 0.0, -4.0, 0.0])
+
+    spy_calls = []
+
+    def spy_learner(df):
+        def p(new_df):
+            spy_calls.append(len(new_df))
+            return new_df
+
+        return declare_columns(p, reads=["x1"], writes=[]), df, {}
+
+    learners = [spy_learner,
+                placeholder_imputer(columns_to_impute=["x1", "x2"], placeholder_value=-999),
+                onehot_categorizer(columns_to_categorize=["cat"], hardcode_nans=True),
+                xgb_regression_learner(features=["x1", "x2", "cat"], target="y",
+                                       num_estimators=20, extra_params={"seed": 42})]
+
+    predict_fn, _, _ = build_pipeline(*learners, prune_columns=prune_columns, keep_columns=["id"])(df_train)
+    predict_with = resumable_predict_fn(predict_fn, df_test)
+
+    replacements = [{"x1": df_test["x1"].values[::-1]},
+                    {"cat": df_test["cat"].values[::-1]},
+                    {"x2": df_test["x2"].values[::-1], "id": df_test["id"].values[::-1]},
+                    {"id": df_test["id"].values[::-1]},
+                    {}]
+
+    for replaced_columns in replacements:
+        spy_calls.clear()
+        result = predict_with(replaced_columns)
+        pd.util.testing.assert_frame_equal(result, predict_fn(df_test.assign(**replaced_columns)))
+
+        # the first step only runs again when the column it reads is replaced
+        assert len(spy_calls) == (2 if "x1" in replaced_columns else 1)
+
+    # pipelines carry resumable_predict_fn bound to them, for modules that don't import this one
+    spy_calls.clear()
+    bound_predict_with = predict_fn.resumable_on(df_test, ["cat"])
+    pd.util.testing.assert_frame_equal(bound_predict_with(replacements[1]), predict_with(replacements[1]))
+    assert len(spy_calls) == 1
+
+    # functions that are not pipelines are run in full
+    pd.util.testing.assert_frame_equal(resumable_predict_fn(lambda df: df.assign(a=1), df_test)({"x1": 0}),
+                                       df_test.assign(x1=0, a=1))
@@ -3,6 +3,8 @@ from collections import Counter
 import numpy as np
 import pandas as pd
 
+from fklearn.training.utils import declared_columns
+
 from fklearn.training.regression import \
     linear_regression_learner, gp_regression_learner, \
     xgb_regression_learner, lgbm_regression_learner, catboost_regressor_learner, \
@@ -307,6 +309,8 @@ def test_custom_supervised_model_learner():
     assert(pred_test_classification.prediction_0.min() >= 0)
     assert(pred_test_classification.prediction_1.max() <= 1)
     assert(pred_test_classification.prediction_1.min() >= 0)
+    assert declared_columns(predict_fn_classification) == {"reads": features,
+                                                           "writes": ["prediction_0", "prediction_1"]}
 
     custom_regression_learner = custom_supervised_model_learner(
         features=features,
@@ -323,3 +327,4 @@ def test_custom_supervised_model_learner():
     assert(Counter(expected_col_test) == Counter(pred_test.columns.tolist()))
     assert((pred_test.columns == pred_train.columns).all())
     assert("prediction" in pred_test.columns)
+    assert declared_columns(predict_fn) == {"reads": features, "writes": ["prediction"]}
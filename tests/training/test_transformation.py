@@ -1,6 +1,7 @@
 from collections import OrderedDict
 
 import math
+import numpy as np
 import pandas as pd
 import pytest
 from numpy import nan, round, sqrt, floor, log as ln
@@ -8,6 +9,8 @@ from numpy.testing import assert_almost_equal
 from pandas.testing import assert_frame_equal
 
 from fklearn.training.transformation import (
+    _column_replacer,
+    apply_replacements,
     selector,
     capper,
     floorer,
@@ -215,6 +218,69 @@ def test_value_mapper():
     ).equals(data_ignore4)
 
 
+def test_apply_replacements():
+    input_df = pd.DataFrame(
+        {
+            "feat1": [1, 2, 3, nan],
+            "feat2": ["a", None, nan, "d"],
+            "feat3": [True, False, True, False],
+            "feat4": ["a", 1, 2.0, (1, 2)],
+        }
+    )
+
+    vec = {
+        "feat1": {1: 10, 2.0: 20},
+        "feat2": {"a": 1, None: 2},
+        "feat3": {1: "one"},
+        "feat4": {1: "one", (1, 2): "tuple", "a": [1, 2]},
+    }
+
+    expected = pd.DataFrame(
+        {
+            "feat1": [10, 20, -1, nan],
+            "feat2": [1, 2, nan, -1],
+            "feat3": ["one", -1, "one", -1],
+            "feat4": [[1, 2], "one", -1, "tuple"],
+        }
+    )
+
+    assert expected.equals(apply_replacements(input_df, list(vec), vec, -1))
+
+    # unseen values and outputs with no NaNs keep integer dtypes
+    assert apply_replacements(input_df, ["feat3"], {"feat3": {True: 1, False: 0}}, -1)["feat3"].dtype == "int64"
+
+
+@pytest.mark.parametrize("values, mapping", [
+    ([1, 2, 3, 1], {1: 10, 2.0: 20}),
+    ([1.0, nan, 2.5, 1.0], {1: "a", nan: "n"}),
+    (["a", None, "b", nan], {"a": 1, None: 2}),
+    (["a", 1, 2.0, (1, 2)], {1: "one", (1, 2): "tuple", "a": [1, 2]}),
+    ([True, False, True], {1: "one"}),
+    ([1, 0, 2], {True: "true", False: "false"}),
+    ([True, None], {True: 1}),
+    (["x", "x"], {"x": 1, "y": 2.5}),
+])
+def test_column_replacer(values, mapping):
+    series = pd.Series(values)
+    replacer = _column_replacer(mapping, -1)
+
+    # the same replacer is reused on every call, with the same results as looking up each value
+    for _ in range(2):
+        expected = series.apply(lambda x: nan if isinstance(x, float) and np.isnan(x) else mapping.get(x, -1))
+        pd.testing.assert_series_equal(replacer(series), expected)
+
+
+def test_replacements_built_at_fit_time(monkeypatch):
+    df = pd.DataFrame({"col": ["a", "b", "a", None]})
+    predict_fn, _, _ = label_categorizer(df, columns_to_categorize=["col"])
+
+    def factorize(*args, **kwargs):
+        raise AssertionError("the replacements are looked up in the index built at fit time")
+
+    monkeypatch.setattr(pd, "factorize", factorize)
+    assert predict_fn(df)["col"].tolist()[:3] == [0, 1, 0]
+
+
 def test_truncate_categorical():
     input_df_train = pd.DataFrame(
         {
@@ -1,9 +1,12 @@
 # -*- coding: utf-8 -*-
 from collections import Counter
+from inspect import signature
 
 import pandas as pd
 
-from fklearn.training.utils import expand_features_encoded
+from fklearn.training.pipeline import build_pipeline
+from fklearn.training.utils import (compose_declared_columns, declare_columns, declared_columns,
+                                    expand_features_encoded)
 
 
 def test_expand_features_encoded():
@@ -55,3 +58,43 @@ def test_expand_features_encoded():
     assert Counter(transformed_3) == Counter(expected_3)
     assert Counter(transformed_4) == Counter(expected_4)
     assert Counter(transformed_5) == Counter(expected_5)
+
+
+def test_compose_declared_columns():
+    mixin_fn = declare_columns(lambda df: df.assign(a_copy=df["a"]), reads=["a"], writes=["a_copy"])
+    child_fn = declare_columns(lambda df: df.assign(a=df["a"] + df["b"]), reads=["a", "b"], writes=["a"])
+    df = pd.DataFrame({"a": [1, 2], "b": [3, 4]})
+
+    composed = compose_declared_columns(child_fn, mixin_fn)
+
+    pd.testing.assert_frame_equal(composed(df), df.assign(a_copy=[1, 2], a=[4, 6]))
+    assert declared_columns(composed) == {"reads": ["a", "b"], "writes": ["a_copy", "a"]}
+    assert declared_columns(compose_declared_columns(lambda df: df, mixin_fn)) is None
+
+
+def test_compose_declared_columns_kwargs():
+    def mixin_fn(df):
+        return df.assign(a_copy=df["a"])
+
+    def child_fn(df, scale=1, offset=0):
+        return df.assign(a=df["a"] * scale + offset)
+
+    df = pd.DataFrame({"a": [1, 2], "b": [3, 4]})
+    composed = compose_declared_columns(child_fn, mixin_fn)
+
+    # keyword arguments only go to the predict functions that accept them
+    pd.testing.assert_frame_equal(composed(df, scale=10), df.assign(a_copy=[1, 2], a=[10, 20]))
+    assert list(signature(composed).parameters) == ["new_df", "scale", "offset"]
+
+    predict_fn, _, _ = build_pipeline(lambda df: (composed, composed(df), {}))(df)
+    pd.testing.assert_frame_equal(predict_fn(df, offset=1), df.assign(a_copy=[1, 2], a=[2, 3]))
+
+
+def test_declared_columns_stay_out_of_learner_logs():
+    from fklearn.training.transformation import selector
+
+    df = pd.DataFrame({"a": [1, 2], "b": [3, 4]})
+    p, _, log = selector(df, training_columns=["a"])
+
+    assert list(log.keys()) == ["selector"]
+    assert declared_columns(p) == {"reads": ["a"], "writes": []}
@@ -0,0 +1,124 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from fklearn.tuning.log_store import LogStore, flatten_validator_log
+
+try:
+    import pyarrow  # noqa: F401
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+
+class Booster:
+    def __init__(self, n_trees):
+        self.n_trees = n_trees
+
+    def __eq__(self, other):
+        return isinstance(other, Booster) and other.n_trees == self.n_trees
+
+
+def make_log(learning_rate, n_trees):
+    return {
+        "train_log": {"lgbm_classification_learner": {"features": ["x", "y"], "learning_rate": learning_rate,
+                                                      "object": Booster(n_trees)}},
+        "validator_log": [
+            {"fold_num": fold,
+             "split_log": {"train_size": 100, "test_size": [30, 20], "train_start": pd.Timestamp("2020-01-01")},
+             "eval_results": [{"roc_auc_evaluator__target": 0.5 + fold / 10,
+                               "split_evaluator__g_a": {"roc_auc_evaluator__target": 0.6}},
+                              {"roc_auc_evaluator__target": 0.4 + fold / 10,
+                               "split_evaluator__g_a": {}}]}
+            for fold in range(2)
+        ]
+    }
+
+
+def test_flatten_validator_log():
+    stored = []
+
+    def store_object(value):
+        stored.append(value)
+        return "ref%d" % len(stored)
+
+    rows = flatten_validator_log(make_log(0.1, 10), 3, store_object)
+
+    assert len(rows) == 4
+    assert stored == [Booster(10)]
+    assert rows[1] == {
+        "log_id": 3,
+        "train_log.lgbm_classification_learner.features": ["x", "y"],
+        "train_log.lgbm_classification_learner.learning_rate": 0.1,
+        "train_log.lgbm_classification_learner.object@ref": "ref1",
+        "fold_num": 0,
+        "eval_num": 1,
+        "split_log.train_size": 100,
+        "split_log.test_size": 20,
+        "split_log.train_start": pd.Timestamp("2020-01-01"),
+        "roc_auc_evaluator__target": 0.4,
+    }
+    assert rows[2]["split_evaluator__g_a.roc_auc_evaluator__target"] == 0.6
+    assert [(r["fold_num"], r["eval_num"]) for r in rows] == [(0, 0), (0, 1), (1, 0), (1, 1)]
+
+
+def test_flatten_validator_log_lists_of_logs():
+    stored = []
+
+    def store_object(value):
+        stored.append(value)
+        return "ref%d" % len(stored)
+
+    log = make_log(0.1, 10)
+    # the train logs of every fold, like validators return with return_all_train_logs
+    log["train_log"] = [make_log(0.1, 10)["train_log"], make_log(0.2, 20)["train_log"]]
+    log["fold_error_logs"] = [[], [{"fold_num": 1, "error": "ValueError"}]]
+
+    row = flatten_validator_log(log, 3, store_object)[0]
+
+    assert stored == [Booster(10), Booster(20)]
+    assert row["train_log.0.lgbm_classification_learner.learning_rate"] == 0.1
+    assert row["train_log.1.lgbm_classification_learner.learning_rate"] == 0.2
+    assert row["train_log.1.lgbm_classification_learner.features"] == ["x", "y"]
+    assert row["train_log.1.lgbm_classification_learner.object@ref"] == "ref2"
+    assert row["fold_error_logs.0"] == []
+    assert row["fold_error_logs.1.0.error"] == "ValueError"
+    assert not any(name.startswith("train_log") and name.endswith("@ref") and "object" not in name for name in row)
+
+
+@pytest.mark.skipif(not HAS_PYARROW, reason="pyarrow is not available")
+def test_log_store(tmp_path):
+    store = LogStore(str(tmp_path / "logs"))
+    assert len(store) == 0
+    assert store.read().empty
+
+    assert store.append(make_log(0.1, 10)) == [0]
+    assert store.append([make_log(0.2, 10), make_log(0.3, 20)]) == [1, 2]
+    # appending reopens the folder, as a new process would
+    store = LogStore(str(tmp_path / "logs"))
+    assert store.append(dict(make_log(0.4, 20), used_subsets=["a", 1])) == [3]
+    assert len(store) == 4
+
+    # identical objects are stored once
+    assert len(list((tmp_path / "logs" / "objects").iterdir())) == 2
+    assert "split_evaluator__g_a.roc_auc_evaluator__target" in store.columns()
+
+    metrics = store.read(columns=["roc_auc_evaluator__target", "*.learning_rate"])
+    assert set(metrics.columns) == {"log_id", "fold_num", "eval_num", "roc_auc_evaluator__target",
+                                    "train_log.lgbm_classification_learner.learning_rate"}
+    assert metrics.groupby("log_id")["train_log.lgbm_classification_learner.learning_rate"].first().tolist() == \
+        [0.1, 0.2, 0.3, 0.4]
+    np.testing.assert_allclose(metrics["roc_auc_evaluator__target"], [0.5, 0.4, 0.6, 0.5] * 4)
+
+    subset = store.read(columns=["used_subsets", "split_log.*"], log_ids=[2, 3])
+    assert subset["log_id"].unique().tolist() == [2, 3]
+    assert subset["split_log.test_size"].tolist() == [30, 20] * 4
+    assert (subset["split_log.train_start"] == pd.Timestamp("2020-01-01")).all()
+    # mixed types are kept as strings
+    assert subset["used_subsets"].iloc[-1].tolist() == ["a", "1"]
+
+    models = store.read(columns=["*.object@ref"], load_objects=True)
+    assert models["train_log.lgbm_classification_learner.object"].tolist() == \
+        [Booster(10)] * 8 + [Booster(20)] * 8
+    refs = store.read(columns=["*.object@ref"])["train_log.lgbm_classification_learner.object@ref"]
+    assert store.load_object(refs.iloc[-1]) == Booster(20)
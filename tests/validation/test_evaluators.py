@@ -1,11 +1,15 @@
 import string
+import warnings
 
 import numpy as np
 import pandas as pd
 import pytest
 
+from fklearn.training.imputation import placeholder_imputer
+from fklearn.training.pipeline import build_pipeline
+from fklearn.training.regression import linear_regression_learner
 from fklearn.validation.evaluators import (
-    auc_evaluator, brier_score_evaluator, combined_evaluators,
+    _factorize_keeping_nulls, auc_evaluator, brier_score_evaluator, combined_evaluators,
     correlation_evaluator, expected_calibration_error_evaluator,
     fbeta_score_evaluator, hash_evaluator, logloss_evaluator,
     mean_prediction_evaluator, mse_evaluator, permutation_evaluator,
@@ -501,3 +505,218 @@ def test_logistic_coefficient_evaluator():
     result = logistic_coefficient_evaluator(predictions)
 
     assert round(result['logistic_coefficient_evaluator__target'], 3) == 20.645
+
+
+@pytest.mark.parametrize("seed", [0, 1])
+def test_combined_evaluators_fused(seed):
+    rng = np.random.RandomState(seed)
+    n_rows = 2000
+    predictions = pd.DataFrame({
+        # rounded so there are ties in the predictions
+        'prediction': np.round(rng.uniform(size=n_rows), 2),
+        'other_prediction': rng.uniform(size=n_rows),
+        'target': rng.binomial(1, 0.3, n_rows),
+        'relevance': rng.randint(0, 4, n_rows),
+        'weight': rng.uniform(0.5, 2.0, n_rows),
+    })
+
+    evaluators = [
+        roc_auc_evaluator,
+        roc_auc_evaluator(prediction_column='other_prediction', eval_name='other_roc_auc'),
+        roc_auc_evaluator(weight_column='weight', eval_name='weighted_roc_auc'),
+        pr_auc_evaluator,
+        pr_auc_evaluator(weight_column='weight', eval_name='weighted_pr_auc'),
+        expected_calibration_error_evaluator(n_bins=10),
+        expected_calibration_error_evaluator(prediction_column='other_prediction', n_bins=20, bin_choice='prob'),
+        ndcg_evaluator(target_column='relevance'),
+        ndcg_evaluator(target_column='relevance', k=50, exponential_gain=False, eval_name='ndcg_at_50'),
+        mse_evaluator,
+    ]
+
+    result = combined_evaluators(predictions, evaluators, fused=True)
+    expected = combined_evaluators(predictions, evaluators)
+
+    assert list(result) == list(expected)
+    for name, score in expected.items():
+        assert result[name] == pytest.approx(score, rel=1e-10), name
+
+
+def test_combined_evaluators_fused_fallback():
+    predictions = pd.DataFrame({
+        'prediction': [0.1, 0.2, np.nan, 0.4],
+        'target': [0, 0, 0, 0],
+        'score': [0.3, 0.1, 0.2, 0.5],
+    }, index=[3, 2, 1, 0])
+
+    # null predictions, a single class and a non default index are evaluated as usual
+    evaluators = [roc_auc_evaluator, pr_auc_evaluator(prediction_column='score'),
+                  ndcg_evaluator(prediction_column='score', target_column='score'),
+                  expected_calibration_error_evaluator(n_bins=2, bin_choice='prob')]
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        result = combined_evaluators(predictions, evaluators, fused=True)
+        expected = combined_evaluators(predictions, evaluators)
+    assert result.keys() == expected.keys()
+    np.testing.assert_equal(list(result.values()), list(expected.values()))
+
+    # empty calibration bins fail as in the evaluator itself
+    with pytest.raises(ValueError):
+        combined_evaluators(predictions, [expected_calibration_error_evaluator(prediction_column='score', n_bins=10,
+                                                                               bin_choice='prob')], fused=True)
+
+    # targets that are not binary before casting them to int are evaluated as usual
+    continuous = pd.DataFrame({'prediction': [0.1, 0.4, 0.35, 0.8], 'target': [0, 0.5, 1, 1]})
+    evaluators = [roc_auc_evaluator, pr_auc_evaluator]
+    assert combined_evaluators(continuous, evaluators, fused=True) == combined_evaluators(continuous, evaluators)
+
+
+def _reference_split_evaluator(test_data, eval_fn, split_col, split_values=None):
+    # implementation with an equality mask per split value, before the partitioned one
+    if split_values is None:
+        split_values = test_data[split_col].unique()
+    return {'split_evaluator__' + split_col + "_" + str(value): eval_fn(test_data.loc[test_data[split_col] == value])
+            for value in split_values}
+
+
+def _reference_temporal_split_evaluator(test_data, eval_fn, time_col, time_format):
+    formatted_time_col = test_data[time_col].dt.strftime(time_format)
+    return {'split_evaluator__' + time_col + "_" + str(value): eval_fn(test_data.loc[formatted_time_col == value])
+            for value in formatted_time_col.unique()}
+
+
+def _split_data(seed, n_rows=300):
+    rng = np.random.RandomState(seed)
+    time = pd.Series(pd.Timestamp("2017-01-01") + pd.to_timedelta(rng.randint(0, 800 * 24, n_rows), unit="h"))
+    time[rng.rand(n_rows) < 0.05] = pd.NaT
+    return pd.DataFrame({
+        'segment': rng.choice(['a', 'b', 'c', None], n_rows),
+        'number': rng.choice([1.0, 2.0, 3.5, np.nan], n_rows),
+        'time': time,
+        'prediction': rng.uniform(size=n_rows),
+    }, index=rng.permutation(n_rows))
+
+
+def _rows_evaluator(test_data):
+    # the rows of each split, in order, and its mean
+    return {'index': list(test_data.index), 'mean': test_data['prediction'].mean()}
+
+
+@pytest.mark.parametrize("seed", [0, 1])
+@pytest.mark.parametrize("split_col, split_values", [
+    ('segment', None), ('number', None), ('number', [3.5, 1, 7.0, np.nan]), ('segment', ['c', 'z'])])
+@pytest.mark.parametrize("n_jobs", [1, 2])
+def test_split_evaluator_equivalence(seed, split_col, split_values, n_jobs):
+    data = _split_data(seed)
+
+    result = split_evaluator(data, _rows_evaluator, split_col, split_values, n_jobs=n_jobs)
+    expected = _reference_split_evaluator(data, _rows_evaluator, split_col, split_values)
+
+    assert list(result) == list(expected)
+    for name in expected:
+        assert result[name]['index'] == expected[name]['index']
+        np.testing.assert_equal(result[name]['mean'], expected[name]['mean'])
+
+
+@pytest.mark.parametrize("seed", [0, 1])
+@pytest.mark.parametrize("time_format", ["%Y-%m", "%Y", "%Y-%m-%d", "%Y-W%W", "%m"])
+def test_temporal_split_evaluator_equivalence(seed, time_format):
+    data = _split_data(seed)
+
+    result = temporal_split_evaluator(data, _rows_evaluator, 'time', time_format, n_jobs=2)
+    expected = _reference_temporal_split_evaluator(data, _rows_evaluator, 'time', time_format)
+
+    assert list(result) == list(expected)
+    for name in expected:
+        assert result[name]['index'] == expected[name]['index']
+        np.testing.assert_equal(result[name]['mean'], expected[name]['mean'])
+
+
+@pytest.mark.parametrize("values, expected_codes, expected_uniques", [
+    (["b", None, "a", "b", None], [0, 1, 2, 0, 1], ["b", None, "a"]),
+    ([None, "a", "a"], [0, 1, 1], [None, "a"]),
+    (["a", "b"], [0, 1], ["a", "b"]),
+    ([None, None], [0, 0], [None]),
+])
+def test_factorize_keeping_nulls(values, expected_codes, expected_uniques):
+    codes, uniques = _factorize_keeping_nulls(np.array(values, dtype=object))
+
+    assert list(codes) == expected_codes
+    assert [None if pd.isnull(value) else value for value in uniques] == expected_uniques
+
+
+def _permutation_data():
+    rng = np.random.RandomState(0)
+    return pd.DataFrame({'x1': rng.normal(size=500), 'x2': rng.normal(size=500), 'x3': rng.normal(size=500)},
+                        index=rng.permutation(500)).assign(target=lambda df: df['x1'] * 2 + df['x2'])
+
+
+def _linear_predict(df):
+    return df.assign(prediction=df['x1'] * 2 + df['x2'] * 0.9)
+
+
+def test_permutation_evaluator_independent_permutations():
+    data = _permutation_data()
+    shuffled_frames = []
+
+    def recording_predict(df):
+        shuffled_frames.append(df)
+        return _linear_predict(df)
+
+    result = permutation_evaluator(data, recording_predict, r2_evaluator, features=['x1', 'x2'],
+                                   baseline=False, random_state=7, n_repeats=2)
+    assert result == permutation_evaluator(data, _linear_predict, r2_evaluator, features=['x1', 'x2'],
+                                           baseline=False, random_state=7, n_repeats=2)
+
+    # the rows each shuffled column was moved from, by feature and repeat
+    permutations = [pd.Index(data[f]).get_indexer(df[f]) for df, f in zip(shuffled_frames, ['x1', 'x1', 'x2', 'x2'])]
+    assert all(sorted(permutation) == list(range(len(data))) for permutation in permutations)
+    assert len({tuple(permutation) for permutation in permutations}) == 4
+
+
+def test_permutation_evaluator_non_numeric_logs():
+    data = _permutation_data()
+
+    def eval_fn(df):
+        return {**r2_evaluator(df), 'model': 'linear', 'split': {'name': 'test', 'rows': len(df)}}
+
+    result = permutation_evaluator(data, _linear_predict, eval_fn, features=['x1'], random_state=1, n_repeats=3)
+
+    assert result['permutation_importance']['x1']['model'] == 'linear'
+    assert result['permutation_importance']['x1']['split'] == {'name': 'test', 'rows': 500}
+    assert result['permutation_importance_std']['x1']['split']['rows'] == 0
+    assert result['permutation_importance_std']['x1']['r2_evaluator__target'] > 0
+
+
+@pytest.mark.parametrize("batch_size, max_batch_bytes, n_jobs, backend", [
+    (4, None, 1, "threading"), (100, 50000, 1, "threading"), (1, None, 2, "threading"), (3, None, 2, "loky")])
+def test_permutation_evaluator_batched(batch_size, max_batch_bytes, n_jobs, backend):
+    data = _permutation_data()
+    kwargs = dict(features=['x1', 'x2', 'x3'], random_state=1, n_repeats=3)
+
+    expected = permutation_evaluator(data, _linear_predict, r2_evaluator, **kwargs)
+    result = permutation_evaluator(data, _linear_predict, r2_evaluator, batch_size=batch_size,
+                                   max_batch_bytes=max_batch_bytes, n_jobs=n_jobs, backend=backend, **kwargs)
+
+    assert result == expected
+    assert list(expected['permutation_importance']) == ['x1', 'x2', 'x3']
+    assert expected['permutation_importance_std']['x1']['r2_evaluator__target'] > 0
+    assert expected['permutation_importance_std']['x3']['r2_evaluator__target'] == 0
+    assert expected['permutation_importance']['x1']['r2_evaluator__target'] < \
+        expected['permutation_importance']['x2']['r2_evaluator__target']
+
+
+def test_permutation_evaluator_resumes_pipelines():
+    data = _permutation_data()
+    train_fn = build_pipeline(placeholder_imputer(columns_to_impute=['x2'], placeholder_value=0),
+                              linear_regression_learner(features=['x1', 'x2', 'x3'], target='target'))
+    predict_fn, _, _ = train_fn(data)
+
+    kwargs = dict(features=['x1', 'x2', 'x3', 'target'], random_state=3, n_repeats=2, n_jobs=2)
+    result = permutation_evaluator(data, predict_fn, r2_evaluator, resumable=True, **kwargs)
+
+    # without resumable, the whole pipeline runs for every shuffled copy
+    assert result == permutation_evaluator(data, predict_fn, r2_evaluator, **kwargs)
+
+    with pytest.raises(ValueError):
+        permutation_evaluator(data, lambda df: predict_fn(df), r2_evaluator, resumable=True, **kwargs)
@@ -1,11 +1,15 @@
 from datetime import timedelta
+from itertools import repeat
 
+import numpy as np
 import pandas as pd
 import pytest
+from fklearn.validation import splitters
 from fklearn.validation.splitters import \
     k_fold_splitter, out_of_time_and_space_splitter, spatial_learning_curve_splitter, time_learning_curve_splitter, \
     reverse_time_learning_curve_splitter, stability_curve_time_splitter, stability_curve_time_in_space_splitter, \
-    stability_curve_time_space_splitter, forward_stability_curve_time_splitter, time_and_space_learning_curve_splitter
+    stability_curve_time_space_splitter, forward_stability_curve_time_splitter, \
+    time_and_space_learning_curve_splitter, LazyFolds, list_folds
 
 sample_data = pd.DataFrame({'space': ['a', 'a', 'b', 'b', 'a', 'c', 'c'],
                             'time': pd.to_datetime(
@@ -333,3 +337,144 @@ def test_forward_stability_curve_time_splitter():
     assert train_2.time.min() < train_3.time.min()
 
     assert test_1.time.min() < test_2.time.min()
+
+
+def _reference_sc_test_fold_idx_and_logs(test_data, train_time, time_column, first_test_moment, last_test_moment,
+                                         min_samples, freq):
+    # implementation with a full column mask per period, before the binary search one
+    periods_range = pd.period_range(start=first_test_moment, end=last_test_moment, freq=freq)
+    folds = [test_data[test_data[time_column].dt.to_period(freq) == period][time_column] for period in periods_range]
+    folds = [fold for fold in folds if len(fold.index) > min_samples]
+    logs = list(map(splitters._log_time_fold, zip(repeat(train_time), folds)))
+    return logs, [[fold.index] for fold in folds]
+
+
+def _reference_forward_folds(train_data, train_ranges, test_ranges, time_column):
+    train_data = train_data.reset_index()
+    train_idx = [train_data[(train_data[time_column] >= start) & (train_data[time_column] < end)].index
+                 for start, end in train_ranges]
+    test_idx = [[train_data[(train_data[time_column] >= start) & (train_data[time_column] < end)].index]
+                for start, end in test_ranges]
+    logs = [splitters._log_time_fold((train_data.iloc[i][time_column], train_data.iloc[j[0]][time_column]))
+            for i, j in zip(train_idx, test_idx)]
+    return list(zip(train_idx, test_idx)), logs
+
+
+def _random_time_data(seed, n_rows=500):
+    rng = np.random.RandomState(seed)
+    time = pd.Series(pd.Timestamp("2015-01-01") + pd.to_timedelta(rng.randint(0, 700, n_rows), unit="D"))
+    time[rng.rand(n_rows) < 0.05] = pd.NaT
+    return pd.DataFrame({"space": rng.choice(list("abcdefghij"), n_rows), "time": time},
+                        index=rng.permutation(n_rows))
+
+
+def _assert_same_splits(result, expected):
+    (folds, logs), (expected_folds, expected_logs) = result, expected
+    assert logs == expected_logs
+    assert len(folds) == len(expected_folds)
+    for (train, tests), (expected_train, expected_tests) in zip(folds, expected_folds):
+        pd.testing.assert_index_equal(pd.Index(train), pd.Index(expected_train), exact=True)
+        assert len(tests) == len(expected_tests)
+        for test, expected_test in zip(tests, expected_tests):
+            pd.testing.assert_index_equal(test, expected_test, exact=True)
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+@pytest.mark.parametrize("freq, min_samples", [("M", 10), ("W", 3), ("D", 0)])
+@pytest.mark.parametrize("splitter, kwargs", [
+    (stability_curve_time_splitter, {}),
+    (stability_curve_time_in_space_splitter, {"space_column": "space", "random_state": 7}),
+    (stability_curve_time_space_splitter, {"space_column": "space", "random_state": 7}),
+])
+def test_stability_curve_splitters_equivalence(monkeypatch, seed, freq, min_samples, splitter, kwargs):
+    data = _random_time_data(seed)
+    split_fn = splitter(training_time_limit="2016-01-01", time_column="time", freq=freq, min_samples=min_samples,
+                        **kwargs)
+
+    result = split_fn(data)
+
+    def reference(test_time, train_time, first_test_moment, last_test_moment, min_samples, freq):
+        return _reference_sc_test_fold_idx_and_logs(test_time.to_frame(), train_time, test_time.name,
+                                                    first_test_moment, last_test_moment, min_samples, freq)
+
+    monkeypatch.setattr(splitters, "_get_sc_test_fold_idx_and_logs", reference)
+
+    _assert_same_splits(result, split_fn(data))
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+@pytest.mark.parametrize("move_training_start_with_steps", [True, False])
+def test_forward_stability_curve_time_splitter_equivalence(seed, move_training_start_with_steps):
+    data = _random_time_data(seed)
+    start, end = pd.Timestamp("2015-02-01"), pd.Timestamp("2015-09-01")
+    gap, size, step = timedelta(days=7), timedelta(days=30), timedelta(days=45)
+
+    result = forward_stability_curve_time_splitter(data, training_time_start=start, training_time_end=end,
+                                                   time_column="time", holdout_gap=gap, holdout_size=size, step=step,
+                                                   move_training_start_with_steps=move_training_start_with_steps)
+
+    n_folds = len(result[0])
+    train_ranges = [(start + i * step * move_training_start_with_steps, end + i * step) for i in range(n_folds)]
+    test_ranges = [(end + gap + i * step, end + gap + size + i * step) for i in range(n_folds)]
+
+    _assert_same_splits(result, _reference_forward_folds(data, train_ranges, test_ranges, "time"))
+
+
+def _reference_lc_folds(train_data, training_time_limit, time_column, freq, holdout_gap, min_samples):
+    # implementation with a full column mask per fold, before the binary search one
+    train_data = train_data.reset_index()
+    date_range = pd.date_range(start=train_data[time_column].min(), end=training_time_limit, freq=freq)
+    test_time = train_data[train_data[time_column] > (date_range[-1] + holdout_gap)][time_column]
+    folds = [(train_data[train_data[time_column] <= date][time_column], test_time) for date in date_range]
+    folds = [(train, test) for train, test in folds if len(train.index) > min_samples]
+    return [(train.index, [test.index]) for train, test in folds], list(map(splitters._log_time_fold, folds))
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+@pytest.mark.parametrize("freq, min_samples", [("M", 10), ("W", 100)])
+def test_time_learning_curve_splitter_equivalence(seed, freq, min_samples):
+    data = _random_time_data(seed)
+    kwargs = dict(training_time_limit="2016-01-01", time_column="time", freq=freq,
+                  holdout_gap=timedelta(days=20), min_samples=min_samples)
+
+    expected = _reference_lc_folds(data, **kwargs)
+    _assert_same_splits(time_learning_curve_splitter(data, **kwargs), expected)
+
+    folds, logs = time_learning_curve_splitter(data, lazy=True, **kwargs)
+    assert isinstance(folds, LazyFolds)
+    _assert_same_splits((list_folds(folds), logs), expected)
+
+
+def test_lazy_folds():
+    folds = LazyFolds(3, lambda i: (range(i, i + 2), [range(i + 2, i + 3)]))
+
+    assert len(folds) == 3
+    assert folds[-1] == folds[2] == (range(2, 4), [range(4, 5)])
+    assert folds[1:] == [folds[1], folds[2]]
+    assert list(folds) == [folds[0], folds[1], folds[2]]
+
+    with pytest.raises(IndexError):
+        folds[3]
+
+    (train, tests), = list_folds(folds[:1])
+    pd.testing.assert_index_equal(train, pd.Index([0, 1]), exact=True)
+    pd.testing.assert_index_equal(tests[0], pd.Index([2]), exact=True)
+
+
+def test_lazy_folds_encoding():
+    kwargs = dict(training_time_start="2015-02-01", training_time_end="2015-09-01", time_column="time",
+                  holdout_size=timedelta(days=30), step=timedelta(days=45), lazy=True)
+
+    # sorted times without nulls are encoded as ranges of positions
+    sorted_data = _random_time_data(0).dropna().sort_values("time")
+    folds, _ = forward_stability_curve_time_splitter(sorted_data, **kwargs)
+    train, (test,) = folds[0]
+    assert isinstance(train, range) and isinstance(test, range)
+
+    # otherwise as sorted int32 positions
+    folds, logs = forward_stability_curve_time_splitter(_random_time_data(0), **kwargs)
+    train, (test,) = folds[0]
+    assert train.dtype == np.int32 and (np.diff(train) > 0).all()
+
+    _assert_same_splits((list_folds(folds), logs),
+                        forward_stability_curve_time_splitter(_random_time_data(0), **dict(kwargs, lazy=False)))
@@ -0,0 +1,94 @@
+import pickle
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from fklearn.validation.evaluators import (
+    brier_score_evaluator, correlation_evaluator, logloss_evaluator, mean_prediction_evaluator, mse_evaluator,
+    r2_evaluator, roc_auc_evaluator)
+from fklearn.validation.streaming_evaluators import (
+    brier_score_streaming_evaluator, combined_streaming_evaluators, correlation_streaming_evaluator,
+    expected_calibration_error_streaming_evaluator, logloss_streaming_evaluator, mean_prediction_streaming_evaluator,
+    merge_states, mse_streaming_evaluator, r2_streaming_evaluator, roc_auc_streaming_evaluator, streaming_evaluate)
+
+
+@pytest.fixture
+def test_data():
+    rng = np.random.RandomState(42)
+    n_rows = 10000
+    prediction = np.round(rng.uniform(size=n_rows), 3)
+    return pd.DataFrame({
+        "prediction": prediction,
+        "target": rng.binomial(1, prediction),
+        "continuous_target": prediction * 3 + rng.normal(size=n_rows) + 100,
+        "weight": rng.uniform(0.5, 2.0, n_rows),
+    })
+
+
+def _chunks(df, n_chunks):
+    return [df.iloc[positions] for positions in np.array_split(np.arange(len(df)), n_chunks)]
+
+
+@pytest.mark.parametrize("streaming_evaluator, evaluator", [
+    (roc_auc_streaming_evaluator(), roc_auc_evaluator),
+    (roc_auc_streaming_evaluator(weight_column="weight"), roc_auc_evaluator(weight_column="weight")),
+    (logloss_streaming_evaluator(weight_column="weight"), logloss_evaluator(weight_column="weight")),
+    (brier_score_streaming_evaluator(), brier_score_evaluator),
+    (mse_streaming_evaluator(target_column="continuous_target", weight_column="weight"),
+     mse_evaluator(target_column="continuous_target", weight_column="weight")),
+    (r2_streaming_evaluator(target_column="continuous_target"), r2_evaluator(target_column="continuous_target")),
+    (r2_streaming_evaluator(target_column="continuous_target", weight_column="weight"),
+     r2_evaluator(target_column="continuous_target", weight_column="weight")),
+    (mean_prediction_streaming_evaluator(), mean_prediction_evaluator),
+    (correlation_streaming_evaluator(target_column="continuous_target"),
+     correlation_evaluator(target_column="continuous_target")),
+])
+def test_streaming_evaluators(test_data, streaming_evaluator, evaluator):
+    expected = evaluator(test_data)
+
+    # one pass over the chunks, and the merge of the states of parallel workers
+    result = streaming_evaluate(streaming_evaluator, _chunks(test_data, 7))
+    worker_states = [pickle.loads(pickle.dumps(streaming_evaluate_state))
+                     for streaming_evaluate_state in (streaming_evaluator.update(streaming_evaluator.init(), chunk)
+                                                      for chunk in _chunks(test_data, 3))]
+    merged = streaming_evaluator.finalize(merge_states(streaming_evaluator, worker_states))
+
+    assert result.keys() == expected.keys() == merged.keys()
+    for name, score in expected.items():
+        assert result[name] == pytest.approx(score, rel=1e-9)
+        assert merged[name] == pytest.approx(score, rel=1e-9)
+        assert streaming_evaluator(test_data)[name] == pytest.approx(score, rel=1e-9)
+
+
+def test_roc_auc_streaming_evaluator_resolution(test_data):
+    data = test_data.assign(prediction=lambda df: df["prediction"] + np.random.RandomState(0).uniform(0, 1e-3,
+                                                                                                      len(df)))
+    result = streaming_evaluate(roc_auc_streaming_evaluator(n_bins=100), _chunks(data, 4))
+    assert result["roc_auc_evaluator__target"] == pytest.approx(roc_auc_evaluator(data)["roc_auc_evaluator__target"],
+                                                                abs=1e-2)
+
+    single_class = streaming_evaluate(roc_auc_streaming_evaluator(), [data.assign(target=1)])
+    assert np.isnan(single_class["roc_auc_evaluator__target"])
+
+
+def test_expected_calibration_error_streaming_evaluator(test_data):
+    result = streaming_evaluate(expected_calibration_error_streaming_evaluator(n_bins=10), _chunks(test_data, 5))
+
+    bins = np.minimum((test_data["prediction"] * 10).astype(int), 9)
+    agg = test_data.groupby(bins).agg(count=("target", "size"), actuals=("target", "mean"),
+                                      predictions=("prediction", "mean"))
+    expected = np.average(np.abs(agg["actuals"] - agg["predictions"]), weights=agg["count"])
+
+    assert result["expected_calibration_error_evaluator__target"] == pytest.approx(expected, rel=1e-9)
+
+
+def test_combined_streaming_evaluators(test_data):
+    evaluators = [roc_auc_streaming_evaluator(), mean_prediction_streaming_evaluator(eval_name="mean")]
+    combined = combined_streaming_evaluators(evaluators)
+
+    states = [combined.update(combined.init(), chunk) for chunk in _chunks(test_data, 4)]
+    result = combined.finalize(merge_states(combined, states))
+
+    assert list(result) == ["roc_auc_evaluator__target", "mean"]
+    assert result == {**evaluators[0](test_data), **evaluators[1](test_data)}
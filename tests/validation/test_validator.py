@@ -1,12 +1,22 @@
+import threading
 import warnings
 from datetime import datetime, timedelta
 
+import numpy as np
 import pandas as pd
 from toolz.functoolz import identity
 
+from fklearn.training.cache import InMemoryStepCache
 from fklearn.training.classification import lgbm_classification_learner
+from fklearn.training.imputation import placeholder_imputer
+from fklearn.training.pipeline import build_pipeline
 from fklearn.validation import splitters, evaluators
 from fklearn.validation.validator import (
+    assemble_oof_predictions,
+    load_checkpoint,
+    materialize_fold,
+    multi_validator,
+    validator_checkpoint_key,
     validator_iteration,
     validator,
     parallel_validator,
@@ -226,3 +236,278 @@ def test_parallel_validator(data):
 
     assert validator_log[1]["fold_num"] == 1
     assert len(validator_log[1]["eval_results"]) == 1
+
+
+@pytest.mark.parametrize("backend", ["sequential", "loky", "multiprocessing"])
+def test_parallel_validator_backends(data, backend):
+    result = parallel_validator(data, split_fn, train_fn, eval_fn, n_jobs=2, backend=backend)
+    expected = parallel_validator(data, split_fn, train_fn, eval_fn, n_jobs=2)
+
+    assert result == expected
+
+
+def test_materialize_fold():
+    df = pd.DataFrame({"a": np.arange(10.0), "b": np.arange(10.0) * 2, "c": list("abcdefghij")})
+
+    contiguous = materialize_fold(df, np.arange(2, 6))
+    pd.testing.assert_frame_equal(contiguous, df.iloc[[2, 3, 4, 5]])
+    assert not np.shares_memory(contiguous["a"].values, df["a"].values)
+
+    view = materialize_fold(df, range(2, 6), zero_copy=True)
+    pd.testing.assert_frame_equal(view, df.iloc[[2, 3, 4, 5]])
+    assert np.shares_memory(view["a"].values, df["a"].values)
+
+    pd.testing.assert_frame_equal(materialize_fold(df, [1, 3, 4]), df.iloc[[1, 3, 4]])
+    pd.testing.assert_frame_equal(materialize_fold(df, [4, 3, 2]), df.iloc[[4, 3, 2]])
+    pd.testing.assert_frame_equal(materialize_fold(df, []), df.iloc[[]])
+    pd.testing.assert_frame_equal(materialize_fold(df, [1, 3, 4], ["c", "a"]), df.iloc[[1, 3, 4]][["c", "a"]])
+    pd.testing.assert_frame_equal(materialize_fold(df, np.arange(2, 6), ["a"]), df.iloc[2:6][["a"]])
+
+    with pytest.raises(KeyError):
+        materialize_fold(df, [1, 3], ["a", "missing"])
+
+
+def test_validator_columns():
+    df = pd.DataFrame({"rows": ["row1", "row2", "row3", "row4"], "unused": [1, 2, 3, 4]})
+
+    def columns_train_fn(train_df):
+        assert list(train_df.columns) == ["rows"]
+        return train_fn(train_df)
+
+    result = validator(df, split_fn, columns_train_fn, eval_fn, columns=["rows"])
+    expected = validator(df, split_fn, train_fn, eval_fn)
+
+    assert result["validator_log"] == expected["validator_log"]
+    assert parallel_validator(df, split_fn, columns_train_fn, eval_fn, columns=["rows"]) == \
+        parallel_validator(df, split_fn, train_fn, eval_fn)
+
+
+def test_validator_lazy_folds():
+    df = pd.DataFrame({"time": pd.date_range("2020-01-01", periods=100, freq="D"), "rows": np.arange(100)})
+
+    def lazy_split_fn(lazy):
+        return splitters.forward_stability_curve_time_splitter(
+            training_time_start="2020-01-01", training_time_end="2020-02-01", time_column="time",
+            holdout_size=timedelta(10), step=timedelta(10), lazy=lazy)
+
+    def sizes_eval_fn(test_data):
+        return {"size": len(test_data), "rows": test_data["rows"].sum()}
+
+    assert validator(df, lazy_split_fn(True), train_fn, sizes_eval_fn) == \
+        validator(df, lazy_split_fn(False), train_fn, sizes_eval_fn)
+    assert parallel_validator(df, lazy_split_fn(True), train_fn, sizes_eval_fn, n_jobs=2) == \
+        parallel_validator(df, lazy_split_fn(False), train_fn, sizes_eval_fn, n_jobs=2)
+
+
+def test_parallel_validator_consumes_folds_lazily():
+    events = []
+
+    class RecordingFolds:
+        def __len__(self):
+            return 4
+
+        def __iter__(self):
+            for fold_num in range(4):
+                events.append("built")
+                yield [0, 1], [[2, 3]]
+
+    def recording_train_fn(df):
+        events.append("trained")
+        return train_fn(df)
+
+    df = pd.DataFrame({"rows": ["row1", "row2", "row3", "row4"]})
+    result = parallel_validator(df, lambda df: (RecordingFolds(), [{"fold": i} for i in range(4)]),
+                                recording_train_fn, eval_fn)
+
+    assert len(result["validator_log"]) == 4
+    # each fold is built as it is dispatched, not all of them up front
+    assert events.index("trained") < len(events) - 1 - events[::-1].index("built")
+
+
+def in_place_train_fn(train_df):
+    train_df.loc[:, "x"] = train_df["x"] + 100
+    return train_fn(train_df)
+
+
+@pytest.mark.parametrize("backend", ["threading", "loky"])
+def test_validator_copies_folds(backend):
+    df = pd.DataFrame({"x": np.arange(100.0), "time": pd.date_range("2020-01-01", periods=100, freq="D")})
+    time_split_fn = splitters.forward_stability_curve_time_splitter(
+        training_time_start="2020-01-01", training_time_end="2020-02-01", time_column="time",
+        holdout_size=timedelta(10), step=timedelta(10), lazy=True)
+
+    validator(df, time_split_fn, in_place_train_fn, eval_fn)
+    parallel_validator(df, time_split_fn, in_place_train_fn, eval_fn, n_jobs=2, backend=backend)
+
+    np.testing.assert_array_equal(df["x"], np.arange(100.0))
+
+
+TRAINED_FOLDS = []
+INTERRUPT_AFTER = []
+
+
+def counting_train_fn(df):
+    if len(TRAINED_FOLDS) in INTERRUPT_AFTER:
+        INTERRUPT_AFTER.remove(len(TRAINED_FOLDS))
+        raise RuntimeError("interrupted")
+    TRAINED_FOLDS.append(len(df))
+    return train_fn(df)
+
+
+def test_validator_checkpoints(data, tmp_path):
+    checkpoint_path = str(tmp_path)
+    expected = validator(data, split_fn, train_fn, eval_fn)
+
+    # the run is interrupted while training the second fold
+    TRAINED_FOLDS[:], INTERRUPT_AFTER[:] = [], [1]
+    with pytest.raises(RuntimeError):
+        validator(data, split_fn, counting_train_fn, eval_fn, checkpoint_path=checkpoint_path)
+    assert TRAINED_FOLDS == [2]
+
+    result = validator(data, split_fn, counting_train_fn, eval_fn, checkpoint_path=checkpoint_path)
+    # only the second fold is trained again
+    assert TRAINED_FOLDS == [2, 2]
+    assert result["validator_log"] == expected["validator_log"]
+    assert not [path for path in tmp_path.rglob("*.tmp")]
+
+    key = validator_checkpoint_key(data, split_fn, counting_train_fn, eval_fn, perturb_fn_train=identity,
+                                   perturb_fn_test=identity, predict_oof=False, return_eval_logs_on_train=False,
+                                   columns=None, oof_columns=None)
+    assert load_checkpoint(str(tmp_path / key), 1)["eval_results"] == [{"some_score": 1.2}]
+
+    # the checkpoints are shared with parallel_validator
+    TRAINED_FOLDS[:] = []
+    parallel_result = parallel_validator(data, split_fn, counting_train_fn, eval_fn, n_jobs=2,
+                                         checkpoint_path=checkpoint_path)
+    assert TRAINED_FOLDS == []
+    assert parallel_result == parallel_validator(data, split_fn, train_fn, eval_fn)
+
+    # other functions, options or data are not
+    parallel_validator(data, split_fn, counting_train_fn, eval_fn, n_jobs=2, predict_oof=True,
+                       checkpoint_path=checkpoint_path)
+    validator(data.assign(rows="row"), split_fn, counting_train_fn, eval_fn, checkpoint_path=checkpoint_path)
+    validator(data, split_fn, counting_train_fn, lambda df: {"some_score": 1.3}, checkpoint_path=checkpoint_path)
+    validator(data, split_fn, counting_train_fn, eval_fn, columns=["rows"], checkpoint_path=checkpoint_path)
+    assert len(TRAINED_FOLDS) == 8
+
+
+def test_validator_checkpoint_key_of_unpicklable_functions(data, tmp_path):
+    lock = threading.Lock()
+
+    def locked_train_fn(df):
+        with lock:
+            return train_fn(df)
+
+    with pytest.raises(ValueError, match="checkpoint_key"):
+        validator(data, split_fn, locked_train_fn, eval_fn, checkpoint_path=str(tmp_path))
+
+    expected = validator(data, split_fn, train_fn, eval_fn)
+    assert validator(data, split_fn, locked_train_fn, eval_fn, checkpoint_path=str(tmp_path),
+                     checkpoint_key="locked")["validator_log"] == expected["validator_log"]
+    assert load_checkpoint(str(tmp_path / "locked"), 0) is not None
+
+    # pipelines are fingerprinted without their step cache, which holds a lock
+    pipeline = build_pipeline(placeholder_imputer(columns_to_impute=["x"]), cache=InMemoryStepCache())
+    other_pipeline = build_pipeline(placeholder_imputer(columns_to_impute=["x"], placeholder_value=1),
+                                    cache=InMemoryStepCache())
+    df = pd.DataFrame({"x": [1.0, np.nan, 3.0, 4.0]})
+    key = validator_checkpoint_key(df, split_fn, pipeline, eval_fn)
+    assert key == validator_checkpoint_key(df, split_fn, build_pipeline(placeholder_imputer(columns_to_impute=["x"])),
+                                           eval_fn)
+    assert key != validator_checkpoint_key(df, split_fn, other_pipeline, eval_fn)
+    validator(df, split_fn, pipeline, eval_fn, checkpoint_path=str(tmp_path))
+
+
+@pytest.mark.parametrize("backend", ["threading", "loky"])
+def test_parallel_validator_checkpoints(data, tmp_path, backend):
+    checkpoint_path = str(tmp_path)
+    expected = parallel_validator(data, split_fn, train_fn, eval_fn, n_jobs=2, backend=backend)
+
+    assert parallel_validator(data, split_fn, train_fn, eval_fn, n_jobs=2, backend=backend,
+                              checkpoint_path=checkpoint_path) == expected
+    assert len(list(tmp_path.rglob("fold-*.pkl"))) == 2
+
+    # a missing fold is the only one run again
+    next(tmp_path.rglob("fold-000001.pkl")).unlink()
+    assert parallel_validator(data, split_fn, train_fn, eval_fn, n_jobs=2, backend=backend,
+                              checkpoint_path=checkpoint_path) == expected
+    assert len(list(tmp_path.rglob("fold-*.pkl"))) == 2
+    assert not list(tmp_path.rglob("*.tmp"))
+
+
+def test_validator_compact_oof(tmp_path):
+    df = pd.DataFrame({"id": np.arange(100, 106), "rows": ["row%d" % i for i in range(6)],
+                       "unused": np.random.RandomState(0).rand(6)}, index=list("abcdef"))
+
+    def oof_split_fn(data):
+        return [([0, 1, 2], [[3, 4], [5]]), (range(3, 6), [range(0, 3)])], [{"fold": 1}, {"fold": 2}]
+
+    full = validator(df, oof_split_fn, train_fn, eval_fn, predict_oof=True)
+    compact = validator(df, oof_split_fn, train_fn, eval_fn, predict_oof=True, oof_columns=["id", "prediction"])
+
+    oof = compact["validator_log"][0]["oof_predictions"][0]
+    np.testing.assert_array_equal(oof["positions"], [3, 4])
+    assert oof["columns"]["id"].dtype == np.int64
+    np.testing.assert_array_equal(oof["columns"]["id"], [103, 104])
+
+    expected = pd.concat([p[["id", "prediction"]].assign(fold_num=log["fold_num"], eval_num=eval_num)
+                          for log in full["validator_log"] for eval_num, p in enumerate(log["oof_predictions"])])
+    expected.index = pd.Index([3, 4, 5, 0, 1, 2], name="position")
+    pd.testing.assert_frame_equal(assemble_oof_predictions(compact["validator_log"]), expected)
+
+    mmapped = parallel_validator(df, oof_split_fn, train_fn, eval_fn, n_jobs=2, predict_oof=True,
+                                 oof_columns=["id", "prediction"], oof_path=str(tmp_path))
+    assert isinstance(mmapped["validator_log"][1]["oof_predictions"][0]["columns"]["id"], np.memmap)
+    assert len(list(tmp_path.iterdir())) == 3
+    pd.testing.assert_frame_equal(assemble_oof_predictions(mmapped["validator_log"]), expected)
+
+    with pytest.raises(TypeError):
+        assemble_oof_predictions(full["validator_log"])
+
+
+def constant_train_fn(df):
+    def p(new_df):
+        return new_df.assign(prediction=1)
+
+    return p, p(df), {"constant_learner": {"training_samples": len(df)}}
+
+
+def sizes_eval_fn(test_data):
+    return {"size": len(test_data), "prediction": test_data["prediction"].sum()}
+
+
+@pytest.mark.parametrize("n_jobs, backend", [(1, "threading"), (2, "threading"), (2, "loky")])
+def test_multi_validator(data, n_jobs, backend):
+    train_fns = {"zero": train_fn, "one": constant_train_fn}
+
+    result = multi_validator(data, split_fn, train_fns, sizes_eval_fn, n_jobs=n_jobs, backend=backend)
+    assert list(result) == ["zero", "one"]
+    for name, candidate_fn in train_fns.items():
+        assert result[name] == validator(data, split_fn, candidate_fn, sizes_eval_fn)
+
+    all_train_logs = multi_validator(data, split_fn, train_fns, sizes_eval_fn, return_all_train_logs=True,
+                                     return_eval_logs_on_train=True, n_jobs=n_jobs, backend=backend)
+    assert all_train_logs["one"] == validator(data, split_fn, constant_train_fn, sizes_eval_fn,
+                                              return_all_train_logs=True, return_eval_logs_on_train=True)
+
+
+def test_multi_validator_shares_folds(data):
+    split_calls = []
+
+    def counting_split_fn(df):
+        split_calls.append(len(df))
+        return split_fn(df)
+
+    inputs = []
+
+    def recording_train_fn(df):
+        inputs.append(df)
+        return train_fn(df)
+
+    result = multi_validator(data, counting_split_fn, {"a": recording_train_fn, "b": recording_train_fn},
+                             eval_fn, predict_oof=True)
+    assert split_calls == [4]
+    # both candidates are fitted on the same materialized fold
+    assert inputs[0] is inputs[1] and inputs[2] is inputs[3]
+    pd.testing.assert_frame_equal(result["a"]["validator_log"][0]["oof_predictions"][1],
+                                  result["b"]["validator_log"][0]["oof_predictions"][1])